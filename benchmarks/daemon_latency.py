@@ -0,0 +1,92 @@
+"""
+Cold start vs warm request latency of the pipelines.
+
+cold: a fresh `python -m src.etl_pipeline.runner --only <pipeline>` process per run (imports,
+      dimension tables and the Extract cache are loaded every time).
+warm: `python -m src.etl_pipeline.client <pipeline>` against a running daemon (the client only
+      imports the standard library; the daemon keeps imports and dimension tables resident).
+
+Both are measured with the result memo (the usual no-op scheduled rerun) and with --no-memo
+(the full Extract -> Transform -> Load). Inputs are generated with benchmarks/generators.py.
+
+Usage (from the repository root):
+    python -m benchmarks.daemon_latency --rows 100000 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.generators import GENERATORS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _timed(command: list[str], workdir: Path, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run(command, cwd=workdir, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def measure(pipelines: list[str], rows: int, repeat: int = 5, seed: int = 0) -> dict:
+    """
+    Returns {pipeline: {"cold": s, "warm": s, "cold_no_memo": s, "warm_no_memo": s}} (medians).
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="etl_daemon_"))
+    for pipeline in pipelines:
+        GENERATORS[pipeline](workdir / "data" / "raw", rows, seed=seed)
+
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    python = sys.executable
+    results = {}
+
+    daemon = subprocess.Popen([python, "-m", "src.etl_pipeline.daemon"], cwd=workdir, env=env,
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        daemon.stdout.readline()  # "Listening on ..." once warm
+
+        for pipeline in pipelines:
+            cases = {
+                "cold": [python, "-m", "src.etl_pipeline.runner", "--only", pipeline, "--jobs", "1"],
+                "warm": [python, "-m", "src.etl_pipeline.client", pipeline, "--no-fallback"],
+            }
+            timings = {}
+            for memo in (True, False):
+                for name, command in cases.items():
+                    command = command + ([] if memo else ["--no-memo"])
+                    _timed(command, workdir, env)  # first run fills the caches and the memo
+                    seconds = [_timed(command, workdir, env) for _ in range(repeat)]
+                    timings[name if memo else f"{name}_no_memo"] = statistics.median(seconds)
+            results[pipeline] = timings
+    finally:
+        subprocess.run([python, "-m", "src.etl_pipeline.client", "--stop"], cwd=workdir, env=env,
+                       stdout=subprocess.DEVNULL)
+        daemon.wait(timeout=30)
+
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold start vs warm daemon request latency.")
+    parser.add_argument("--pipelines", nargs="+", default=sorted(GENERATORS), choices=sorted(GENERATORS))
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = measure(args.pipelines, args.rows, repeat=args.repeat, seed=args.seed)
+
+    print(f"{'pipeline':<13} {'cold':>8} {'warm':>8} {'cold (no memo)':>15} {'warm (no memo)':>15}")
+    for pipeline, timings in results.items():
+        print(f"{pipeline:<13} {timings['cold']:>7.3f}s {timings['warm']:>7.3f}s "
+              f"{timings['cold_no_memo']:>14.3f}s {timings['warm_no_memo']:>14.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
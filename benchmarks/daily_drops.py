@@ -0,0 +1,97 @@
+"""
+Throughput of a directory of daily fact files (Extract glob patterns).
+
+The seeded synthetic fact file is split into --days files under data/raw/daily/. The report is
+built from the single file, then from the "daily/*.csv" pattern with each combination of reader
+threads (--workers) and queue depth (--queue-depth). Every report must equal the single-file one.
+
+Usage (from the repository root):
+    python -m benchmarks.daily_drops --rows 300000 --days 30
+    python -m benchmarks.daily_drops --pipelines hospital --workers 1 2 4 --queue-depth 1 4
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.generators import GENERATORS
+from benchmarks.run_benchmarks import pipeline_definition
+from src.etl_pipeline.runner import PIPELINES
+
+
+def _split(raw_dir: Path, fact: str, days: int):
+    df = pd.read_csv(raw_dir / fact, dtype=str)
+    (raw_dir / "daily").mkdir(exist_ok=True)
+    size = -(-len(df) // days)  # ceiling division
+    for day in range(days):
+        df.iloc[day * size:(day + 1) * size].to_csv(raw_dir / "daily" / f"{day + 1:04d}.csv", index=False)
+
+
+def _timed_report(transform, fact: str, dimension: str, repeat: int, **options) -> tuple[float, pd.DataFrame]:
+    from src.etl_pipeline.extract.extract import Extract
+
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        report = transform(Extract(fact, dimension, **options).extract()).data
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds), report
+
+
+def measure(pipelines: list[str], rows: int, days: int, workers: list[int], depths: list[int],
+            repeat: int = 3, seed: int = 0) -> list[str]:
+    """
+    Prints the median seconds of every case; returns one message per report that differs.
+    """
+    failures = []
+    for pipeline in pipelines:
+        definition = pipeline_definition(pipeline)
+        fact, dimension = definition.fact_file, definition.dimension_file
+
+        workdir = Path(tempfile.mkdtemp(prefix=f"etl_daily_{pipeline}_"))
+        GENERATORS[pipeline](workdir / "data" / "raw", rows, seed=seed)
+        _split(workdir / "data" / "raw", fact, days)
+        os.chdir(workdir)
+
+        seconds, expected = _timed_report(definition.transform, fact, dimension, repeat)
+        print(f"[{pipeline}] single file: {seconds:.3f}s")
+
+        for worker_count in workers:
+            for depth in depths:
+                seconds, report = _timed_report(definition.transform, "daily/*.csv", dimension, repeat,
+                                                workers=worker_count, queue_depth=depth)
+                try:
+                    pd.testing.assert_frame_equal(report, expected, check_dtype=False)
+                except AssertionError as error:
+                    failures.append(f"[{pipeline} workers={worker_count} depth={depth}] {error}")
+                    print(failures[-1])
+                    continue
+                print(f"[{pipeline}] {days} files, workers={worker_count} queue_depth={depth}: {seconds:.3f}s")
+
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the throughput of daily fact files.")
+    parser.add_argument("--pipelines", nargs="+", default=sorted(PIPELINES), choices=sorted(PIPELINES))
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--queue-depth", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = measure(args.pipelines, args.rows, args.days, args.workers, args.queue_depth,
+                       repeat=args.repeat, seed=args.seed)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+
+# Reference values taken from the sample files in data/raw
+PROVINCES = ["Alberta", "British Columbia", "Manitoba", "Ontario", "Quebec", "Nova Scotia",
+             "New Brunswick", "Saskatchewan", "Newfoundland", "Prince Edward Island"]
+AGE_RANGES = [(1, "Child"), (2, "Child"), (3, "Child"), (4, "Adult"), (5, "Adult"),
+              (6, "Adult"), (7, "Elderly"), (8, "Elderly"), (9, "Elderly")]
+SEGMENTS = [(f"{letter}{number}", "Seg 1-3" if number <= 3 else "Seg 4-6")
+            for letter in "AD" for number in range(1, 8)] + [("C1", "Seg 1-3"), ("C2", "Seg 1-3"),
+                                                           ("C3", "Seg 1-3"), ("F1", "Seg 4-6")]
+# Product codes present in the fact file but missing from segments (dropped by the inner join)
+UNKNOWN_PRODUCTS = ["CR", "HE", "M1", "P1", "BLANK"]
+
+
+def _weights(size: int, skew: float) -> np.ndarray:
+    """
+    Zipf-like probabilities for `size` keys: skew=0 is uniform, larger values concentrate
+    the rows on the first keys (rank ** -skew).
+    """
+    weights = np.arange(1, size + 1, dtype=float) ** -skew
+    return weights / weights.sum()
+
+
+def _write_chunks(path: Path, chunks):
+    # Header only with the first chunk, so files of any size are written in bounded memory
+    for position, chunk in enumerate(chunks):
+        chunk.to_csv(path, index=False, mode="w" if position == 0 else "a", header=position == 0)
+
+
+def generate_hospital(raw_dir: str | Path, rows: int, seed: int = 0, provinces: int = 5,
+                      hospitals: int = 4, skew: float = 0.0, chunk_rows: int = 1_000_000):
+    """
+    Writes hospital_billing_data.csv (rows rows) and age_ranges.csv into raw_dir,
+    with the same schema as the sample files.
+    """
+    raw_dir = Path(raw_dir)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    if provinces <= len(PROVINCES):
+        province_names = np.array(PROVINCES[:provinces], dtype=object)
+    else:
+        province_names = np.array([f"Province {i}" for i in range(provinces)], dtype=object)
+    hospital_names = np.array([f"Hospital {i}" for i in range(hospitals)], dtype=object)
+    province_weights = _weights(provinces, skew)
+
+    def chunks():
+        for start in range(0, rows, chunk_rows):
+            size = min(chunk_rows, rows - start)
+            yield pd.DataFrame({
+                "Province": province_names[rng.choice(provinces, size, p=province_weights)],
+                "Hospital": hospital_names[rng.integers(0, hospitals, size)],
+                "PatientID": np.arange(start + 1, start + size + 1),
+                "BillAmount": np.round(rng.uniform(100, 20000, size), 2),
+                "AgeRangeID": rng.integers(1, len(AGE_RANGES) + 1, size),
+            })
+
+    _write_chunks(raw_dir / "hospital_billing_data.csv", chunks())
+    pd.DataFrame(AGE_RANGES, columns=["AgeRangeID", "AgeRangeLabel"]).to_csv(
+        raw_dir / "age_ranges.csv", index=False
+    )
+
+
+def generate_marketplace(raw_dir: str | Path, rows: int, seed: int = 0, markets: int = 29,
+                         customers: int = 5000, skew: float = 0.0, chunk_rows: int = 1_000_000):
+    """
+    Writes raw_data.csv (rows rows) and segments.csv into raw_dir, with the same schema as
+    the sample files: payments of 1000 or more use a thousands separator ("1,901").
+    """
+    raw_dir = Path(raw_dir)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    market_names = np.array([f"MARKET {i}" for i in range(markets)], dtype=object)
+    products = np.array([code for code, _ in SEGMENTS] + UNKNOWN_PRODUCTS, dtype=object)
+    product_weights = np.r_[np.full(len(SEGMENTS), 0.98 / len(SEGMENTS)),
+                            np.full(len(UNKNOWN_PRODUCTS), 0.02 / len(UNKNOWN_PRODUCTS))]
+    customer_weights = _weights(customers, skew)
+
+    def chunks():
+        for start in range(0, rows, chunk_rows):
+            size = min(chunk_rows, rows - start)
+            customer = rng.choice(customers, size, p=customer_weights)
+            payment = rng.integers(0, 2000, size)
+            yield pd.DataFrame({
+                "MARKET PLACE": market_names[customer % markets],
+                "Customer Site ID": customer + 1,
+                "Customer Name": np.char.add("CUSTOMER ", customer.astype(str)),
+                "Product Code": products[rng.choice(len(products), size, p=product_weights)],
+                "Product Serial Number": np.char.add("SN", rng.integers(10 ** 7, 10 ** 8, size).astype(str)),
+                "Equipment Rental Payment/Month": [f"{value:,}" for value in payment],
+            })
+
+    _write_chunks(raw_dir / "raw_data.csv", chunks())
+    pd.DataFrame(SEGMENTS, columns=["Product Code", "Segment"]).to_csv(raw_dir / "segments.csv", index=False)
+
+
+GENERATORS = {
+    "hospital": generate_hospital,
+    "marketplace": generate_marketplace,
+}
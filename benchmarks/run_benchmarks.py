@@ -0,0 +1,270 @@
+"""
+Scalability benchmarks for the Hospital and Marketplace pipelines.
+
+Generates seeded synthetic inputs (benchmarks/generators.py), runs Extract -> Transform -> Load
+in a fresh process per case, and records the time of every stage and every SQl_df operation
+(exclusive of the operations it calls, plus its inclusive time),
+the throughput (input rows per second) and the peak RSS. Results are written as JSON and
+compared with a stored baseline to catch regressions.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks --rows 10000 100000 1000000
+    python -m benchmarks.run_benchmarks --rows 10000 --save-baseline
+    python -m benchmarks.run_benchmarks --rows 100000000 --chunksize 1000000 --format parquet
+"""
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.generators import GENERATORS
+from src.etl_pipeline.runner import PIPELINES
+from src.etl_pipeline.utils.instrumentation import peak_rss_bytes
+
+# Leading key whose cardinality --cardinality sets for each generator
+CARDINALITY_ARGUMENT = {"hospital": "provinces", "marketplace": "customers"}
+
+
+def pipeline_definition(name: str):
+    """
+    Pipeline (input files, schema and Transform) of a pipeline registered in the runner.
+    """
+    module_name, _ = PIPELINES[name]
+    return importlib.import_module(module_name).PIPELINE
+
+
+def _run_case(pipeline: str, workdir: str, options: dict) -> dict:
+    """
+    Runs one Extract -> Transform -> Load in the current (fresh) process and returns its measurements.
+    """
+    os.chdir(workdir)
+
+    from src.etl_pipeline.extract.extract import Extract
+    from src.etl_pipeline.load.load_code import Load
+    from src.etl_pipeline.utils.SQL_with_Dataframes import SQl_df
+
+    definition = pipeline_definition(pipeline)
+
+    # Time every public SQl_df method (this process only). Methods call each other (e.g. the
+    # pivot/rollup calls the groupby), so "seconds" excludes the time of nested calls and the
+    # operations add up to the time spent in SQl_df; "inclusive_seconds" is the whole call.
+    operations = {}
+    nested = []  # time spent in nested calls, one entry per call in progress
+
+    def timed(name, method):
+        def wrapper(self, *args, **kwargs):
+            nested.append(0.0)
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                inner = nested.pop()
+                if nested:
+                    nested[-1] += elapsed
+            stats = operations.setdefault(name, {"calls": 0, "seconds": 0.0, "inclusive_seconds": 0.0,
+                                                 "rows_in": 0, "rows_out": 0})
+            stats["calls"] += 1
+            stats["seconds"] += elapsed - inner
+            stats["inclusive_seconds"] += elapsed
+            first = args[0] if args else next(iter(kwargs.values()), None)
+            stats["rows_in"] += len(first) if hasattr(first, "__len__") and hasattr(first, "columns") else 0
+            stats["rows_out"] += len(result) if hasattr(result, "columns") else 0
+            return result
+        return wrapper
+
+    for name in dir(SQl_df):
+        if not name.startswith("_") and callable(getattr(SQl_df, name)):
+            setattr(SQl_df, name, timed(name, getattr(SQl_df, name)))
+
+    rss_before = peak_rss_bytes()
+    stages = {}
+
+    start = time.perf_counter()
+    extract = Extract(
+        definition.fact_file, definition.dimension_file,
+        chunksize=options.get("chunksize"),
+        lazy=options.get("lazy", False),
+        schema=definition.schema if options.get("typed") else None,
+        categorize=options.get("categorize", False)
+    )
+    stages["extract"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    processed = definition.transform(extract.extract(), partitions=options.get("partitions", 1),
+                                     backend=options.get("backend", "pandas"))
+    stages["transform"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Load(processed, fmt=options.get("format", "xlsx"))
+    stages["load"] = time.perf_counter() - start
+
+    stages["full"] = sum(stages.values())
+
+    return {
+        "stages": stages,
+        "operations": operations,
+        "output_rows": len(processed.data),
+        "rss_before_mb": rss_before / 2 ** 20,
+        "peak_rss_mb": peak_rss_bytes() / 2 ** 20,
+    }
+
+
+def run_benchmarks(pipelines: list[str], sizes: list[int], options: dict, seed: int = 0,
+                   skew: float = 0.0, cardinality: int | None = None, repeat: int = 1,
+                   workdir: str | None = None) -> dict:
+    """
+    Runs every (pipeline, size) case and returns the results document.
+    """
+    root = Path(workdir) if workdir else Path(tempfile.mkdtemp(prefix="etl_bench_"))
+    context = multiprocessing.get_context("spawn")
+    cases = []
+
+    for pipeline in pipelines:
+        for rows in sizes:
+            case_dir = root / f"{pipeline}_{rows}"
+            generator_options = {"seed": seed, "skew": skew}
+            if cardinality:
+                generator_options[CARDINALITY_ARGUMENT[pipeline]] = cardinality
+
+            start = time.perf_counter()
+            GENERATORS[pipeline](case_dir / "data" / "raw", rows, **generator_options)
+            print(f"[{pipeline} {rows:>11,} rows] generated in {time.perf_counter() - start:.1f}s", flush=True)
+
+            # Fresh process per repetition: clean peak RSS, no warm caches; keep the fastest run
+            best = None
+            for _ in range(repeat):
+                with context.Pool(1) as pool:
+                    result = pool.apply(_run_case, (pipeline, str(case_dir), options))
+                if best is None or result["stages"]["full"] < best["stages"]["full"]:
+                    best = result
+
+            for stage, seconds in best["stages"].items():
+                cases.append(_case(pipeline, rows, stage, seconds, best["peak_rss_mb"]))
+            for name, stats in best["operations"].items():
+                cases.append(_case(pipeline, rows, f"op:{name}", stats["seconds"], None,
+                                   inclusive_seconds=stats["inclusive_seconds"], calls=stats["calls"],
+                                   rows_in=stats["rows_in"], rows_out=stats["rows_out"]))
+
+            print(f"[{pipeline} {rows:>11,} rows] full run {best['stages']['full']:.2f}s, "
+                  f"peak RSS {best['peak_rss_mb']:.0f} MB", flush=True)
+
+            if not workdir:
+                shutil.rmtree(case_dir, ignore_errors=True)
+
+    if not workdir:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "skew": skew,
+            "cardinality": cardinality,
+            "options": options,
+        },
+        "cases": cases,
+    }
+
+
+def _case(pipeline: str, rows: int, name: str, seconds: float, peak_rss_mb: float | None, **extra) -> dict:
+    return {
+        "key": f"{pipeline}/{rows}/{name}",
+        "pipeline": pipeline,
+        "rows": rows,
+        "case": name,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else None,
+        "peak_rss_mb": peak_rss_mb,
+        **extra,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, noise_seconds: float = 0.05) -> list[str]:
+    """
+    Returns one message per case that is slower than the baseline by more than tolerance
+    (a fraction) and by more than noise_seconds, or whose peak RSS grew by more than tolerance.
+    """
+    previous = {case["key"]: case for case in baseline.get("cases", [])}
+    regressions = []
+
+    for case in results["cases"]:
+        old = previous.get(case["key"])
+        if old is None:
+            continue
+
+        if case["seconds"] > old["seconds"] * (1 + tolerance) and case["seconds"] - old["seconds"] > noise_seconds:
+            regressions.append(f"{case['key']}: {old['seconds']:.3f}s -> {case['seconds']:.3f}s")
+
+        if case["peak_rss_mb"] and old.get("peak_rss_mb") and case["peak_rss_mb"] > old["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{case['key']}: peak RSS {old['peak_rss_mb']:.0f} MB -> {case['peak_rss_mb']:.0f} MB")
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ETL pipelines on synthetic data.")
+    parser.add_argument("--pipelines", nargs="+", choices=sorted(PIPELINES), default=sorted(PIPELINES))
+    parser.add_argument("--rows", nargs="+", type=int, default=[10_000, 100_000],
+                        help="fact table sizes, e.g. 10000 1000000 100000000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skew", type=float, default=0.0, help="Zipf exponent of the leading key (0 = uniform)")
+    parser.add_argument("--cardinality", type=int, help="number of provinces (hospital) / customers (marketplace)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case, the fastest is kept")
+    parser.add_argument("--chunksize", type=int, help="stream the fact file in chunks of this many rows")
+    parser.add_argument("--lazy", action="store_true", help="use the lazy query-plan engine")
+    parser.add_argument("--typed", action="store_true", help="use the pipeline schemas for typed extraction")
+    parser.add_argument("--categorize", action="store_true", help="encode low-cardinality text as categoricals")
+    parser.add_argument("--partitions", type=int, default=1, help="worker processes for the transform steps")
+    parser.add_argument("--backend", default="pandas", choices=["pandas", "sqlite"], help="transform engine")
+    parser.add_argument("--format", default="xlsx", choices=["xlsx", "csv", "parquet"])
+    parser.add_argument("--workdir", help="keep generated inputs and outputs here instead of a temp dir")
+    parser.add_argument("--results-dir", default=str(Path("benchmarks") / "results"))
+    parser.add_argument("--baseline", default=str(Path("benchmarks") / "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a regression")
+    args = parser.parse_args(argv)
+
+    options = {"chunksize": args.chunksize, "lazy": args.lazy, "typed": args.typed, "format": args.format,
+               "partitions": args.partitions, "categorize": args.categorize,
+               "backend": args.backend}
+    results = run_benchmarks(args.pipelines, args.rows, options, seed=args.seed, skew=args.skew,
+                             cardinality=args.cardinality, repeat=args.repeat, workdir=args.workdir)
+
+    results_dir = Path(args.results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    results_file = results_dir / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    results_file.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {results_file}")
+
+    baseline_file = Path(args.baseline)
+    if args.save_baseline:
+        baseline_file.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {baseline_file}")
+        return 0
+
+    if not baseline_file.exists():
+        print("No baseline to compare with (use --save-baseline)")
+        return 0
+
+    regressions = compare(results, json.loads(baseline_file.read_text()), args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print("No regressions against the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
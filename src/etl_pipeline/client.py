@@ -0,0 +1,117 @@
+"""
+Thin command line client of the warm pipeline daemon (daemon.py).
+
+Only the standard library is imported here, so a request costs a Python start-up and a socket
+round trip instead of importing pandas and re-reading the dimension tables. If no daemon is
+listening, the pipeline runs in this process like the runner would (unless --no-fallback).
+
+Usage (from the repository root):
+    python -m src.etl_pipeline.client hospital
+    python -m src.etl_pipeline.client marketplace --format parquet --typed
+    python -m src.etl_pipeline.client --ping
+    python -m src.etl_pipeline.client --stop
+"""
+
+import argparse
+import json
+import socket
+import sys
+from pathlib import Path
+
+DEFAULT_SOCKET = Path("data") / "etl.sock"
+
+
+class DaemonUnavailable(ConnectionError):
+    """
+    Raised when no daemon is listening on the socket.
+    """
+
+
+def request(message: dict, socket_path: str | Path = DEFAULT_SOCKET, timeout: float | None = None) -> dict:
+    """
+    Sends one request to the daemon and returns its response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        try:
+            connection.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError) as error:
+            raise DaemonUnavailable(f"No daemon listening on {socket_path}") from error
+
+        connection.sendall((json.dumps(message) + "\n").encode())
+        with connection.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def run(pipeline: str, socket_path: str | Path = DEFAULT_SOCKET, fallback: bool = True, **options) -> dict:
+    """
+    Runs a registered pipeline in the daemon and returns the runner result
+    {"status", "seconds", "version_file", "peak_mb", "quality", "error"}.
+    fallback: run it in this process when no daemon is listening.
+    """
+    try:
+        return request({"command": "run", "pipeline": pipeline, "options": options}, socket_path)
+    except DaemonUnavailable:
+        if not fallback:
+            raise
+
+    # Cold path: the heavy imports only happen here
+    from src.etl_pipeline.runner import run_pipelines
+    return run_pipelines([pipeline], jobs=1, **options)[pipeline]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a pipeline through the warm daemon.")
+    parser.add_argument("pipeline", nargs="?", help="registered pipeline name (hospital, marketplace, ...)")
+    parser.add_argument("--socket", default=str(DEFAULT_SOCKET))
+    parser.add_argument("--ping", action="store_true", help="check that the daemon is up")
+    parser.add_argument("--stop", action="store_true", help="stop the daemon")
+    parser.add_argument("--no-fallback", dest="fallback", action="store_false",
+                        help="fail instead of running in this process when no daemon is listening")
+    parser.add_argument("--format", dest="output_format", choices=["xlsx", "csv", "parquet"])
+    parser.add_argument("--chunksize", type=int, help="stream the fact file in chunks of this many rows")
+    parser.add_argument("--typed", action="store_true", help="typed extraction with the pipeline schema")
+    parser.add_argument("--categorize", action="store_true", help="encode low-cardinality text as categoricals")
+    parser.add_argument("--backend", choices=["pandas", "sqlite"], help="execution engine of the transform steps")
+    parser.add_argument("--no-memo", dest="memoize", action="store_false", default=None,
+                        help="always recompute, even if inputs, parameters and code are unchanged")
+    parser.add_argument("--validate", action="store_true",
+                        help="run the data-quality checks (no threshold pushdown into Parquet fact files)")
+    parser.add_argument("--instrument", action="store_true", help="write a JSON run report")
+    args = parser.parse_args(argv)
+
+    if args.ping or args.stop:
+        try:
+            response = request({"command": "ping" if args.ping else "stop"}, args.socket, timeout=5)
+        except DaemonUnavailable as error:
+            print(error, file=sys.stderr)
+            return 1
+        print(json.dumps(response))
+        return 0
+
+    if not args.pipeline:
+        parser.error("a pipeline name is required")
+
+    # Only the options given on the command line: the daemon applies the runner defaults
+    options = {name: value for name, value in vars(args).items()
+               if name not in ("pipeline", "socket", "ping", "stop", "fallback") and value not in (None, False)}
+    if args.memoize is False:
+        options["memoize"] = False
+
+    try:
+        result = run(args.pipeline, args.socket, fallback=args.fallback, **options)
+    except DaemonUnavailable as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    seconds = f"{result['seconds']:.2f}s" if result.get("seconds") is not None else "-"
+    print(f"{args.pipeline:<15} {result['status']:<7} {seconds:>9}  {result.get('version_file') or ''}")
+    if result.get("quality") and result["quality"]["rejected"]:
+        print(f"{'':<15} {result['quality']['rejected']} rejected row(s): {result['quality']['rejects_file']}")
+    if result.get("error"):
+        print(result["error"], file=sys.stderr)
+    return 0 if result["status"] == "ok" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Warm pipeline daemon.
+
+A long-running process that imports pandas, numpy, pyarrow and openpyxl and the pipeline modules
+once, keeps the dimension tables of every registered pipeline in memory (ResidentCache: a table is
+parsed again only when its file's size or mtime changes) and runs pipelines on request. Requests
+arrive on a local Unix socket; src/etl_pipeline/client.py is the command line client.
+
+Protocol: one JSON object per connection, one JSON object back, each on a single line.
+    {"command": "run", "pipeline": "hospital", "options": {"output_format": "csv"}}
+        -> the runner result {"status", "seconds", "version_file", "peak_mb", "quality", "error"}
+    {"command": "ping"}  -> {"status": "ok", "pid": ..., "pipelines": [...]}
+    {"command": "stop"}  -> {"status": "ok"}, then the daemon exits
+
+Usage (from the repository root):
+    python -m src.etl_pipeline.daemon                      # listens on data/etl.sock
+    python -m src.etl_pipeline.daemon --socket /tmp/etl.sock
+"""
+
+import argparse
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from src.etl_pipeline.client import DEFAULT_SOCKET
+from src.etl_pipeline.extract.cache import ColumnarCache, ResidentCache
+from src.etl_pipeline.extract.extract import Extract
+from src.etl_pipeline.runner import PIPELINES, _preload_libraries, _run_pipeline
+
+
+class PipelineDaemon(socketserver.UnixStreamServer):
+    """
+    Unix socket server running registered pipelines in this (warm) process, one request at a time.
+    """
+
+    def __init__(self, socket_path: str | Path = DEFAULT_SOCKET,
+                 output_root: str | Path = Path("data") / "output"):
+        self.socket_path = Path(socket_path)
+        self.output_root = output_root
+
+        # Dimension tables (every input file but the first) stay resident; fact files use the disk cache
+        dimensions = [Extract()._file_path(filename) for _, files in PIPELINES.values() for filename in files[1:]]
+        self.tables = ResidentCache(dimensions, inner=ColumnarCache())
+
+        _remove_stale_socket(self.socket_path)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(self.socket_path), RequestHandler)
+
+    def warm_up(self):
+        """
+        Imports the libraries and pipeline modules and loads the dimension tables.
+        """
+        _preload_libraries()
+        for name, (module_name, files) in PIPELINES.items():
+            importlib.import_module(module_name)
+            Extract(*files[1:], cache=self.tables)
+
+    def run_pipeline(self, name: str, options: dict) -> dict:
+        if name not in PIPELINES:
+            return {"status": "failed", "error": f"Unknown pipeline: {name}"}
+
+        # Same defaults as the runner (result memo on); reads always go through the resident tables
+        options = {"memoize": True, **options, "cache": self.tables}
+        return _run_pipeline(name, self.output_root, options)
+
+    def server_close(self):
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        start = time.perf_counter()
+        line = self.rfile.readline()
+        # Connection without a request (e.g. another daemon checking that this one is alive)
+        if not line.strip():
+            return
+
+        try:
+            request = json.loads(line)
+            command = request.get("command", "run")
+
+            if command == "run":
+                response = self.server.run_pipeline(request["pipeline"], request.get("options", {}))
+            elif command == "ping":
+                response = {"status": "ok", "pid": os.getpid(), "pipelines": list(PIPELINES)}
+            elif command == "stop":
+                response = {"status": "ok"}
+                # shutdown() waits for serve_forever to return: ask for it from another thread
+                threading.Thread(target=self.server.shutdown).start()
+            else:
+                response = {"status": "failed", "error": f"Unknown command: {command}"}
+        except Exception:
+            # A bad request must not take the daemon down
+            response = {"status": "failed", "error": traceback.format_exc()}
+
+        response["server_seconds"] = time.perf_counter() - start
+        self.wfile.write((json.dumps(response) + "\n").encode())
+
+
+def _remove_stale_socket(socket_path: Path):
+    # A socket file left by a daemon that died: remove it. A live daemon: refuse to start a second one.
+    if not socket_path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+            return
+    raise RuntimeError(f"A daemon is already listening on {socket_path}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the warm pipeline daemon.")
+    parser.add_argument("--socket", default=str(DEFAULT_SOCKET), help="Unix socket to listen on")
+    parser.add_argument("--output-root", default=str(Path("data") / "output"))
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        daemon = PipelineDaemon(args.socket, args.output_root)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    with daemon:
+        daemon.warm_up()
+        print(f"Listening on {args.socket} (warm in {time.perf_counter() - start:.2f}s)", flush=True)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import argparse
+import hashlib
+import pandas as pd
+from pathlib import Path
+from typing import Callable
+
+from src.etl_pipeline.utils.lru_directory import LRUDirectory
+
+
+class ColumnarCache(LRUDirectory):
+    """
+    On-disk Parquet cache for parsed input files.
+
+    Each entry is keyed by the source file fingerprint (path, size, mtime and,
+    optionally, a hash of its content) plus the read options. A warm run loads the
+    typed Parquet copy instead of parsing CSV/Excel text again.
+    Entries are evicted least-recently-used first once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: str | Path = Path("data") / "cache",
+                 max_bytes: int = 1024 ** 3, content_hash: bool = False):
+        super().__init__(cache_dir, max_bytes)
+        self.cache_dir = self.directory
+        self.content_hash = content_hash    # also hash file content (slower, survives touch/copy)
+
+    # =====================================================
+    # Keys
+    # =====================================================
+    def _source_key(self, file_path: Path) -> str:
+        # Identifies the source file, shared by all of its versions
+        return hashlib.sha1(str(file_path.resolve()).encode()).hexdigest()[:16]
+
+    def fingerprint(self, file_path: Path) -> str:
+        """
+        Hash of the file identity and its current state (size, mtime, optional content hash).
+        """
+        stat = file_path.stat()
+        parts = [str(file_path.resolve()), str(stat.st_size), str(stat.st_mtime_ns)]
+
+        if self.content_hash:
+            digest = hashlib.blake2b()
+            with open(file_path, "rb") as handle:
+                for block in iter(lambda: handle.read(1024 * 1024), b""):
+                    digest.update(block)
+            parts.append(digest.hexdigest())
+
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+
+    def _options_key(self, **read_options) -> str:
+        # The parser engine does not change the parsed result, so it is not part of the key
+        options = {key: value for key, value in read_options.items() if key != "engine"}
+        return hashlib.sha1(repr(sorted(options.items())).encode()).hexdigest()[:8]
+
+    # =====================================================
+    # Read / write
+    # =====================================================
+    def load(self, file_path: Path, parse: Callable[[], pd.DataFrame], **read_options) -> pd.DataFrame:
+        """
+        Returns the cached DataFrame for file_path, or parses it with parse() and stores it.
+        """
+        # Entry name: <source>_<read options>_<file state>.parquet
+        prefix = f"{self._source_key(file_path)}_{self._options_key(**read_options)}"
+        entry = self.cache_dir / f"{prefix}_{self.fingerprint(file_path)}.parquet"
+
+        # None: missing, or evicted by another process sharing the cache in the meantime
+        df = self._read(entry)
+        if df is not None:
+            return df
+
+        df = parse()
+        self._store(prefix, entry, df)
+        return df
+
+    def _store(self, prefix: str, entry: Path, df: pd.DataFrame):
+        # Entries for an older state of the same file and options can never be hit again
+        if self.cache_dir.exists():
+            for stale in self.cache_dir.glob(f"{prefix}_*.parquet"):
+                stale.unlink(missing_ok=True)
+
+        self._write(entry, df, index=True)
+
+    # =====================================================
+    # Maintenance
+    # =====================================================
+    def invalidate(self, file_path: Path | None = None) -> int:
+        """
+        Deletes the entries of one source file, or every entry when file_path is None.
+        Returns the number of deleted entries.
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        pattern = "*.parquet" if file_path is None else f"{self._source_key(Path(file_path))}_*.parquet"
+        removed = 0
+        for entry in self.cache_dir.glob(pattern):
+            entry.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+class ResidentCache:
+    """
+    In-memory cache of parsed reference tables, for a long-running process (see daemon.py).
+
+    Tables of the listed files stay in memory between runs and are parsed again only when the
+    file's size or mtime changes. Every other file goes to the wrapped ColumnarCache (or is parsed).
+    It has the load() interface of ColumnarCache, so Extract(cache=...) accepts either.
+    """
+
+    def __init__(self, files: list[str | Path], inner: ColumnarCache | None = None):
+        self.files = {Path(file_path).resolve() for file_path in files}
+        self.inner = inner
+        # (path, read options) -> (size, mtime_ns, DataFrame)
+        self.tables = {}
+
+    def load(self, file_path: Path, parse: Callable[[], pd.DataFrame], **read_options) -> pd.DataFrame:
+        """
+        Returns the resident DataFrame for file_path if the file is unchanged, otherwise parses it.
+        """
+        path = Path(file_path).resolve()
+        if path not in self.files:
+            return self.inner.load(file_path, parse, **read_options) if self.inner is not None else parse()
+
+        stat = path.stat()
+        # The parser engine does not change the parsed result, so it is not part of the key
+        key = (path, repr(sorted((name, value) for name, value in read_options.items() if name != "engine")))
+
+        entry = self.tables.get(key)
+        if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            return entry[2]
+
+        df = self.inner.load(file_path, parse, **read_options) if self.inner is not None else parse()
+        self.tables[key] = (stat.st_size, stat.st_mtime_ns, df)
+        return df
+
+
+def main(argv: list[str] | None = None):
+    """
+    Cache maintenance command:
+        python -m src.etl_pipeline.extract.cache --invalidate [FILE ...]
+        python -m src.etl_pipeline.extract.cache --stats
+    FILE names are relative to data/raw, like the names given to Extract.
+    """
+    parser = argparse.ArgumentParser(description="Manage the Extract columnar cache.")
+    parser.add_argument("--cache-dir", default=str(Path("data") / "cache"))
+    parser.add_argument("--invalidate", nargs="*", metavar="FILE",
+                        help="delete cached copies of FILE (all entries if no FILE is given)")
+    parser.add_argument("--stats", action="store_true", help="print number of entries and total size")
+    args = parser.parse_args(argv)
+
+    cache = ColumnarCache(args.cache_dir)
+
+    if args.invalidate is not None:
+        if args.invalidate:
+            removed = sum(cache.invalidate(Path("data") / "raw" / name) for name in args.invalidate)
+        else:
+            removed = cache.invalidate()
+        print(f"Removed {removed} cache entries")
+
+    if args.stats or args.invalidate is None:
+        print(f"{len(cache.entries())} entries, {cache.size()} bytes in {cache.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Automatic categorical encoding of low-cardinality text columns (Extract(..., categorize=True)).
+
+Columns with the same name in several tables (e.g. Product Code in the fact table and in
+segments.csv) get one shared dictionary, so joins on them compare integer codes and the
+key keeps its categorical dtype through the merge, the GROUP BYs and the pivot.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def is_text(series: pd.Series) -> bool:
+    """
+    True for object/str columns (the candidates for encoding) and existing categoricals.
+    """
+    return (
+        isinstance(series.dtype, pd.CategoricalDtype)
+        or series.dtype == object
+        or pd.api.types.is_string_dtype(series.dtype)
+    )
+
+
+def factorize_text(tables: dict[str, pd.DataFrame]) -> dict[tuple[str, str], tuple[np.ndarray, pd.Index]]:
+    """
+    One hash pass per text column: {(filename, column): (codes, distinct values)}.
+    Missing values get code -1. Existing categoricals reuse their codes.
+    """
+    factorized = {}
+    for filename, df in tables.items():
+        for column in df.columns:
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                factorized[filename, column] = (series.cat.codes.to_numpy(), series.cat.categories)
+            elif is_text(series):
+                codes, uniques = pd.factorize(series)
+                factorized[filename, column] = (codes, pd.Index(uniques))
+    return factorized
+
+
+def shared_dictionaries(factorized: dict, tables: dict[str, pd.DataFrame],
+                        max_ratio: float = 0.5) -> dict[str, pd.CategoricalDtype]:
+    """
+    Returns {column: CategoricalDtype} for the text columns worth encoding.
+
+    A column qualifies when its distinct values, over every table that has it, are at most
+    max_ratio times its total number of rows. Categories are sorted, so sorting and grouping
+    by the codes gives the same order as sorting the strings.
+    """
+    uniques, rows = {}, {}
+    for (filename, column), (_, values) in factorized.items():
+        uniques.setdefault(column, []).append(values.to_numpy(dtype=object))
+        rows[column] = rows.get(column, 0) + len(tables[filename])
+
+    dictionaries = {}
+    for column, parts in uniques.items():
+        categories = pd.unique(np.concatenate(parts))
+        if len(categories) > max_ratio * rows[column]:
+            continue
+
+        # Mixed types (e.g. numbers and text in one column) cannot be sorted: keep first-seen order
+        try:
+            categories = np.sort(categories)
+        except TypeError:
+            pass
+
+        dictionaries[column] = pd.CategoricalDtype(categories)
+
+    return dictionaries
+
+
+def encode_categoricals(tables: dict[str, pd.DataFrame], max_ratio: float = 0.5) -> dict[str, pd.DataFrame]:
+    """
+    Converts the low-cardinality text columns of every table to categoricals with shared dictionaries.
+    Returns a new {filename: DataFrame} dictionary (other columns are not copied).
+    """
+    factorized = factorize_text(tables)
+    dictionaries = shared_dictionaries(factorized, tables, max_ratio)
+
+    encoded = {}
+    for filename, df in tables.items():
+        columns = {}
+        for column, dtype in dictionaries.items():
+            if (filename, column) not in factorized:
+                continue
+
+            # Remap the table's own codes to the shared dictionary (no second pass over the strings)
+            codes, values = factorized[filename, column]
+            positions = dtype.categories.get_indexer(values)
+            shared_codes = np.where(codes >= 0, positions[codes], -1)
+            columns[column] = pd.Categorical.from_codes(shared_codes, dtype=dtype)
+
+        encoded[filename] = df.assign(**columns) if columns else df
+
+    return encoded
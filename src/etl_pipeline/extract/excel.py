@@ -0,0 +1,154 @@
+"""
+Streaming reader for .xlsx workbooks.
+
+pd.read_excel builds the whole sheet in memory before the DataFrame. Here the workbook is
+opened read-only (openpyxl streams the sheet XML) and rows are turned into DataFrames of at
+most chunksize rows, so only one chunk of values exists at a time. Only the requested sheet
+and columns are converted, and the header can be on any row.
+
+Values follow pd.read_excel: integral numbers become int, Excel error cells and pandas' default
+NA strings become missing values, numeric text is converted when a whole column is numeric,
+and trailing empty rows are dropped.
+"""
+
+import sys
+import pandas as pd
+from pathlib import Path
+from typing import Iterator
+
+# pandas' default na_values (read_csv / read_excel)
+NA_STRINGS = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+              "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+
+# Error values of Excel cells (openpyxl returns them as text in values-only mode)
+ERROR_CODES = {"#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A"}
+
+
+def iter_excel_chunks(file_path: str | Path, chunksize: int, sheet: str | int | None = None,
+                      header_row: int = 1, columns: list | None = None) -> Iterator[pd.DataFrame]:
+    """
+    Yields consecutive DataFrames of at most chunksize rows from one sheet.
+
+    sheet: sheet name or 0-based position (default: the first sheet).
+    header_row: 1-based row of the column names; data starts on the next row.
+    columns: subset of columns to read (the others are never converted); they keep the sheet's order.
+    """
+    from openpyxl import load_workbook
+
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer")
+    if header_row < 1:
+        raise ValueError("header_row must be a positive (1-based) row number")
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = _worksheet(workbook, sheet)
+        # The stored dimensions of a read-only sheet may be wrong: read until the last row
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(min_row=header_row, values_only=True)
+
+        header = _header(next(rows, ()))
+        names, positions = _select(header, columns)
+
+        buffer, blank, yielded = [], 0, False
+        for row in rows:
+            values = [_value(row[position]) if position < len(row) else None for position in positions]
+
+            # Blank rows are kept only if data follows them (trailing ones are dropped, like read_excel)
+            if all(value is None for value in values):
+                blank += 1
+                continue
+            buffer.extend([[None] * len(names)] * blank)
+            blank = 0
+            buffer.append(values)
+
+            if len(buffer) >= chunksize:
+                yield _frame(buffer[:chunksize], names)
+                buffer = buffer[chunksize:]
+                yielded = True
+
+        # A sheet without data rows still gives one (empty) chunk with the columns
+        if buffer or not yielded:
+            yield _frame(buffer, names)
+    finally:
+        workbook.close()
+
+
+def read_excel(file_path: str | Path, sheet: str | int | None = None, header_row: int = 1,
+               columns: list | None = None) -> pd.DataFrame:
+    """
+    Whole-sheet read: a single chunk, so dtypes are inferred over the whole column like read_excel.
+    """
+    return next(iter_excel_chunks(file_path, sys.maxsize, sheet=sheet, header_row=header_row, columns=columns))
+
+
+def read_excel_header(file_path: str | Path, sheet: str | int | None = None, header_row: int = 1) -> list:
+    """
+    Column names of a sheet, without reading its data rows.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = _worksheet(workbook, sheet)
+        worksheet.reset_dimensions()
+        return _header(next(worksheet.iter_rows(min_row=header_row, max_row=header_row, values_only=True), ()))
+    finally:
+        workbook.close()
+
+
+def _worksheet(workbook, sheet: str | int | None):
+    if sheet is None:
+        return workbook.worksheets[0]
+    if isinstance(sheet, int):
+        return workbook.worksheets[sheet]
+    if sheet not in workbook.sheetnames:
+        raise ValueError(f"Worksheet not found: {sheet}")
+    return workbook[sheet]
+
+
+def _header(row: tuple) -> list:
+    # Trailing empty header cells are not columns; other empty ones are named like pandas does
+    row = list(row)
+    while row and row[-1] is None:
+        row.pop()
+    return [f"Unnamed: {position}" if name is None else name for position, name in enumerate(row)]
+
+
+def _select(header: list, columns: list | None) -> tuple[list, list[int]]:
+    if columns is None:
+        return header, list(range(len(header)))
+
+    missing = [column for column in columns if column not in header]
+    if missing:
+        raise ValueError(f"Columns not found in sheet: {missing}")
+    # Sheet order, like usecols
+    positions = [position for position, name in enumerate(header) if name in columns]
+    return [header[position] for position in positions], positions
+
+
+def _value(value):
+    """
+    One cell as pd.read_excel converts it.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and (value in NA_STRINGS or value in ERROR_CODES):
+        return None
+    return value
+
+
+def _frame(rows: list[list], names: list) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=names)
+    if df.empty:
+        return df
+
+    # Text columns that only hold numbers become numeric, like the read_excel parser does
+    for column in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            try:
+                df[column] = pd.to_numeric(df[column])
+            except (ValueError, TypeError):
+                pass
+
+    return df
@@ -1,46 +1,635 @@
+import numbers
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fnmatch import fnmatch
 from pathlib import Path
+from typing import Iterator
+
+from src.etl_pipeline.extract.cache import ColumnarCache
+from src.etl_pipeline.extract.categorical import encode_categoricals
+from src.etl_pipeline.extract.excel import iter_excel_chunks, read_excel, read_excel_header
+from src.etl_pipeline.extract.prefetch import map_ordered, prefetch
+from src.etl_pipeline.utils.incremental import IncrementalState
+from src.etl_pipeline.utils.instrumentation import Instrumentation
+from src.etl_pipeline.utils.lazy_SQL import LazySQl_df
+from src.etl_pipeline.utils.SQL_with_Dataframes import SQl_df
 
 
 class Extract:
-    def __init__(self, *filenames: str):
+    def __init__(self, *filenames: str, chunksize: int | None = None, lazy: bool = False,
+                 workers: int | None = None, backend: str = "auto",
+                 cache: ColumnarCache | bool | None = None,
+                 incremental: IncrementalState | None = None,
+                 schema: dict | None = None,
+                 instrumentation: Instrumentation | None = None,
+                 categorize: bool = False,
+                 queue_depth: int = 2,
+                 filters: dict | None = None):
         """
         Initializes Extract layer.
         Accepts multiple filenames and loads them dynamically into a dictionary.
+
+        When chunksize is given the first file (the fact table) is streamed:
+        its dictionary entry is an iterator of DataFrames with at most chunksize rows,
+        so memory depends on the chunk size instead of the file size.
+        The remaining files (small dimension tables) are always loaded whole.
+
+        When lazy is True no file is read here: each entry is a LazyFrame scan,
+        and only the columns the transformation needs are read when the plan is collected.
+
+        When workers > 1 the files are parsed concurrently (see read_many).
+        The dictionary keeps the order of filenames in every mode.
+
+        cache: a ColumnarCache (or True for the default one in data/cache).
+        Whole-file reads then load a typed Parquet copy when the source file is unchanged.
+
+        incremental: an IncrementalState. The first file (an append-only CSV) is read only
+        from the state's watermark on, so the entry holds just the newly appended rows
+        (typed with its schema entry, if any, like a whole-file read).
+        Pass the same state to Transform, which folds them into the saved counts.
+
+        schema: {filename: file schema} (see extract/schemas.py). Whole-file reads of the listed
+        files only load the schema columns, with explicit dtypes, through the pyarrow CSV reader.
+
+        instrumentation: records the time, rows and memory of every file read (see utils/instrumentation.py).
+
+        categorize: convert low-cardinality text columns of the in-memory tables to categoricals,
+        with one shared dictionary per column name across files (see extract/categorical.py).
+        Streamed chunks and lazy scans are left as they are.
+
+        The first filename may be a glob pattern relative to data/raw (e.g. "billing/*.csv" for
+        one file per day). Its entry is then an iterator of DataFrames, one per matched file
+        (or per chunk with chunksize), in file name order, which Transform aggregates like chunks.
+        The files are parsed by a background thread up to queue_depth frames ahead of the
+        consumer, by workers threads when workers > 1 (see read_pattern).
+
+        filters: {filename or pattern: [(column, operator, value), ...]}, predicates the transformation
+        applies anyway (raw column names). Parquet reads of those files (whole, typed, chunked or a
+        partitioned dataset directory) pass them to the reader, which skips the row groups and
+        partitions their statistics exclude. Other formats read every row.
         """
+        if chunksize and lazy:
+            raise ValueError("chunksize and lazy cannot be combined")
+        if incremental is not None and (chunksize or lazy):
+            raise ValueError("incremental cannot be combined with chunksize or lazy")
+        if any(_is_pattern(filename) for filename in filenames[1:]):
+            raise ValueError("Glob patterns are only supported for the first (fact) file")
+        pattern = bool(filenames) and _is_pattern(filenames[0])
+        if pattern and (lazy or incremental is not None):
+            raise ValueError("A glob pattern cannot be combined with lazy or incremental")
+
+        self.cache = ColumnarCache() if cache is True else (cache or None)
+        self.schema = schema or {}
+        self.filters = filters or {}
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
         self.dataframes = {}
 
+        # Files that are parsed now (not streamed, not lazy), possibly in parallel
+        eager = [] if lazy else list(filenames[1:] if chunksize or incremental or pattern else filenames)
+        with self.instrumentation.step("extract.read_many") as record:
+            tables = self.read_many(eager, workers=workers, backend=backend)
+            record["rows_out"] = sum(len(table) for table in tables.values())
+
         # Dynamically read all input files
-        for filename in filenames:
-            self.dataframes[filename] = self.read_files(filename)
+        for position, filename in enumerate(filenames):
+            if lazy:
+                self.dataframes[filename] = LazySQl_df().scan_file(self, filename)
+            elif pattern and position == 0:
+                self.dataframes[filename] = self.read_pattern(filename, chunksize, workers, queue_depth)
+            elif chunksize and position == 0:
+                self.dataframes[filename] = self.read_chunks(filename, chunksize)
+            elif incremental is not None and position == 0:
+                # The appended rows are typed like the dimension tables (the same schema as a full read)
+                schema = self._schema_for(filename)
+                parse = (lambda source: self._parse_typed(source, schema, extension=".csv")) if schema else None
+                with self.instrumentation.step("extract.read_new_rows") as record:
+                    self.dataframes[filename] = incremental.read_new_rows(
+                        self._file_path(filename),
+                        dependencies=[self._file_path(other) for other in filenames[1:]],
+                        parse=parse
+                    )
+                    record["rows_out"] = len(self.dataframes[filename])
+            else:
+                self.dataframes[filename] = tables[filename]
+
+        # Shared dictionaries: join and group keys become integer codes in every table
+        if categorize:
+            with self.instrumentation.step("extract.categorize"):
+                frames = {name: df for name, df in self.dataframes.items() if isinstance(df, pd.DataFrame)}
+                self.dataframes.update(encode_categoricals(frames))
+
+    def _file_path(self, filename: str) -> Path:
+        """
+        Builds the path of an input file inside the data/raw directory.
+        """
+        base_path = Path("data") / "raw"
+        return base_path / filename
 
-    def read_files(self, filename: str, **kwargs) -> pd.DataFrame:
+    def expand(self, filename: str) -> list[str]:
+        """
+        Input files matched by a glob pattern (relative to data/raw), sorted by name.
+        A plain filename is returned as it is.
+        """
+        if not _is_pattern(filename):
+            return [filename]
+
+        base_path = self._file_path("")
+        matches = sorted(
+            path.relative_to(base_path).as_posix() for path in base_path.glob(filename) if path.is_file()
+        )
+        if not matches:
+            raise FileNotFoundError(f"No input file matches {filename} in {base_path}")
+        return matches
+
+    def read_pattern(self, pattern: str, chunksize: int | None = None, workers: int | None = None,
+                     queue_depth: int = 2) -> Iterator[pd.DataFrame]:
+        """
+        Reads every file matched by pattern, in file name order.
+        Returns an iterator of DataFrames: one per file, or one per chunk when chunksize is given.
+
+        A background thread parses the files while the caller processes the previous frames,
+        holding at most queue_depth frames ready. With workers > 1 (and no chunksize) up to
+        workers files are parsed concurrently in threads; the order of the frames is kept.
+        Each frame's attrs["source"] is the name of its file (used by the rejected-row sink).
+        """
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be a positive integer")
+
+        # Resolved now, so a pattern without matches fails here and not at the first frame
+        filenames = self.expand(pattern)
+
+        if chunksize:
+            frames = (_with_source(chunk, filename)
+                      for filename in filenames for chunk in self.read_chunks(filename, chunksize))
+        elif workers and workers > 1:
+            frames = map_ordered(lambda filename: _with_source(self.read_files(filename), filename),
+                                 filenames, workers)
+        else:
+            frames = (_with_source(self.read_files(filename), filename) for filename in filenames)
+
+        frames = prefetch(frames, queue_depth)
+        # Time the consumer spends waiting for the next frame: near zero when parsing keeps up
+        return self._record_chunks(frames, "extract.queue_wait") if self.instrumentation.enabled else frames
+
+    def read_files(self, filename: str, columns: list[str] | None = None, filters: list[tuple] | None = None,
+                   **kwargs) -> pd.DataFrame:
         """
         Generic file reader.
         Automatically detects file extension and selects appropriate pandas loader.
+
+        columns: optional subset of columns to read (the others are never parsed).
+        filters: (column, operator, value) predicates pushed into Parquet reads, on top of the
+        Extract filters of the file. Rows they exclude may be skipped, so the caller still applies them.
+        Files listed in the Extract schema are read typed (see _parse_typed).
         """
 
-        base_path = Path("data") / "raw"
-        file_path = base_path / filename
-        extension = file_path.suffix.lower()
+        file_path = self._file_path(filename)
+        schema = self._schema_for(filename)
+        filters = list(filters or []) + self._filters_for(filename)
+
+        # Filtered Parquet reads and dataset directories are read directly: a Parquet source
+        # gains nothing from a columnar copy, and a filtered read is not the whole file
+        cached = self.cache is not None and not (
+            _extension(file_path) == ".parquet" and (filters or file_path.is_dir())
+        )
+
+        with self.instrumentation.step(f"extract.read:{filename}") as record:
+            # Warm runs load the cached columnar copy instead of parsing the file again
+            if cached:
+                df = self.cache.load(
+                    file_path,
+                    lambda: self._parse_file(file_path, columns, schema, **kwargs),
+                    columns=columns,
+                    schema=schema,
+                    **kwargs
+                )
+            else:
+                df = self._parse_file(file_path, columns, schema, filters=filters, **kwargs)
+
+            record["rows_out"] = len(df)
+
+        return df
+
+    def _parse_file(self, file_path: Path, columns: list[str] | None = None, schema: dict | None = None,
+                    filters: list[tuple] | None = None, **kwargs) -> pd.DataFrame:
+        """
+        Parses one file with the pandas loader matching its extension.
+        .xlsx workbooks are streamed read-only (see extract/excel.py); sheet_name and header
+        are accepted with their pd.read_excel meaning.
+        Parquet files and dataset directories apply filters while reading (see _parquet_filter).
+        """
+        if schema is not None:
+            return self._parse_typed(file_path, schema, columns, filters)
+
+        extension = _extension(file_path)
 
         # Dynamic dispatch based on extension
         if extension == ".csv":
-            return pd.read_csv(file_path, **kwargs)
+            return pd.read_csv(file_path, usecols=columns, **kwargs)
+
+        elif extension in [".xlsx", ".xlsm"] and set(kwargs) <= {"sheet_name", "header"}:
+            return read_excel(file_path, sheet=kwargs.get("sheet_name"), header_row=kwargs.get("header", 0) + 1,
+                              columns=columns)
+
+        elif extension in [".xls", ".xlsx", ".xlsm"]:
+            return pd.read_excel(file_path, usecols=columns, **kwargs)
+
+        elif extension == ".parquet":
+            if filters:
+                kwargs["filters"] = _parquet_filter(_parquet_schema(file_path), filters)
+            return pd.read_parquet(file_path, columns=columns, **kwargs)
+
+        else:
+            raise ValueError(f"Unsupported file type: {extension}")
+
+    def read_many(self, filenames: list[str], workers: int | None = None,
+                  backend: str = "auto") -> dict[str, pd.DataFrame]:
+        """
+        Reads several files, concurrently when workers > 1.
+        Returns {filename: DataFrame} in the same order as filenames.
+
+        backend:
+        - "thread": thread pool; CSV files use the pyarrow engine, which releases the GIL
+        - "process": process pool, for GIL-bound readers such as Excel (openpyxl)
+        - "auto": "process" if any Excel file is in the list, otherwise "thread"
+
+        Every file is read with this Extract's schema and filters. Thread workers record their
+        reads in its instrumentation; process workers cannot share it, so only the total is recorded.
+        """
+
+        # Sequential path (default): no pool overhead
+        if not workers or workers <= 1 or len(filenames) <= 1:
+            return {filename: self.read_files(filename) for filename in filenames}
+
+        if backend == "auto":
+            has_excel = any(Path(filename).suffix.lower() in [".xls", ".xlsx"] for filename in filenames)
+            backend = "process" if has_excel else "thread"
+
+        if backend == "thread":
+            executor_class = ThreadPoolExecutor
+        elif backend == "process":
+            executor_class = ProcessPoolExecutor
+        else:
+            raise ValueError(f"Unsupported backend: {backend}")
+
+        # The recorder (and its lock) stays in this process
+        instrumentation = self.instrumentation if backend == "thread" else None
+
+        with executor_class(max_workers=min(workers, len(filenames))) as executor:
+            futures = [
+                executor.submit(_read_file, filename, backend == "thread", self.cache, self.schema,
+                                self.filters, instrumentation)
+                for filename in filenames
+            ]
+            # Collect in submission order so the dictionary order does not depend on timing
+            return {filename: future.result() for filename, future in zip(filenames, futures)}
+
+    def read_header(self, filename: str) -> list[str]:
+        """
+        Returns the column names of a file without reading its rows.
+        """
+
+        file_path = self._file_path(filename)
+        extension = _extension(file_path)
+
+        if extension == ".csv":
+            return list(pd.read_csv(file_path, nrows=0).columns)
+
+        elif extension in [".xlsx", ".xlsm"]:
+            schema = self._schema_for(filename) or {}
+            return read_excel_header(file_path, schema.get("sheet"), schema.get("header_row", 1))
 
-        elif extension in [".xls", ".xlsx"]:
-            return pd.read_excel(file_path, **kwargs)
+        elif extension == ".xls":
+            return list(pd.read_excel(file_path, nrows=0).columns)
 
         elif extension == ".parquet":
-            return pd.read_parquet(file_path, **kwargs)
+            return list(_parquet_schema(file_path).names)
+
+        else:
+            raise ValueError(f"Unsupported file type: {extension}")
+
+    def _parse_typed(self, file_path, schema: dict, columns: list[str] | None = None,
+                     filters: list[tuple] | None = None, extension: str | None = None) -> pd.DataFrame:
+        """
+        Reads only the schema columns with their declared dtypes.
+        file_path may also be a binary file object, with its extension given (e.g. ".csv").
+
+        CSV files go through the pyarrow CSV reader: text columns are decoded once into
+        Arrow buffers, "category" columns are dictionary-encoded while parsing, and numeric
+        text with thousands separators is cleaned and cast with Arrow compute functions.
+        Values that are not numbers become missing (NaN), like SQl_df.convert_to_numeric.
+        """
+        dtypes = {
+            column: dtype for column, dtype in schema["columns"].items()
+            if columns is None or column in columns
+        }
+        thousands = schema.get("thousands")
+        extension = extension or _extension(file_path)
+
+        # Numeric columns that may contain separators are read as text and parsed below
+        separated = _separated_columns(dtypes, thousands)
+
+        if extension == ".csv":
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+
+            column_types = {}
+            for column, dtype in dtypes.items():
+                if dtype == "category":
+                    column_types[column] = pa.dictionary(pa.int32(), pa.string())
+                elif column in separated or dtype in ("str", "string", "object"):
+                    column_types[column] = pa.string()
+                else:
+                    column_types[column] = pa.from_numpy_dtype(pd.api.types.pandas_dtype(dtype))
+
+            table = pa_csv.read_csv(
+                file_path,
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=list(dtypes),
+                    column_types=column_types,
+                    strings_can_be_null=True  # empty fields are missing values, as in pd.read_csv
+                )
+            )
+
+            for column in separated:
+                index = table.schema.get_field_index(column)
+                table = table.set_column(
+                    index, column, _parse_numeric_text(table.column(column), thousands, dtypes[column])
+                )
+
+            df = table.to_pandas()
 
         else:
+            df = _apply_dtypes(self._parse_file(file_path, list(dtypes), filters=filters, **_sheet_options(schema)),
+                               dtypes, separated, thousands)
+
+        # Sorted categories keep groupby/pivot output in the same (lexical) order as plain text
+        for column, dtype in dtypes.items():
+            if dtype == "category":
+                df[column] = df[column].cat.set_categories(sorted(df[column].cat.categories))
+
+        return df
+
+    def read_chunks(self, filename: str, chunksize: int, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Streaming file reader.
+        Returns an iterator over consecutive DataFrames of at most chunksize rows.
+
+        .xlsx workbooks are read row by row in read-only mode. If the file is in the Extract
+        schema, only its columns are read (from its "sheet" and "header_row") and each chunk
+        is typed; "category" columns stay text, since the categories of later chunks are unknown.
+        """
+
+        file_path = self._file_path(filename)
+        extension = _extension(file_path)
+
+        # Validate up front so errors surface here and not at the first chunk
+        if chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer")
+
+        if extension == ".xls":
+            raise ValueError(f"Chunked reading is not supported for {extension} files")
+
+        if extension not in [".csv", ".parquet", ".xlsx", ".xlsm"]:
             raise ValueError(f"Unsupported file type: {extension}")
 
+        if extension in [".xlsx", ".xlsm"]:
+            chunks = self._iter_excel_chunks(file_path, chunksize, self._schema_for(filename), **kwargs)
+        else:
+            chunks = self._iter_chunks(file_path, extension, chunksize, self._filters_for(filename), **kwargs)
+        return self._record_chunks(chunks) if self.instrumentation.enabled else chunks
+
+    def _iter_chunks(self, file_path: Path, extension: str, chunksize: int, filters: list[tuple] | None = None,
+                     **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Generator behind read_chunks. The file is opened on the first iteration.
+        """
+        if extension == ".csv":
+            # Context manager closes the file once the last chunk is consumed
+            with pd.read_csv(file_path, chunksize=chunksize, **kwargs) as reader:
+                yield from reader
+
+        elif filters or file_path.is_dir():
+            import pyarrow as pa
+            import pyarrow.dataset as ds
+
+            # Scanner batches: row groups and partitions excluded by the filters are never decoded
+            dataset = ds.dataset(file_path, format="parquet", partitioning="hive")
+            batches = dataset.to_batches(batch_size=chunksize,
+                                         filter=_parquet_filter(dataset.schema, filters), **kwargs)
+
+            # The scanner stops each batch at a row group boundary: regroup into chunks of chunksize rows
+            pending, rows, yielded = [], 0, False
+            for batch in batches:
+                pending.append(batch)
+                rows += batch.num_rows
+                while rows >= chunksize:
+                    table = pa.Table.from_batches(pending)
+                    yield table.slice(0, chunksize).to_pandas()
+                    yielded = True
+                    rest = table.slice(chunksize)
+                    pending, rows = rest.to_batches(), rest.num_rows
+
+            # Last rows (or, if every row was filtered out, one empty chunk with the columns)
+            if rows or not yielded:
+                columns = kwargs.get("columns") or dataset.schema.names
+                schema = pa.schema([dataset.schema.field(column) for column in columns])
+                yield pa.Table.from_batches(pending, schema=schema).to_pandas()
+
+        else:
+            import pyarrow.parquet as pq
+
+            # Read record batches so only one batch is decoded at a time
+            parquet_file = pq.ParquetFile(file_path)
+            for batch in parquet_file.iter_batches(batch_size=chunksize, **kwargs):
+                yield batch.to_pandas()
+
+    def _iter_excel_chunks(self, file_path: Path, chunksize: int, schema: dict | None = None,
+                           **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Generator behind read_chunks for workbooks: streamed rows, typed with the file schema if any.
+        """
+        if schema is None:
+            options = {"sheet": kwargs.get("sheet_name"), "header_row": kwargs.get("header", 0) + 1}
+            yield from iter_excel_chunks(file_path, chunksize, **options)
+            return
+
+        dtypes = schema["columns"]
+        thousands = schema.get("thousands")
+        separated = _separated_columns(dtypes, thousands)
+        # Categories differ from chunk to chunk, so category columns are left as text
+        chunk_dtypes = {column: dtype for column, dtype in dtypes.items() if dtype != "category"}
+
+        for chunk in iter_excel_chunks(file_path, chunksize, sheet=schema.get("sheet"),
+                                       header_row=schema.get("header_row", 1), columns=list(dtypes)):
+            yield _apply_dtypes(chunk, chunk_dtypes, separated, thousands)
+
+    def _record_chunks(self, chunks: Iterator[pd.DataFrame], name: str = "extract.read_chunk") -> Iterator[pd.DataFrame]:
+        """
+        Times the parsing of each chunk (not the downstream work done between chunks).
+        """
+        while True:
+            with self.instrumentation.step(name) as record:
+                chunk = next(chunks, None)
+                record["rows_out"] = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                return
+            yield chunk
+
+    def _schema_for(self, filename: str) -> dict | None:
+        """
+        Schema of a file: its own entry, or the entry of a glob pattern it matches.
+        """
+        return _for_file(self.schema, filename)
+
+    def _filters_for(self, filename: str) -> list[tuple]:
+        """
+        Extract filters of a file: its own entry, or the entry of a glob pattern it matches.
+        """
+        return list(_for_file(self.filters, filename) or [])
+
     def extract(self):
         """
         Returns raw DataFrames as a dictionary.
+        Streamed files are returned as iterators of DataFrame chunks and
+        lazy files as LazyFrame scans.
         """
         return self.dataframes
 
 
+def _read_file(filename: str, arrow_csv: bool, cache: ColumnarCache | None, schema: dict, filters: dict,
+               instrumentation: Instrumentation | None = None) -> pd.DataFrame:
+    """
+    Pool task used by Extract.read_many.
+    Module-level so it can be pickled by the process pool without the caller's DataFrames.
+    """
+    reader = Extract(cache=cache, schema=schema, filters=filters, instrumentation=instrumentation)
+    if arrow_csv and Path(filename).suffix.lower() == ".csv" and _for_file(schema, filename) is None:
+        return reader.read_files(filename, engine="pyarrow")
+    return reader.read_files(filename)
+
+
+def _with_source(df: pd.DataFrame, filename: str) -> pd.DataFrame:
+    # Name of the input file, kept by the column renames and row selections of the transform
+    df.attrs["source"] = filename
+    return df
+
+
+def _is_pattern(filename: str) -> bool:
+    return any(character in filename for character in "*?[")
+
+
+def _for_file(mapping: dict, filename: str):
+    # Entry of filename in a {filename or glob pattern: value} mapping, or None
+    if filename in mapping:
+        return mapping[filename]
+    for key, value in mapping.items():
+        if _is_pattern(key) and fnmatch(filename, key):
+            return value
+    return None
+
+
+def _extension(file_path: Path) -> str:
+    # A directory is a (partitioned) Parquet dataset
+    return ".parquet" if file_path.is_dir() else file_path.suffix.lower()
+
+
+def _parquet_schema(file_path: Path):
+    """
+    Arrow schema of a Parquet file or dataset directory (hive partition columns included).
+    """
+    import pyarrow.dataset as ds
+
+    return ds.dataset(file_path, format="parquet", partitioning="hive").schema
+
+
+def _parquet_filter(schema, filters: list[tuple] | None):
+    """
+    pyarrow filter expression of the (column, operator, value) predicates that are safe to apply
+    while reading, or None. The reader uses it to skip row groups (min/max statistics) and
+    partitions. A predicate is only pushed when the column already has the value's type in the
+    file (numbers vs. numbers, text vs. text): numeric text still goes through convert_to_numeric
+    first. Missing values are kept, so the transform (and its quality checks) still sees them.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    expression = None
+    for column, operator, value in filters or []:
+        if operator not in SQl_df.OPERATORS:
+            raise ValueError(f"Invalid operator: {operator}")
+        if column not in schema.names:
+            continue
+
+        column_type = schema.field(column).type
+        if pa.types.is_dictionary(column_type):
+            column_type = column_type.value_type
+        numeric = (isinstance(value, numbers.Real) and not isinstance(value, bool)
+                   and (pa.types.is_integer(column_type) or pa.types.is_floating(column_type)
+                        or pa.types.is_decimal(column_type)))
+        text = isinstance(value, str) and (pa.types.is_string(column_type) or pa.types.is_large_string(column_type))
+        if not (numeric or text):
+            continue
+
+        field = pc.field(column)
+        predicate = SQl_df.OPERATORS[operator](field, value) | field.is_null()
+        expression = predicate if expression is None else expression & predicate
+
+    return expression
+
+
+def _separated_columns(dtypes: dict, thousands: str | None) -> list[str]:
+    """
+    Numeric schema columns whose text may contain the thousands separator.
+    """
+    return [
+        column for column, dtype in dtypes.items()
+        if thousands and dtype != "category" and pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype))
+    ]
+
+
+def _apply_dtypes(df: pd.DataFrame, dtypes: dict, separated: list[str], thousands: str | None) -> pd.DataFrame:
+    """
+    Types a frame read without the pyarrow CSV reader: separated numeric text is cleaned and
+    parsed (invalid values become NaN), the other columns are cast to their schema dtype.
+    As with the pyarrow CSV reader, an integer column with missing values becomes float64 (NaN).
+    """
+    for column in separated:
+        if not pd.api.types.is_numeric_dtype(df[column]):
+            text = df[column].astype(str).str.replace(thousands, '', regex=False)
+            df[column] = pd.to_numeric(text, errors='coerce')
+
+    casts = {}
+    for column, dtype in dtypes.items():
+        if pd.api.types.is_integer_dtype(pd.api.types.pandas_dtype(dtype)) and df[column].isna().any():
+            dtype = "float64"
+        casts[column] = dtype
+    return df.astype(casts)
+
+
+def _sheet_options(schema: dict) -> dict:
+    """
+    pd.read_excel options (sheet_name, header) of a workbook schema's "sheet" and "header_row".
+    """
+    options = {}
+    if "sheet" in schema:
+        options["sheet_name"] = schema["sheet"]
+    if "header_row" in schema:
+        options["header"] = schema["header_row"] - 1
+    return options
+
+
+def _parse_numeric_text(values, thousands: str, dtype: str):
+    """
+    Arrow version of convert_to_numeric: removes thousands separators and casts to dtype.
+    Text that is not a number becomes null.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    target = pa.from_numpy_dtype(pd.api.types.pandas_dtype(dtype))
+    pattern = r"^[-+]?\d+$" if pa.types.is_integer(target) else r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$"
+
+    text = pc.utf8_trim_whitespace(pc.replace_substring(values, thousands, ""))
+    valid = pc.match_substring_regex(text, pattern)
+    return pc.cast(pc.if_else(valid, text, pa.scalar(None, pa.string())), target)
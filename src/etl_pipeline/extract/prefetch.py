@@ -0,0 +1,89 @@
+"""
+Bounded producer/consumer handoff between Extract and Transform.
+
+prefetch() runs an iterator of frames (e.g. one per daily file) in a background thread and
+hands the frames over through a queue of at most depth entries: the next file is parsed while
+the current one goes through the transform steps, and a slow consumer stops the producer
+instead of letting parsed files pile up in memory.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Full, Queue
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()  # End of the producer's items
+
+
+def prefetch(items: Iterator[T], depth: int) -> Iterator[T]:
+    """
+    Yields the items of iterator, produced by a background thread at most depth items ahead.
+
+    The producer's exceptions are raised in the consumer. Closing the returned generator
+    (or an error in the consumer) stops the producer. The thread starts on the first iteration.
+    """
+    if depth < 1:
+        raise ValueError("queue_depth must be a positive integer")
+
+    queue = Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in items:
+                if not _put(queue, (None, item), stop):
+                    return
+            _put(queue, (None, _DONE), stop)
+        except BaseException as error:
+            _put(queue, (error, None), stop)
+        finally:
+            # Runs the producer's own cleanup (open readers, thread pools) in this thread
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="extract-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            error, item = queue.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def map_ordered(func: Callable[[str], T], names: Iterable[str], workers: int) -> Iterator[T]:
+    """
+    Yields func(name) for every name, in order, computing up to workers of them concurrently
+    in a thread pool (at most workers results are held at a time).
+    """
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for name in names:
+            pending.append(executor.submit(func, name))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _put(queue: Queue, entry: tuple, stop: threading.Event) -> bool:
+    # Blocks while the queue is full, but gives up once the consumer has stopped
+    while not stop.is_set():
+        try:
+            queue.put(entry, timeout=0.1)
+            return True
+        except Full:
+            continue
+    return False
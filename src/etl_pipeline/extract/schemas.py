@@ -0,0 +1,48 @@
+"""
+Per-pipeline input schemas for Extract(..., schema=...).
+
+Each file lists only the columns its transformation reads, with the dtype they are
+loaded as (raw column names, before rename_columns). Low-cardinality text is loaded
+as "category". "thousands" is the separator removed from numeric text at read time,
+so the transforms receive real numbers and skip the string round-trip.
+
+Excel inputs (.xlsx) may also give "sheet" (name or 0-based position, default: the first
+sheet) and "header_row" (1-based row of the column names, default: 1).
+"""
+
+HOSPITAL_SCHEMA = {
+    "hospital_billing_data.csv": {
+        "columns": {
+            "Province": "category",
+            "Hospital": "category",
+            "PatientID": "int64",
+            "BillAmount": "float64",
+            "AgeRangeID": "int64",
+        },
+        "thousands": ",",
+    },
+    "age_ranges.csv": {
+        "columns": {
+            "AgeRangeID": "int64",
+            "AgeRangeLabel": "category",
+        },
+    },
+}
+
+MARKETPLACE_SCHEMA = {
+    "raw_data.csv": {
+        "columns": {
+            "MARKET PLACE": "category",
+            "Customer Site ID": "int64",
+            "Product Code": "category",
+            "Equipment Rental Payment/Month": "float64",
+        },
+        "thousands": ",",
+    },
+    "segments.csv": {
+        "columns": {
+            "Product Code": "category",
+            "Segment": "category",
+        },
+    },
+}
@@ -1,33 +1,128 @@
-from datetime import datetime
+import json
+import os
+import shutil
+import threading
+import pandas as pd
 from pathlib import Path
 
+from src.etl_pipeline.load.version_store import VersionStore
+from src.etl_pipeline.utils.instrumentation import Instrumentation
+
 
 class Load:
-    def __init__(self, processed_data):
+    # Output formats: file extension of each supported writer
+    FORMATS = {"xlsx": ".xlsx", "csv": ".csv", "parquet": ".parquet"}
+
+    def __init__(self, processed_data, fmt: str = "xlsx", compression: str | None = "zstd",
+                 publish: str = "link", background: bool = False,
+                 instrumentation: Instrumentation | None = None,
+                 output_dir: str | Path = Path("data") / "output",
+                 quality: dict | None = None,
+                 partition_by: str | None = None):
         """
         Load layer.
         Responsible for persisting transformed dataset with version control.
+
+        Versions live in a content-addressed VersionStore (output_dir/versions): a result identical
+        to an earlier one is not written again, and 'latest' is only rewritten when it changes.
+
+        processed_data: a Transform (its .data is written) or the result DataFrame itself,
+        e.g. one restored from a checkpoint.
+
+        fmt: output format, "xlsx" (streaming write-only workbook), "csv" or "parquet".
+        compression: Parquet compression codec (ignored by the other formats).
+        publish: how a Parquet 'latest' is created from the version blob, written only once:
+        "link" (hardlink, falls back to a copy across filesystems) or "copy".
+        A hardlinked 'latest' shares its bytes with the version, so it must not be edited in place.
+        Other formats are rendered from the frame.
+        background: write in a separate thread; call wait() to block until it finishes.
+        instrumentation: the run's recorder. Its JSON report is written to
+        versions/reports/<run id>.report.json once the load finishes.
+        output_dir: where 'latest' and the versions directory live (one directory per pipeline).
+        quality: data-quality summary of the run (DataQuality.summary()), recorded in the
+        version's manifest entry next to the row count.
+        partition_by: with fmt "parquet", 'latest' is a hive-partitioned dataset directory
+        (output_dir/latest/<column>=<value>/part-0.parquet) instead of one file, so readers can
+        load only the partitions they need (pd.read_parquet(..., filters=[(column, "==", value)])).
+        'latest' is a symlink to the dataset of the publishing run (output_dir/latest-<run id>).
+        Where symlinks cannot be created (Windows without developer mode), the dataset directory is
+        renamed to 'latest' instead, and readers may briefly find no 'latest' during the swap.
+        The partition column is read back as a categorical; the version blob stays a single file.
         """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported output format: {fmt}")
+        if publish not in ("link", "copy"):
+            raise ValueError(f"Unsupported publish mode: {publish}")
+        if partition_by is not None and fmt != "parquet":
+            raise ValueError("Partitioned output needs the parquet format")
+
         # Transform class exposes final dataframe via .data
-        self.df = processed_data.data
+        self.df = processed_data if isinstance(processed_data, pd.DataFrame) else processed_data.data
+        self.fmt = fmt
+        self.compression = compression
+        self.publish = publish
+        self.instrumentation = instrumentation
+        self.quality = quality
+        self.partition_by = partition_by
 
         # Define output directory structure
-        self.output_dir = Path("data") / "output"
+        self.output_dir = Path(output_dir)
         self.versions_dir = self.output_dir / "versions"
+        self.store = VersionStore(self.versions_dir)
+
+        # Manifest entry of this run and path of its blob (set by _save_version)
+        self.version = None
+        self.version_file = None
+        # What 'latest' holds (hash, format, partitioning), recorded only after it is published
+        self.published_file = self.output_dir / ".latest.json"
+        # Whether 'latest' was rewritten (set by _save_latest)
+        self.published = False
+        # Path of the run report (set by _save_report)
+        self.report_file = None
+
+        self.thread = None
+        self._error = None
 
         # Automatically execute persistence workflow upon instantiation
-        self.load()
+        if background:
+            self.thread = threading.Thread(target=self._load_in_background, name="Load")
+            self.thread.start()
+        else:
+            self.load()
 
     def load(self):
         """
-        Persist dataframe with versioning (Excel).
+        Persist dataframe with versioning.
         """
+        recorder = self.instrumentation or Instrumentation(enabled=False)
+
         # Ensure directory structure exists
         self._ensure_directories()
-        # Save immutable timestamped version
-        self._save_version()
-        # Update mutable 'latest' snapshot - Saves a timestamped Excel file.
-        self._save_latest()
+        # Save immutable content-addressed version (skipped if the result is unchanged)
+        with recorder.step("load.write", rows_in=len(self.df)):
+            self._save_version()
+        # Update mutable 'latest' snapshot from the version file
+        with recorder.step("load.publish"):
+            self._save_latest()
+        # Run report next to the version it describes
+        if recorder.enabled:
+            self._save_report()
+
+    def wait(self):
+        """
+        Blocks until a background load finishes and re-raises its error, if any.
+        """
+        if self.thread is not None:
+            self.thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _load_in_background(self):
+        # Keep the exception so wait() can report it in the caller's thread
+        try:
+            self.load()
+        except Exception as error:
+            self._error = error
 
     def _ensure_directories(self):
         # Create main output directory if missing
@@ -36,26 +131,143 @@ class Load:
         self.versions_dir.mkdir(parents=True, exist_ok=True)
 
     def _save_version(self):
-        # Generate unique timestamp to avoid filename collision
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        # Version file path follows append-only storage strategy
-        version_file = self.versions_dir / f"v_{timestamp}.xlsx"
-
-        # Put the dataframe in Excel without index (clean analytical output)
-        self.df.to_excel(
-            version_file,
-            index=False,
-            engine="openpyxl"  # Explicit engine for Excel compatibility
-        )
+        # Run ID (microsecond timestamp) -> content hash; the blob is only written for new content
+        metadata = {"quality": self.quality} if self.quality is not None else {}
+        if self.partition_by is not None:
+            metadata["partition_by"] = self.partition_by
+        self.version = self.store.commit(self.df, format=self.fmt, **metadata)
+        self.version_file = self.store.blob(self.version["hash"])
 
     def _save_latest(self):
-        latest_file = self.output_dir / "latest.xlsx"
+        # A partitioned dataset is a directory named 'latest'
+        if self.partition_by is not None:
+            latest_file = self.output_dir / "latest"
+        else:
+            latest_file = self.output_dir / f"latest{self.FORMATS[self.fmt]}"
+
+        # Same result, format and partitioning as the last published one: 'latest' is up to date.
+        # The manifest is not enough: its entry is appended before 'latest' is published.
+        state = {"hash": self.version["hash"], "format": self.fmt, "partition_by": self.partition_by}
+        if self._published_state() == state and latest_file.exists():
+            return
+
+        if self.partition_by is not None:
+            self._save_latest_partitioned(latest_file)
+        else:
+            self._save_latest_file(latest_file)
+        self._record_published(state)
+
+    def _save_latest_file(self, latest_file: Path):
+        tmp_file = self.output_dir / f".latest.{os.getpid()}.tmp"
+
+        # Publish through a temporary name + rename so readers never see a partial file
+        tmp_file.unlink(missing_ok=True)
+        if self.fmt == "parquet" and self.compression == self.store.compression:
+            # The blob already is this Parquet file
+            if self.publish == "link":
+                try:
+                    os.link(self.version_file, tmp_file)
+                except OSError:
+                    shutil.copyfile(self.version_file, tmp_file)
+            else:
+                shutil.copyfile(self.version_file, tmp_file)
+        else:
+            write_frame(self.df, tmp_file, self.fmt, self.compression)
+
+        os.replace(tmp_file, latest_file)
+        self.published = True
+
+    def _published_state(self) -> dict | None:
+        try:
+            return json.loads(self.published_file.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _record_published(self, state: dict):
+        # Written after 'latest' is replaced: a failed publish is retried by the next run
+        tmp_file = self.output_dir / f".latest.{os.getpid()}.json.tmp"
+        tmp_file.write_text(json.dumps(state))
+        os.replace(tmp_file, self.published_file)
+
+    def _save_latest_partitioned(self, latest_dir: Path):
+        # Each dataset gets its own directory and 'latest' is a symlink to it, switched with one
+        # rename: readers see the old or the new dataset, never a partial or missing one
+        target = f"latest-{self.version['run_id']}"
+        self.df.to_parquet(self.output_dir / target, partition_cols=[self.partition_by], index=False,
+                           compression=self.compression, basename_template="part-{i}.parquet")
+
+        old_dir = self.output_dir / f".latest.{os.getpid()}.old"
+        tmp_link = self.output_dir / f".latest.{os.getpid()}.link"
+        tmp_link.unlink(missing_ok=True)
+        try:
+            os.symlink(target, tmp_link, target_is_directory=True)
+        except (OSError, NotImplementedError):
+            # No symlinks (Windows without developer mode or admin rights): swap the directories.
+            # 'latest' is missing between the two renames, so a reader may briefly find no dataset
+            if latest_dir.is_symlink() or latest_dir.exists():
+                os.replace(latest_dir, old_dir)
+            os.replace(self.output_dir / target, latest_dir)
+        else:
+            # A plain directory cannot be replaced by a link: move it aside first (one-time migration)
+            if latest_dir.is_dir() and not latest_dir.is_symlink():
+                os.replace(latest_dir, old_dir)
+            os.replace(tmp_link, latest_dir)
+        self.published = True
+
+        # Datasets no longer linked, including those of runs interrupted before the switch
+        for path in self.output_dir.glob("latest-*"):
+            if path.name != target:
+                shutil.rmtree(path, ignore_errors=True)
+        for path in self.output_dir.glob(".latest.*.old"):
+            if path.is_symlink():
+                path.unlink()
+            else:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _save_report(self):
+        # versions/reports/<run id>.report.json
+        self.report_file = self.store.report_path(self.version["run_id"])
+        self.report_file.parent.mkdir(parents=True, exist_ok=True)
+        self.instrumentation.write(self.report_file)
+
+
+# =====================================================
+# Writers
+# =====================================================
+def write_frame(df: pd.DataFrame, path: Path, fmt: str, compression: str | None = "zstd"):
+    """
+    Serializes the dataframe to path in the given format (without index).
+    """
+    if fmt == "parquet":
+        df.to_parquet(path, index=False, compression=compression)
+
+    elif fmt == "csv":
+        df.to_csv(path, index=False)
+
+    elif fmt == "xlsx":
+        write_xlsx(df, path)
+
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+
+
+def write_xlsx(df: pd.DataFrame, path: Path):
+    """
+    Streams rows into a write-only openpyxl workbook.
+    Much faster and lighter than DataFrame.to_excel, which builds the whole sheet in memory.
+    """
+    from openpyxl import Workbook
 
-        self.df.to_excel(
-            latest_file,
-            index=False,
-            engine="openpyxl"
-        )
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
 
+    sheet.append([str(column) for column in df.columns])
 
+    # Missing values become empty cells, like to_excel
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        sheet.append(row)
 
+    # openpyxl picks the format from the file name: a temporary name needs a file object
+    with open(path, "wb") as handle:
+        workbook.save(handle)
@@ -0,0 +1,181 @@
+import argparse
+import hashlib
+import json
+import os
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+
+
+class VersionStore:
+    """
+    Content-addressed store of the Load results.
+
+    Every distinct result is kept once, as a compressed Parquet blob named after the hash of
+    its content (objects/<hash[:2]>/<hash>.parquet). A run whose result is identical to an
+    earlier one writes nothing but a manifest line. manifest.jsonl maps each run ID to the
+    hash of its result, in run order, so listing versions reads one small file and restoring
+    one reads one blob.
+
+        versions/
+            manifest.jsonl
+            objects/ab/ab12....parquet
+            reports/<run id>.report.json
+    """
+
+    def __init__(self, directory: str | Path = Path("data") / "output" / "versions",
+                 compression: str | None = "zstd"):
+        self.directory = Path(directory)
+        self.compression = compression  # Parquet codec of the blobs
+        self.manifest = self.directory / "manifest.jsonl"
+        self.objects_dir = self.directory / "objects"
+        self.reports_dir = self.directory / "reports"
+
+    # =====================================================
+    # Keys
+    # =====================================================
+    @staticmethod
+    def content_hash(df: pd.DataFrame) -> str:
+        """
+        Hash of the column names, dtypes and values (the index is not part of the result).
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr([(str(column), str(dtype)) for column, dtype in df.dtypes.items()]).encode())
+        # One 64-bit hash per row, over every column: vectorized, no text rendering of the values
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def blob(self, content_hash: str) -> Path:
+        return self.objects_dir / content_hash[:2] / f"{content_hash}.parquet"
+
+    def _new_run_id(self) -> str:
+        # Microsecond timestamps sort in run order and do not collide within one second
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        known = {entry["run_id"] for entry in self.versions()}
+        while run_id in known:
+            run_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return run_id
+
+    # =====================================================
+    # Write
+    # =====================================================
+    def commit(self, df: pd.DataFrame, content_hash: str | None = None, **metadata) -> dict:
+        """
+        Stores df (unless a blob with the same content exists) and records a new run.
+        Returns the manifest entry; entry["written"] tells whether a blob was written.
+        metadata: extra fields of the manifest entry (e.g. the published format).
+        """
+        content_hash = content_hash or self.content_hash(df)
+        path = self.blob(content_hash)
+
+        written = not path.exists()
+        if written:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so a crash never leaves a truncated blob
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            df.to_parquet(tmp, index=False, compression=self.compression)
+            os.replace(tmp, path)
+
+        entry = {
+            "run_id": self._new_run_id(),
+            "hash": content_hash,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "rows": len(df),
+            **metadata
+        }
+
+        # One short line per run, appended: concurrent writers never interleave within a line
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+
+        return {**entry, "written": written}
+
+    # =====================================================
+    # Read
+    # =====================================================
+    def versions(self) -> list[dict]:
+        """
+        Manifest entries, oldest run first.
+        """
+        if not self.manifest.exists():
+            return []
+
+        with open(self.manifest, encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle if line.strip()]
+
+    def latest(self) -> dict | None:
+        """
+        Manifest entry of the most recent run, or None.
+        """
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def get(self, run_id: str) -> dict:
+        """
+        Manifest entry of run_id ("latest" for the most recent run).
+        """
+        versions = self.versions()
+        if run_id == "latest" and versions:
+            return versions[-1]
+        for entry in versions:
+            if entry["run_id"] == run_id:
+                return entry
+        raise KeyError(f"Unknown version: {run_id}")
+
+    def restore(self, run_id: str = "latest") -> pd.DataFrame:
+        """
+        Result of run_id, read back from its blob.
+        """
+        return pd.read_parquet(self.blob(self.get(run_id)["hash"]))
+
+    def report_path(self, run_id: str) -> Path:
+        return self.reports_dir / f"{run_id}.report.json"
+
+    def size(self) -> int:
+        """
+        Total size of the blobs in bytes.
+        """
+        if not self.objects_dir.exists():
+            return 0
+        return sum(blob.stat().st_size for blob in self.objects_dir.glob("*/*.parquet"))
+
+
+def main(argv: list[str] | None = None):
+    """
+    Version store command:
+        python -m src.etl_pipeline.load.version_store --list
+        python -m src.etl_pipeline.load.version_store --restore RUN_ID --to restored.xlsx
+    """
+    from src.etl_pipeline.load.load_code import Load, write_frame
+
+    parser = argparse.ArgumentParser(description="List or restore Load versions.")
+    parser.add_argument("--versions-dir", default=str(Path("data") / "output" / "versions"))
+    parser.add_argument("--list", action="store_true", help="print every run with its content hash")
+    parser.add_argument("--restore", metavar="RUN_ID", help="run to restore ('latest' for the most recent)")
+    parser.add_argument("--to", metavar="PATH", help="file to write the restored result to (.xlsx, .csv or .parquet)")
+    args = parser.parse_args(argv)
+
+    store = VersionStore(args.versions_dir)
+
+    if args.restore:
+        if not args.to:
+            parser.error("--restore needs --to")
+        path = Path(args.to)
+        # The output format comes from the extension: reject the ones Load cannot write
+        extensions = {extension: fmt for fmt, extension in Load.FORMATS.items()}
+        if path.suffix.lower() not in extensions:
+            parser.error(f"--to must end in one of: {', '.join(extensions)}")
+        write_frame(store.restore(args.restore), path, extensions[path.suffix.lower()])
+        print(f"Restored {args.restore} to {path}")
+
+    if args.list or not args.restore:
+        versions = store.versions()
+        for entry in versions:
+            print(f"{entry['run_id']}  {entry['hash']}  {entry['rows']:>8} rows  {entry['created']}")
+        blobs = len({entry["hash"] for entry in versions})
+        print(f"{len(versions)} runs, {blobs} distinct results, {store.size()} bytes in {store.directory}")
+
+
+if __name__ == "__main__":
+    main()
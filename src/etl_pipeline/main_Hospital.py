@@ -1,22 +1,19 @@
-from src.etl_pipeline.extract.extract import Extract
+from src.etl_pipeline.extract.schemas import HOSPITAL_SCHEMA
 from src.etl_pipeline.transform.transform_hospital import Transform
 from src.etl_pipeline.load.load_code import Load
+from src.etl_pipeline.pipeline import Pipeline
 
+# Hospital billing report: bills per Province, billing range and age range
+PIPELINE = Pipeline("hospital", Transform, "hospital_billing_data.csv", "age_ranges.csv", HOSPITAL_SCHEMA,
+                    partition_column="Province")
 
-def run():
+
+def run(**options) -> Load:
     """
     Orchestrates the ETL pipeline for Hospital dataset.
-    Executes Extract → Transform → Load sequentially.
+    Executes Extract → Transform → Load sequentially (options: see Pipeline.run).
     """
-
-    # Extract raw CSV files from data/raw directory
-    raw_data = Extract("hospital_billing_data.csv", "age_ranges.csv")
-
-    # Apply business transformation logic
-    processed_data = Transform(raw_data.extract())
-
-    # Persist final dataset with versioning
-    Load(processed_data)
+    return PIPELINE.run(**options)
 
 
 if __name__ == "__main__":
@@ -1,23 +1,20 @@
-from src.etl_pipeline.extract.extract import Extract
+from src.etl_pipeline.extract.schemas import MARKETPLACE_SCHEMA
 from src.etl_pipeline.transform.transform_Marketplace import Transform
 from src.etl_pipeline.load.load_code import Load
+from src.etl_pipeline.pipeline import Pipeline
 
+# Marketplace rental report: customers per MARKET_PLACE, unit-count category and segment
+PIPELINE = Pipeline("marketplace", Transform, "raw_data.csv", "segments.csv", MARKETPLACE_SCHEMA,
+                    partition_column="MARKET_PLACE")
 
-def run():
+
+def run(**options) -> Load:
     """
     Orchestrates the ETL pipeline for Marketplace dataset.
-    Executes Extract → Transform → Load sequentially.
+    Executes Extract → Transform → Load sequentially (options: see Pipeline.run).
     """
-
-    # Extract raw CSV files from data/raw directory
-    raw_data = Extract("raw_data.csv", "segments.csv")
-
-    # Apply business transformation logic
-    processed_data = Transform(raw_data.extract())
-
-    # Persist final dataset with versioning
-    Load(processed_data)
+    return PIPELINE.run(**options)
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
@@ -0,0 +1,168 @@
+from pathlib import Path
+
+from src.etl_pipeline.extract.extract import Extract
+from src.etl_pipeline.load.load_code import Load
+from src.etl_pipeline.utils.incremental import IncrementalState
+from src.etl_pipeline.utils.instrumentation import Instrumentation
+from src.etl_pipeline.utils.intermediate import IntermediateStore
+from src.etl_pipeline.utils.memo import ResultMemo, code_version
+from src.etl_pipeline.utils.quality import DataQuality
+
+
+class Pipeline:
+    def __init__(self, name: str, transform: type, fact_file: str, dimension_file: str, schema: dict,
+                 partition_column: str):
+        """
+        Extract → Transform → Load orchestration shared by the main_* entry points.
+
+        name: pipeline name (data/intermediate/<name>, data/state/<name>.json).
+        transform: the Transform class; its PARAMETERS, fact_filters() and code are used for the
+        memo key, the incremental state and the Parquet pushdown.
+        fact_file / dimension_file: default input files in data/raw.
+        schema: the typed-extraction schema of both files (see extract/schemas.py).
+        partition_column: the report column a partitioned Parquet output is split on.
+        """
+        self.name = name
+        self.transform = transform
+        self.fact_file = fact_file
+        self.dimension_file = dimension_file
+        self.schema = schema
+        self.partition_column = partition_column
+
+    def run(self, chunksize: int | None = None, lazy: bool = False, workers: int | None = None,
+            cache: bool = False, incremental: bool = False, output_format: str = "xlsx",
+            background_load: bool = False, typed: bool = False,
+            instrument: bool = False, profile: bool = False, partitions: int = 1, spill: bool = False,
+            checkpoint: bool = False, resume: bool = False, categorize: bool = False, backend: str = "pandas",
+            memoize: bool = False, parameters: dict | None = None,
+            fact_files: str | None = None, queue_depth: int = 2, validate: bool = False,
+            partition_output: bool = False,
+            output_dir: str | Path = Path("data") / "output") -> Load:
+        """
+        Executes Extract → Transform → Load sequentially.
+
+        chunksize: if given, the fact file is streamed in chunks of this many rows.
+        lazy: build an optimized query plan and read only the columns it needs.
+        workers: if greater than 1, input files are parsed in parallel.
+        cache: reuse typed Parquet copies of unchanged input files (data/cache).
+        incremental: only process rows appended since the last run (state in data/state).
+        The saved counts are recomputed from scratch when the business parameters or the
+        transformation code change.
+        output_format: "xlsx", "csv" or "parquet".
+        background_load: write the output in a background thread; call .wait() on the
+        returned Load before the process needs the file.
+        typed: read only the needed columns with the dtypes of the pipeline schema.
+        instrument: time every step and SQl_df call and write a JSON run report next to the version file.
+        profile: instrument and also run cProfile + tracemalloc (slow, for investigations).
+        partitions: run the row-level transform steps in this many worker processes,
+        on hash partitions of the fact table.
+        spill: hand the partitions to the workers as memory-mapped Arrow IPC files (data/intermediate).
+        checkpoint: save the transformed result before Load, so a failed Load can be retried.
+        resume: if a checkpoint exists, skip Extract and Transform and load the checkpointed result.
+        categorize: encode low-cardinality text columns as categoricals shared by the fact and dimension tables.
+        backend: "pandas" or "sqlite" (run the transform steps in a temporary SQLite database, out of core).
+        memoize: reuse the stored result (data/memo) when the input file contents, the business
+        parameters, the transformation code, the typed schema and the categorize option are all unchanged.
+        Incremental runs are never memoized.
+        parameters: overrides of Transform.PARAMETERS (thresholds, CASE ranges, pivot values).
+        fact_files: the fact file, or a glob pattern in data/raw for one file per day (e.g. "daily/*.csv"),
+        instead of the pipeline's fact file.
+        Matched files are parsed in the background, up to queue_depth files ahead of the transform
+        (workers threads at a time), and their partial counts are merged before the report.
+        validate: run the data-quality checks (unparseable amounts, orphan keys, null group keys,
+        out-of-range values) while transforming. Rejected rows are written to output_dir/rejected.parquet
+        with a reason code, and the counts are recorded in the version's manifest entry (Load.quality).
+        Pandas engine only; a memoized result has no new counts.
+        Without validate, the threshold filter is also pushed into Parquet fact reads (Transform.fact_filters),
+        which skip the row groups it excludes; the checks need every row, so validate reads them all.
+        partition_output: with output_format "parquet", publish 'latest' as a dataset directory
+        partitioned on the partition column (output_dir/latest/<column>=<value>/), so readers can
+        load single partitions.
+        output_dir: directory of the 'latest' file and the versions (the runner uses data/output/<pipeline>).
+        """
+        transform = self.transform
+
+        # Column of the partitioned Parquet output
+        partition_by = self.partition_column if partition_output else None
+
+        # Run recorder (disabled unless requested: the layers then skip all measurements)
+        recorder = Instrumentation(enabled=instrument or profile, deep=profile)
+
+        # Arrow IPC files of this pipeline: partition handoff and the pre-Load checkpoint
+        intermediates = IntermediateStore(Path("data") / "intermediate" / self.name)
+
+        # Retry of a failed Load: the transformed result is already on disk
+        if resume and intermediates.exists("result"):
+            load = Load(intermediates.open("result"), fmt=output_format, background=background_load,
+                        instrumentation=recorder, output_dir=output_dir, partition_by=partition_by)
+            _finish_checkpoint(load, intermediates)
+            return load
+
+        # Saved counts + watermark of the fact file for incremental runs
+        # (recomputed from scratch when the business parameters or the transformation code change)
+        rules = {"parameters": {**transform.PARAMETERS, **(parameters or {})}, "code": code_version(transform)}
+        state = IncrementalState(self.name, rules=rules) if incremental else None
+
+        # Fact file(s) and their schema (a pattern reads every matched file with the fact schema)
+        fact_files = fact_files or self.fact_file
+        schema = {**self.schema, fact_files: self.schema[self.fact_file]} if typed else None
+
+        # Rejected-row sink of this run (the side file is only written if rows are rejected)
+        quality = DataQuality(Path(output_dir) / "rejected.parquet") if validate else None
+
+        # Threshold filter handed to the Parquet reader (the quality checks must see every row)
+        filters = None if validate else {fact_files: transform.fact_filters(parameters)}
+
+        def extract_and_transform():
+            # Extract raw CSV files from data/raw directory
+            raw_data = Extract(fact_files, self.dimension_file, chunksize=chunksize, lazy=lazy,
+                               workers=workers, cache=cache,
+                               incremental=state, instrumentation=recorder, categorize=categorize,
+                               schema=schema, queue_depth=queue_depth, filters=filters)
+
+            # Apply business transformation logic
+            try:
+                result = transform(raw_data.extract(), incremental=state, instrumentation=recorder,
+                                   partitions=partitions, intermediates=intermediates if spill else None,
+                                   backend=backend, parameters=parameters, quality=quality).data
+            except BaseException:
+                if quality is not None:
+                    quality.abort()  # A failed run never publishes a partial side file
+                raise
+
+            if quality is not None:
+                quality.close()  # Publishes the side file
+            return result
+
+        if memoize and state is None:
+            # Unchanged inputs, parameters and code: the stored result is returned without Extract/Transform
+            memo = ResultMemo()
+            inputs = Extract().expand(fact_files) + [self.dimension_file]
+            key = memo.key([Path("data") / "raw" / name for name in inputs],
+                           {**transform.PARAMETERS, **(parameters or {})}, transform,
+                           schema=schema, categorize=categorize, validate=validate)
+            with recorder.step("memo.load") as record:
+                processed_data = memo.load(key, extract_and_transform)
+                record["rows_out"] = len(processed_data)
+        else:
+            processed_data = extract_and_transform()
+
+        # Counts only exist if the checks ran (not on a memo hit)
+        summary = quality.summary() if quality is not None and quality.closed else None
+
+        if checkpoint or resume:
+            intermediates.spill("result", processed_data)
+
+        # Persist final dataset with versioning
+        load = Load(processed_data, fmt=output_format, background=background_load, instrumentation=recorder,
+                    output_dir=output_dir, quality=summary, partition_by=partition_by)
+
+        if checkpoint or resume:
+            _finish_checkpoint(load, intermediates)
+        return load
+
+
+def _finish_checkpoint(load: Load, intermediates: IntermediateStore):
+    # The checkpoint is only needed until the result is written (background loads keep it)
+    if load.thread is None:
+        intermediates.remove("result")
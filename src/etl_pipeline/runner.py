@@ -0,0 +1,202 @@
+"""
+Command line runner for all registered pipelines.
+
+Independent pipelines run in parallel in a process pool. Each one writes to its own
+output namespace (data/output/<pipeline>/latest.<ext> and versions/), so runs no longer
+overwrite each other's 'latest' file. All pipelines share the Extract cache in data/cache.
+A failing pipeline is reported and does not stop the others.
+
+Usage (from the repository root):
+    python -m src.etl_pipeline.runner                          # every pipeline, one process each
+    python -m src.etl_pipeline.runner --only hospital --format parquet
+    python -m src.etl_pipeline.runner --jobs 1 --instrument   # sequential, with run reports
+    python -m src.etl_pipeline.runner --only hospital --fact-files "daily/*.csv" --workers 2
+    python -m src.etl_pipeline.runner --format parquet --partition-output   # partitioned 'latest' datasets
+"""
+
+import argparse
+import importlib
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from src.etl_pipeline.extract.extract import Extract
+from src.etl_pipeline.utils.memory_budget import MemoryBudget
+
+
+# name -> (module with a run(**options) entry point, input files it reads)
+PIPELINES = {}
+
+
+def register(name: str, module: str, files: tuple[str, ...]):
+    """
+    Adds a pipeline to the runner. module must define run(output_dir=..., cache=..., **options).
+    """
+    if name in PIPELINES:
+        raise ValueError(f"Pipeline already registered: {name}")
+    PIPELINES[name] = (module, tuple(files))
+
+
+register("hospital", "src.etl_pipeline.main_Hospital", ("hospital_billing_data.csv", "age_ranges.csv"))
+register("marketplace", "src.etl_pipeline.main_Marketplace", ("raw_data.csv", "segments.csv"))
+
+
+def run_pipelines(names: list[str] | None = None, jobs: int | None = None,
+                  output_root: str | Path = Path("data") / "output", **options) -> dict[str, dict]:
+    """
+    Runs the named pipelines (all registered ones by default) and returns
+    {name: {"status", "seconds", "version_file", "peak_mb", "quality", "error"}} in registration order.
+    quality is the data-quality summary of the run (None if the checks did not run).
+
+    jobs: number of worker processes (default: one per pipeline). jobs=1 runs the
+    pipelines one after the other in this process.
+    options: forwarded to each pipeline's run() (chunksize, lazy, typed, output_format, ...),
+    except memory_budget: fail a pipeline whose peak memory exceeds this multiple of its input files' size.
+    fact_files (a file or glob pattern replacing the registered fact file) needs exactly one pipeline.
+    """
+    names = list(PIPELINES) if not names else names
+    unknown = [name for name in names if name not in PIPELINES]
+    if unknown:
+        raise ValueError(f"Unknown pipeline(s): {', '.join(unknown)}")
+    if options.get("fact_files") and len(names) != 1:
+        raise ValueError("fact_files can only be given for a single pipeline")
+
+    # Every pipeline goes through the shared cache and the result memo unless told otherwise
+    options.setdefault("cache", True)
+    options.setdefault("memoize", True)
+
+    jobs = min(jobs or len(names), len(names))
+    results = {}
+
+    if jobs <= 1:
+        for name in names:
+            results[name] = _run_pipeline(name, output_root, options)
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {name: executor.submit(_run_pipeline, name, output_root, options) for name in names}
+
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as error:
+                # The worker process itself died (e.g. killed for memory): isolate it too
+                results[name] = {"status": "failed", "seconds": None, "version_file": None,
+                                 "peak_mb": None, "quality": None, "error": f"{type(error).__name__}: {error}"}
+
+    return results
+
+
+def _run_pipeline(name: str, output_root: str | Path, options: dict) -> dict:
+    """
+    Pool task: runs one pipeline and reports its outcome instead of raising.
+    """
+    module_name, files = PIPELINES[name]
+    options = dict(options)
+    multiple = options.pop("memory_budget", None)
+
+    start = time.perf_counter()
+    budget = None
+    try:
+        module = importlib.import_module(module_name)
+
+        if multiple:
+            # Library imports are a fixed cost, not data: load them before measuring
+            _preload_libraries()
+            # The fact file may be replaced by a pattern: the budget covers every matched file
+            inputs = Extract().expand(options.get("fact_files") or files[0]) + list(files[1:])
+            budget = MemoryBudget.for_files([Extract()._file_path(filename) for filename in inputs], multiple)
+
+        with budget or nullcontext():
+            load = module.run(output_dir=Path(output_root) / name, **options)
+            load.wait()
+    except Exception:
+        return {"status": "failed", "seconds": time.perf_counter() - start, "version_file": None,
+                "peak_mb": _peak_mb(budget), "quality": None, "error": traceback.format_exc()}
+
+    return {"status": "ok", "seconds": time.perf_counter() - start,
+            "version_file": str(load.version_file), "peak_mb": _peak_mb(budget), "quality": load.quality,
+            "error": None}
+
+
+def _preload_libraries():
+    for library in ("pyarrow", "pyarrow.csv", "pyarrow.parquet", "openpyxl"):
+        try:
+            importlib.import_module(library)
+        except ImportError:
+            pass
+
+
+def _peak_mb(budget: MemoryBudget | None) -> float | None:
+    return budget.peak_bytes / 2 ** 20 if budget is not None else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the ETL pipelines.")
+    parser.add_argument("--only", nargs="+", metavar="PIPELINE", choices=sorted(PIPELINES),
+                        help="pipelines to run (default: all)")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: one per pipeline)")
+    parser.add_argument("--output-root", default=str(Path("data") / "output"))
+    parser.add_argument("--format", dest="output_format", default="xlsx", choices=["xlsx", "csv", "parquet"])
+    parser.add_argument("--partition-output", action="store_true",
+                        help="with --format parquet, publish 'latest' as a dataset partitioned on the report's first key")
+    parser.add_argument("--chunksize", type=int, help="stream the fact files in chunks of this many rows")
+    parser.add_argument("--fact-files", metavar="PATTERN",
+                        help="fact file or glob pattern in data/raw, e.g. 'daily/*.csv' (with --only PIPELINE)")
+    parser.add_argument("--workers", type=int, help="threads parsing input files concurrently")
+    parser.add_argument("--queue-depth", type=int, default=2,
+                        help="parsed fact files held ready ahead of the transform (with --fact-files)")
+    parser.add_argument("--lazy", action="store_true", help="use the lazy query-plan engine")
+    parser.add_argument("--typed", action="store_true", help="typed extraction with the pipeline schemas")
+    parser.add_argument("--categorize", action="store_true",
+                        help="encode low-cardinality text columns as shared categoricals")
+    parser.add_argument("--partitions", type=int, default=1,
+                        help="worker processes per pipeline for the row-level transform steps")
+    parser.add_argument("--backend", default="pandas", choices=["pandas", "sqlite"],
+                        help="execution engine of the transform steps (sqlite: out of core)")
+    parser.add_argument("--spill", action="store_true",
+                        help="hand partitions to the workers as memory-mapped Arrow IPC files")
+    parser.add_argument("--checkpoint", action="store_true", help="save the transformed result before Load")
+    parser.add_argument("--resume", action="store_true", help="retry Load from the checkpoint, if any")
+    parser.add_argument("--incremental", action="store_true", help="only process appended rows")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", help="do not use data/cache")
+    parser.add_argument("--no-memo", dest="memoize", action="store_false",
+                        help="always recompute, even if inputs, parameters and code are unchanged (data/memo)")
+    parser.add_argument("--validate", action="store_true",
+                        help="run the data-quality checks (rejected rows in data/output/<pipeline>/rejected.parquet); "
+                             "pandas engine only, and Parquet fact files are then read without the threshold pushdown")
+    parser.add_argument("--memory-budget", type=float, metavar="MULTIPLE",
+                        help="fail a pipeline whose peak memory exceeds MULTIPLE x the size of its input files")
+    parser.add_argument("--instrument", action="store_true", help="write a JSON run report per pipeline")
+    args = parser.parse_args(argv)
+    if args.fact_files and (not args.only or len(args.only) != 1):
+        parser.error("--fact-files needs --only with a single pipeline")
+    if args.partition_output and args.output_format != "parquet":
+        parser.error("--partition-output needs --format parquet")
+
+    options = vars(args)
+    names, jobs, output_root = options.pop("only"), options.pop("jobs"), options.pop("output_root")
+
+    start = time.perf_counter()
+    results = run_pipelines(names, jobs=jobs, output_root=output_root, **options)
+
+    for name, result in results.items():
+        seconds = f"{result['seconds']:.2f}s" if result["seconds"] is not None else "-"
+        peak = f"{result['peak_mb']:.0f} MB" if result["peak_mb"] is not None else "-"
+        target = result["version_file"] or ""
+        print(f"{name:<15} {result['status']:<7} {seconds:>9} {peak:>9}  {target}")
+        if result["quality"] and result["quality"]["rejected"]:
+            reasons = ", ".join(f"{reason} {count}" for reason, count in result["quality"]["reasons"].items())
+            print(f"{'':<15} {result['quality']['rejected']} rejected row(s) ({reasons}): {result['quality']['rejects_file']}")
+        if result["error"]:
+            print(result["error"], file=sys.stderr)
+    print(f"{len(results)} pipeline(s) in {time.perf_counter() - start:.2f}s")
+
+    return 0 if all(result["status"] == "ok" for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
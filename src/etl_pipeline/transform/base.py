@@ -0,0 +1,251 @@
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from src.etl_pipeline.utils.SQL_with_Dataframes import SQl_df
+from src.etl_pipeline.utils.incremental import IncrementalState
+from src.etl_pipeline.utils.instrumentation import Instrumentation
+from src.etl_pipeline.utils.intermediate import IntermediateStore
+from src.etl_pipeline.utils.lazy_SQL import LazyFrame, LazySQl_df
+from src.etl_pipeline.utils.partitioned import map_partitions
+from src.etl_pipeline.utils.quality import DataQuality
+from src.etl_pipeline.utils.sqlite_SQL import SQLiteFrame, SQLiteSQl_df
+
+
+class BaseTransform:
+    """
+    Execution machinery shared by the pipeline Transforms: streamed chunks, hash partitions,
+    the lazy and sqlite engines, incremental folding and the data-quality checks.
+
+    A pipeline's Transform declares its business parameters and keys below and implements
+    _aggregate (row-level steps, returning partial counts per KEYS that can be merged across
+    chunks, partitions and runs) and _report (the final report built from the merged counts).
+    """
+
+    # Business parameters of the report. Transform(parameters={...}) overrides them, and they are
+    # part of the result memo key, so a changed threshold or range never reuses an old result.
+    PARAMETERS = {}
+
+    # Group keys and count column of the partial counts returned by _aggregate
+    KEYS = []
+    COUNT_COLUMN = None
+    # Leading key: hash partitions never split one of its values
+    PARTITION_KEY = None
+
+    # Amount column of the fact table (after rename_columns), the dimension join key and the
+    # parameter holding its valid (low, high) range for the data-quality checks
+    NUMERIC_COLUMN = None
+    JOIN_KEY = None
+    BOUNDS_PARAMETER = None
+
+    # Threshold filter of _aggregate: raw fact column (before rename_columns) and its parameter
+    THRESHOLD_COLUMN = None
+    THRESHOLD_PARAMETER = None
+
+    def __init__(self, raw_data: dict, lazy: bool = False, incremental: IncrementalState | None = None,
+                 instrumentation: Instrumentation | None = None, partitions: int = 1,
+                 intermediates: IntermediateStore | None = None, backend: str = "pandas",
+                 parameters: dict | None = None, quality: DataQuality | None = None):
+        """
+        Transformation layer.
+        Receives raw data dictionary and executes SQL-like transformations.
+
+        lazy: build the row-level steps as a LazySQl_df plan and optimize it before running.
+        It is enabled automatically when Extract returned LazyFrame scans.
+        incremental: the IncrementalState given to Extract. The fact table then only holds
+        the appended rows, and their counts are folded into the saved state before the report.
+        instrumentation: records every SQl_df call (time, rows, memory) and the transform stages.
+        partitions: if greater than 1, in-memory fact tables (whole or per chunk) are hash-partitioned
+        on PARTITION_KEY and the row-level steps run in that many worker processes.
+        intermediates: hand the partitions to the workers as memory-mapped Arrow IPC files
+        in this store instead of pickling them.
+        backend: "pandas" (default) or "sqlite". The sqlite backend loads the tables into a temporary
+        SQLite database and runs every step there, for inputs that do not fit in memory.
+        parameters: overrides of the business parameters in Transform.PARAMETERS.
+        quality: a DataQuality. Each fact frame is checked right after the numeric conversion and
+        before the join; rejected rows (unparseable amounts, orphan keys, null group keys, values
+        outside the bounds parameter) go to its side file. The caller closes it. Pandas engine only.
+        """
+        if partitions < 1:
+            raise ValueError("partitions must be a positive integer")
+        if backend not in ("pandas", "sqlite"):
+            raise ValueError(f"Unsupported backend: {backend}")
+        if backend == "sqlite" and (lazy or partitions > 1):
+            raise ValueError("The sqlite backend cannot be combined with lazy or partitioned execution")
+        if quality is not None and (lazy or backend != "pandas"):
+            raise ValueError("Data-quality checks need the pandas engine (not lazy or sqlite)")
+        unknown = set(parameters or {}) - set(self.PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+
+        self.dataframes = raw_data
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        self.sql_df = self.instrumentation.wrap(SQl_df())  # SQL abstraction layer (timed when instrumented)
+        self.lazy_sql_df = LazySQl_df()  # Lazy (query plan) variant of the same API
+        self.lazy = lazy
+        self.incremental = incremental
+        self.partitions = partitions
+        self.intermediates = intermediates
+        self.executor = None  # Worker pool, only while a partitioned transformation runs
+        self.backend = backend
+        self.parameters = {**self.PARAMETERS, **(parameters or {})}
+        self.sqlite_sql_df = None  # SQLite engine, only while a sqlite transformation runs
+        self.quality = quality
+        try:
+            self.data = self._transform()  # Execute transformation pipeline
+        finally:
+            if self.sqlite_sql_df is not None:
+                self.sqlite_sql_df.close()  # Deletes the scratch database
+                self.sqlite_sql_df = None
+
+    def __getstate__(self):
+        # Partitioned mode sends self._aggregate to the workers: they only need the settings,
+        # not the input tables, the pool or the (process-local) instrumentation
+        state = self.__dict__.copy()
+        state.update(dataframes={}, executor=None, incremental=None, instrumentation=None, intermediates=None,
+                     quality=None, sql_df=SQl_df())
+        return state
+
+    @classmethod
+    def fact_filters(cls, parameters: dict | None = None) -> list[tuple]:
+        """
+        The threshold filter of _aggregate as (raw fact column, operator, value), for Extract(filters=...):
+        Parquet reads then skip the row groups where every amount is below the threshold.
+        """
+        parameters = {**cls.PARAMETERS, **(parameters or {})}
+        return [(cls.THRESHOLD_COLUMN, '>=', parameters[cls.THRESHOLD_PARAMETER])]
+
+    # =====================================================
+    # Transformation Logic
+    # =====================================================
+    def _transform(self) -> pd.DataFrame:
+        """
+        Core transformation pipeline: partial counts (_aggregate), incremental fold and report (_report).
+
+        If the fact table was extracted in streaming mode (an iterator of chunks),
+        each chunk is reduced to partial counts and the counts are merged before the report.
+        """
+
+        # Normalize column names (streamed chunks are normalized one by one)
+        for filename, df in self.dataframes.items():
+            if isinstance(df, pd.DataFrame):
+                self.dataframes[filename] = self.sql_df.rename_columns(df)
+            elif isinstance(df, LazyFrame):
+                self.dataframes[filename] = self.lazy_sql_df.rename_columns(df)
+
+        # Dynamic unpacking of input datasets
+        # Convert the dictionary of DataFrames into a list.
+        # self.dataframes is a dictionary where:- keys: identifiers - values: pandas DataFrame
+        dfs = list(self.dataframes.values())
+        if len(dfs) < 2:
+            # Ensure that at least two DataFrames are available.
+            raise ValueError("At least two dataframes are required.")
+
+        # Extract the first two DataFrames from the list.
+        df1, df2 = dfs[:2]
+
+        # Partitioned mode: one pool of worker processes for the whole aggregation
+        if self.partitions > 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.partitions)
+
+        # SQLite backend: one scratch database for the whole transformation
+        if self.backend == "sqlite":
+            if isinstance(df1, LazyFrame) or isinstance(df2, LazyFrame):
+                raise ValueError("The sqlite backend needs DataFrames or chunks, not lazy scans")
+            self.sqlite_sql_df = self.instrumentation.wrap(SQLiteSQl_df(), "sqlite.")
+
+        try:
+            with self.instrumentation.step("transform.aggregate") as record:
+                # Streamed chunks are loaded one by one into a single table, aggregated by one query
+                if self.sqlite_sql_df is not None and not isinstance(df1, pd.DataFrame):
+                    df1 = self.sqlite_sql_df.rename_columns(self.sqlite_sql_df.scan(df1))
+
+                if isinstance(df1, (pd.DataFrame, LazyFrame, SQLiteFrame)):
+                    counts = self._aggregate_partitioned(df1, df2)
+                else:
+                    counts = self.sql_df.df_merge_partial_counts(
+                        (self._aggregate_partitioned(self.sql_df.rename_columns(chunk), df2) for chunk in df1),
+                        self.KEYS,
+                        self.COUNT_COLUMN
+                    )
+                record["rows_out"] = len(counts)
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+        # Incremental mode: the counts only cover the new rows, fold them into the saved state
+        if self.incremental is not None:
+            with self.instrumentation.step("transform.fold", rows_in=len(counts)) as record:
+                counts = self.incremental.fold(counts, self.KEYS, self.COUNT_COLUMN)
+                record["rows_out"] = len(counts)
+
+        with self.instrumentation.step("transform.report", rows_in=len(counts)) as record:
+            report = self._report(counts)
+            record["rows_out"] = len(report)
+
+        return report
+
+    def _aggregate_partitioned(self, df1, df2) -> pd.DataFrame:
+        """
+        Runs _aggregate on each hash partition of the fact rows in the worker pool.
+        A PARTITION_KEY value never spans two partitions, so merging the partial counts gives
+        the same result as one _aggregate over all the rows.
+        Lazy plans (and runs without a pool) are aggregated in this process.
+        Data-quality checks run here, before the rows are partitioned.
+        """
+        if self.quality is not None:
+            if isinstance(df1, LazyFrame):
+                raise ValueError("Data-quality checks need DataFrames or chunks, not lazy scans")
+            df1 = self._validate(df1, df2)
+
+        if self.executor is None or not isinstance(df1, pd.DataFrame):
+            return self._aggregate(df1, df2)
+
+        partials = map_partitions(self.executor, self._aggregate, df1, self.PARTITION_KEY, self.partitions, df2,
+                                  store=self.intermediates)
+        return self.sql_df.df_merge_partial_counts(partials, self.KEYS, self.COUNT_COLUMN)
+
+    def _validate(self, df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
+        """
+        Numeric conversion + data-quality checks. Returns the rows that pass; _aggregate then
+        finds NUMERIC_COLUMN already numeric and does not convert it again.
+        """
+        with self.instrumentation.step("transform.quality", rows_in=len(df1)) as record:
+            df = self.sql_df.convert_to_numeric(df1, self.NUMERIC_COLUMN)
+            # Derived keys (e.g. a CASE label) are in neither table and are not checked
+            df = self.quality.check(df, df1, self.NUMERIC_COLUMN, self.parameters[self.BOUNDS_PARAMETER],
+                                    self.JOIN_KEY, df2, self.KEYS)
+            record["rows_out"] = len(df)
+        return df
+
+    def _engine(self, df1):
+        """
+        Engine of the row-level steps and whether it is the lazy one: the lazy engine records a plan
+        that is optimized and run at the end, the sqlite one composes a single query that SQLite runs
+        on the loaded tables.
+        """
+        lazy = self.lazy or isinstance(df1, LazyFrame)
+        if self.sqlite_sql_df is not None:
+            return self.sqlite_sql_df, lazy
+        return (self.lazy_sql_df if lazy else self.sql_df), lazy
+
+    def _report_engine(self):
+        # The report steps run eagerly, in SQLite for the sqlite backend
+        return self.sqlite_sql_df if self.sqlite_sql_df is not None else self.sql_df
+
+    def _collect(self, df, lazy: bool = False) -> pd.DataFrame:
+        # Run the recorded plan or query (the eager engine already returned a DataFrame)
+        if self.sqlite_sql_df is not None:
+            return df.collect()
+        return df.collect(self.sql_df) if lazy else df
+
+    def _aggregate(self, df1, df2) -> pd.DataFrame:
+        """
+        Row-level steps. Returns counts per KEYS in COUNT_COLUMN, which can be merged across chunks.
+        """
+        raise NotImplementedError
+
+    def _report(self, counts: pd.DataFrame) -> pd.DataFrame:
+        """
+        Builds the final report from the merged counts.
+        """
+        raise NotImplementedError
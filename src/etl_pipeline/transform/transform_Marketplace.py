@@ -1,61 +1,69 @@
 import pandas as pd
-from src.etl_pipeline.utils.SQL_with_Dataframes import SQl_df
-
-
-class Transform:
-    def __init__(self, raw_data: dict):
-        """
-        Transformation layer for Marketplace.
-        Receives raw data dictionary and executes SQL-like transformations.
-        """
-
-        self.dataframes = raw_data
-        self.sql_df = SQl_df()  # SQL abstraction layer
-        self.data = self._transform()  # Execute transformation pipeline
-
-
-    def _transform(self) -> pd.DataFrame:
+from src.etl_pipeline.transform.base import BaseTransform
+
+
+class Transform(BaseTransform):
+    """
+    Marketplace transformation pipeline.
+    Counts rental units per customer, then reports customers per MARKET_PLACE, unit-count
+    category and product segment.
+
+    The CASE runs in _report, after the partial unit counts of every chunk are merged,
+    because it needs each customer's total unit count.
+    """
+
+    PARAMETERS = {
+        "min_payment": 25,
+        "unit_ranges": [(1, 2), (3, 5)],
+        "unit_labels": ['1-2', '3-5'],
+        "unit_default_label": '6 or more',
+        "segments": ['Seg 1-3', 'Seg 4-6'],
+        # Valid Equipment_Rental_Payment_Month range (inclusive, None: no limit) of the data-quality checks
+        "payment_bounds": (0, None),
+    }
+
+    KEYS = ['MARKET_PLACE', 'Customer_Site_ID', 'Segment']
+    COUNT_COLUMN = 'UnitCount'
+    PARTITION_KEY = 'MARKET_PLACE'
+
+    NUMERIC_COLUMN = 'Equipment_Rental_Payment_Month'
+    JOIN_KEY = 'Product_Code'
+    BOUNDS_PARAMETER = "payment_bounds"
+
+    THRESHOLD_COLUMN = 'Equipment Rental Payment/Month'
+    THRESHOLD_PARAMETER = "min_payment"
+
+    # =====================================================
+    # Transformation Logic
+    # =====================================================
+    def _aggregate(self, df1, df2) -> pd.DataFrame:
         """
-        Core transformation pipeline.
-        Implements SQL-inspired operations using abstraction layer.
+        Row-level steps up to the unit count per customer.
+        The result can be merged across chunks with df_merge_partial_counts.
         """
-
-        # Normalize column names
-        for filename, df in self.dataframes.items():
-            self.dataframes[filename] = self.sql_df.rename_columns(df)
-
-        # Dynamic unpacking of input datasets
-        # Convert the dictionary of DataFrames into a list.
-        # self.dataframes is a dictionary where:- keys: identifiers - values: pandas DataFrame
-        dfs = list(self.dataframes.values())
-        if len(dfs) < 2:
-            # Ensure that at least two DataFrames are available.
-            raise ValueError("At least two dataframes are required.")
-
-        # Extract the first two DataFrames from the list.
-        df1, df2 = dfs[:2]
+        sql_df, lazy = self._engine(df1)
 
         # =====================================================
         # Business rule Logic SQL_with_Dataframes
         # =====================================================
 
         # Convert text-based numeric column into real numeric type
-        df = self.sql_df.convert_to_numeric(df1, 'Equipment_Rental_Payment_Month')
+        df = sql_df.convert_to_numeric(df1, 'Equipment_Rental_Payment_Month')
 
         # Perform relational inner join
-        df = self.sql_df.join_dataframes(df, df2, 'Product_Code', 'inner')
+        df = sql_df.join_dataframes(df, df2, 'Product_Code', 'inner')
 
         # Apply business filter condition
-        df = self.sql_df.apply_filters(df, 'Equipment_Rental_Payment_Month', '>=', 25)
+        df = sql_df.apply_filters(df, 'Equipment_Rental_Payment_Month', '>=', self.parameters["min_payment"])
 
         # Project required columns (SELECT equivalent)
-        df = self.sql_df.df_select_columns(
+        df = sql_df.df_select_columns(
             df,
             ['MARKET_PLACE', 'Product_Code', 'Segment', 'Customer_Site_ID']
         )
 
         # Aggregate count per grouping dimensions
-        df = self.sql_df.df_groupby(
+        df = sql_df.df_groupby(
             df,
             ['MARKET_PLACE', 'Customer_Site_ID', 'Segment'],
             'UnitCount',
@@ -63,40 +71,34 @@ class Transform:
             "count"
         )
 
+        return self._collect(df, lazy)
+
+    def _report(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Builds the final report from the unit counts per customer.
+        The CASE runs here because it needs each customer's total unit count.
+        """
+
+        sql_df = self._report_engine()
+
         # Create categorical segmentation (CASE WHEN equivalent)
-        df = self.sql_df.df_case(
+        df = sql_df.df_case(
             df=df,
             columns_to_keep=['MARKET_PLACE', 'Segment', 'UnitCount'],
             value_column='UnitCount',
-            ranges=[(1, 2), (3, 5)],
-            labels=['1-2', '3-5'],
-            default_label='6 or more',
+            ranges=self.parameters["unit_ranges"],
+            labels=self.parameters["unit_labels"],
+            default_label=self.parameters["unit_default_label"],
             new_column_name='Category'
         )
 
-        # Pivot values into columns
-        base = self.sql_df.df_pivot_values_to_columns(
+        # Pivot + subtotal and grand total rows (ROLLUP equivalent), already in hierarchy order
+        df = sql_df.df_pivot_rollup(
             df=df,
             group_col_1='MARKET_PLACE',
             group_col_2='Category',
             value_column='Segment',
-            values=['Seg 1-3', 'Seg 4-6']
-        )
-
-        # Add subtotal and grand total rows (ROLLUP equivalent)
-        totals = self.sql_df.df_groupby_rollup(
-            base_df=base,
-            group_col_1='MARKET_PLACE',
-            group_col_2='Category'
-        )
-
-        df = pd.concat([base, totals], ignore_index=True)
-
-        # Order data respecting grouping hierarchy
-        df = self.sql_df.df_orderby_grouping(
-            df,
-            group_col_1='MARKET_PLACE',
-            group_col_2='Category'
+            values=self.parameters["segments"]
         )
 
-        return df
+        return self._collect(df)
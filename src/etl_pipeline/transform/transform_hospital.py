@@ -1,85 +1,98 @@
 import pandas as pd
-from src.etl_pipeline.utils.SQL_with_Dataframes import SQl_df
-
-
-class Transform:
-    def __init__(self, raw_data: dict):
-        """
-        Transformation layer for Marketplace.
-        Receives raw data dictionary and executes SQL-like transformations.
-        """
-
-        self.dataframes = raw_data
-        self.sql_df = SQl_df()  # SQL abstraction layer
-        self.data = self._transform()  # Execute transformation pipeline
+from src.etl_pipeline.transform.base import BaseTransform
+
+
+class Transform(BaseTransform):
+    """
+    Hospital billing transformation pipeline.
+    Implements numeric conversion, filtering, categorization and rollup:
+    bills per Province, billing range and age range.
+    """
+
+    PARAMETERS = {
+        "min_bill_amount": 1000,
+        # [1000, 5000] and (5000, 10000): contiguous, so amounts such as 5000.5 are not left out
+        "bill_ranges": [(1000, 5000), (5000, 10000)],
+        "bill_labels": ['1.0-5k', '2.5k-10k'],
+        "bill_default_label": '3.10k +',
+        "bill_inclusive": ['both', 'neither'],
+        "age_labels": ['Child', 'Adult', 'Elderly'],
+        # Valid BillAmount range (inclusive, None: no limit) of the data-quality checks
+        "bill_amount_bounds": (0, None),
+    }
+
+    KEYS = ['Province', 'Bill_Amt_Cat', 'AgeRangeLabel']
+    COUNT_COLUMN = 'Count'
+    PARTITION_KEY = 'Province'
+
+    NUMERIC_COLUMN = 'BillAmount'
+    JOIN_KEY = 'AgeRangeID'
+    BOUNDS_PARAMETER = "bill_amount_bounds"
+
+    THRESHOLD_COLUMN = 'BillAmount'
+    THRESHOLD_PARAMETER = "min_bill_amount"
 
     # =====================================================
     # Transformation Logic
     # =====================================================
-    def _transform(self) -> pd.DataFrame:
+    def _aggregate(self, df1, df2) -> pd.DataFrame:
         """
-        Hospital billing transformation pipeline.
-        Implements numeric conversion, filtering, categorization and rollup.
+        Row-level steps: conversion, join, filter, projection and CASE.
+        Returns counts per (Province, Bill_Amt_Cat, AgeRangeLabel), which can be merged across chunks.
         """
-
-        # Normalize column names
-        for filename, df in self.dataframes.items():
-            self.dataframes[filename] = self.sql_df.rename_columns(df)
-
-        # Dynamic unpacking of input datasets
-        # Convert the dictionary of DataFrames into a list.
-        # self.dataframes is a dictionary where:- keys: identifiers - values: pandas DataFrame
-        df1, df2 = list(self.dataframes.values())[:2]
+        sql_df, lazy = self._engine(df1)
 
         # Ensure BillAmount is numeric
-        df = self.sql_df.convert_to_numeric(df1, 'BillAmount')
+        df = sql_df.convert_to_numeric(df1, 'BillAmount')
 
         # Relational join with AgeRange reference table
-        df = self.sql_df.join_dataframes(df, df2, 'AgeRangeID', 'inner')
+        df = sql_df.join_dataframes(df, df2, 'AgeRangeID', 'inner')
 
         # Business threshold filter
-        df = self.sql_df.apply_filters(df, 'BillAmount', '>=', 1000)
+        df = sql_df.apply_filters(df, 'BillAmount', '>=', self.parameters["min_bill_amount"])
 
         # Projection
-        df = self.sql_df.df_select_columns(
+        df = sql_df.df_select_columns(
             df,
             ['Province', 'PatientID', 'AgeRangeLabel', 'Hospital', 'BillAmount']
         )
 
         # CASE classification for billing ranges
-        df = self.sql_df.df_case(
+        df = sql_df.df_case(
             df=df,
             columns_to_keep=['Province', 'AgeRangeLabel', 'PatientID', 'BillAmount'],
             value_column='BillAmount',
-            ranges=[(1000, 5000), (5001, 9999)],
-            labels=['1.0-5k', '2.5k-10k'],
-            default_label='3.10k +',
-            new_column_name='Bill_Amt_Cat'
+            ranges=self.parameters["bill_ranges"],
+            labels=self.parameters["bill_labels"],
+            default_label=self.parameters["bill_default_label"],
+            new_column_name='Bill_Amt_Cat',
+            inclusive=self.parameters["bill_inclusive"]
         )
 
-        # Pivot age groups into columns
-        base = self.sql_df.df_pivot_values_to_columns(
-            df=df,
-            group_col_1='Province',
-            group_col_2='Bill_Amt_Cat',
-            value_column='AgeRangeLabel',
-            values=['Child', 'Adult', 'Elderly']
+        # Count rows per output cell
+        df = sql_df.df_groupby_count(
+            df,
+            ['Province', 'Bill_Amt_Cat', 'AgeRangeLabel'],
+            'Count'
         )
 
-        # Add subtotal and grand total rows (ROLLUP equivalent)
-        totals = self.sql_df.df_groupby_rollup(
-            base_df=base,
-            group_col_1='Province',
-            group_col_2='Bill_Amt_Cat'
-        )
+        return self._collect(df, lazy)
+
+    def _report(self, counts: pd.DataFrame) -> pd.DataFrame:
+        """
+        Builds the final report (pivot, rollup and ordering) from the merged counts.
+        """
 
-        df = pd.concat([base, totals], ignore_index=True)
+        sql_df = self._report_engine()
 
-        # Order data respecting grouping hierarchy
-        df = self.sql_df.df_orderby_grouping(
-            df,
+        # Pivot + subtotal and grand total rows (ROLLUP equivalent), already in hierarchy order
+        df = sql_df.df_pivot_rollup(
+            df=counts,
             group_col_1='Province',
-            group_col_2='Bill_Amt_Cat'
+            group_col_2='Bill_Amt_Cat',
+            value_column='AgeRangeLabel',
+            values=self.parameters["age_labels"],
+            count_column='Count'
         )
 
-        return df
+        return self._collect(df)
@@ -1,6 +1,10 @@
+import logging
+import operator as op
 import pandas as pd
 import numpy as np
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 class SQl_df():
@@ -8,8 +12,16 @@ class SQl_df():
     Helper class that provides SQL-like operations using pandas.
 
     The idea is to make transformations easier to read for someone familiarized with SQL logic (select, join, group by, etc.).
+
+    Ownership: no method modifies the DataFrames it receives. Results are new frames that, under
+    pandas copy-on-write, share the buffers of the input columns they did not change; a shared
+    column is only copied if one of the two frames is later written to. Methods only compute the
+    columns they change and never add temporary columns to a frame.
     """
 
+    # Comparison used by apply_filters for each SQL operator
+    OPERATORS = {'>=': op.ge, '<=': op.le, '>': op.gt, '<': op.lt, '==': op.eq, '!=': op.ne}
+
     def __init__(self):
         """
         No state is stored. This class only provides reusable methods.
@@ -19,63 +31,135 @@ class SQl_df():
     def rename_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Rename columns by replacing spaces and slashes with underscores.
+        Returns a renamed frame; the caller's frame keeps its column names (no data is copied).
         """
-        df.columns = df.columns.str.replace(' ', '_', regex=False)
-        df.columns = df.columns.str.replace('/', '_', regex=False)
-        return df
+        columns = df.columns.str.replace(' ', '_', regex=False).str.replace('/', '_', regex=False)
+        return df.set_axis(columns, axis=1)
 
     def convert_to_numeric(self, df: pd.DataFrame, column_name: str) -> pd.DataFrame:
         """
         Converts a column to numeric type.  Also removes commas before converting.
+        Columns that are already numeric (e.g. typed at extraction) are returned unchanged.
         """
 
-        # Create a copy to avoid modifying the original dataframe
-        df_copy = df.copy()
+        # Nothing to convert: skip the copy and the string round-trip
+        if pd.api.types.is_numeric_dtype(df[column_name]):
+            return df
+
+        # Categorical text: convert each distinct value once and expand it through the codes
+        if isinstance(df[column_name].dtype, pd.CategoricalDtype):
+            categories = df[column_name].cat.categories.astype(str).str.replace(',', '', regex=False)
+            numbers = pd.to_numeric(categories, errors='coerce').to_numpy()
+            codes = df[column_name].cat.codes.to_numpy()
+            values = numbers[codes] if (codes >= 0).all() else np.where(codes >= 0, numbers[codes], np.nan)
+            return df.assign(**{column_name: values})
 
         # Remove commas (example: "1,000" → "1000")
-        df_copy[column_name] = (
-            df_copy[column_name]
+        text = (
+            df[column_name]
             .astype(str)
             .str.replace(',', '', regex=False)
         )
 
-        # Convert to numeric, invalid values become NaN
-        df_copy[column_name] = pd.to_numeric(df_copy[column_name], errors='coerce')
+        # Convert to numeric, invalid values become NaN.
+        # Only this column is replaced: the other columns are shared with df, not copied
+        return df.assign(**{column_name: pd.to_numeric(text, errors='coerce')})
 
-        return df_copy
-
-    def join_dataframes(self, df1: pd.DataFrame, df2: pd.DataFrame, column_to_join: str, join_type) -> pd.DataFrame:
+    def join_dataframes(self, df1: pd.DataFrame, df2: pd.DataFrame, column_to_join: str, join_type,
+                        strategy: str = "auto", broadcast_rows: int = 100_000) -> pd.DataFrame:
         """
         Joins two dataframes using a common column.  Similar to SQL JOIN.
+
+        strategy:
+        - "merge": general DataFrame.merge
+        - "broadcast": df2 is a small lookup (dimension) table with unique keys; each df1 row
+          finds its df2 row with a hash lookup and df2 columns are gathered with take
+        - "auto": "broadcast" when possible and df2 has at most broadcast_rows rows, else "merge"
+        The chosen strategy is logged by the module logger.
         """
+        chosen = self.choose_join_strategy(df1, df2, column_to_join, join_type, strategy, broadcast_rows)
+        logger.info("join on %s (%s): %s strategy, %d x %d rows",
+                    column_to_join, join_type, chosen, len(df1), len(df2))
+
+        if chosen == "broadcast":
+            return self._broadcast_join(df1, df2, column_to_join, join_type)
+
         return df1.merge(
             df2,
             on=column_to_join,
             how=join_type
         )
 
+    def choose_join_strategy(self, df1: pd.DataFrame, df2: pd.DataFrame, column_to_join: str, join_type,
+                             strategy: str = "auto", broadcast_rows: int = 100_000) -> str:
+        """
+        Returns "broadcast" or "merge" for a join, see join_dataframes.
+        Raises ValueError if "broadcast" is requested but the join does not allow it.
+        """
+        if strategy not in ("auto", "broadcast", "merge"):
+            raise ValueError(f"Unsupported join strategy: {strategy}")
+        if strategy == "merge":
+            return "merge"
+
+        # Conditions under which a lookup gives exactly the same result as merge
+        reason = None
+        if join_type not in ("inner", "left"):
+            reason = f"{join_type} joins are not supported"
+        elif df1[column_to_join].dtype != df2[column_to_join].dtype:
+            reason = "join keys have different dtypes"
+        elif (set(df1.columns) & set(df2.columns)) - {column_to_join}:
+            reason = "both sides share non-key columns"
+        elif not df2[column_to_join].is_unique:
+            reason = "the right side has duplicate keys"
+
+        if strategy == "broadcast":
+            if reason is not None:
+                raise ValueError(f"Broadcast join not possible: {reason}")
+            return "broadcast"
+
+        if reason is not None or len(df2) > broadcast_rows:
+            return "merge"
+        return "broadcast"
+
+    def _broadcast_join(self, df1: pd.DataFrame, df2: pd.DataFrame, column_to_join: str, join_type) -> pd.DataFrame:
+        """
+        Hash lookup join against a small table with unique keys (key -> row position + take).
+        Same rows, order and columns as DataFrame.merge for inner and left joins.
+        """
+
+        # Row position in df2 of every df1 key (-1 when the key is not in df2)
+        positions = pd.Index(df2[column_to_join]).get_indexer(df1[column_to_join])
+
+        if join_type == "inner":
+            matched = positions >= 0
+            result = df1[matched].reset_index(drop=True)
+            positions = positions[matched]
+        else:
+            result = df1.reset_index(drop=True)
+
+        # Gather the right-side columns; missing keys (left join) become NaN like in merge
+        for column in df2.columns:
+            if column != column_to_join:
+                result[column] = pd.api.extensions.take(
+                    df2[column].to_numpy() if df2[column].dtype.kind in "biufcmM" else df2[column].array,
+                    positions,
+                    allow_fill=True
+                )
+
+        return result
+
     def apply_filters(self, df: pd.DataFrame, column_name: str, operator: str, value: float) -> pd.DataFrame:
         """
         Filters rows based on a condition. Similar to SQL WHERE.
         """
-        # Map operators to pandas conditions
-        operators = {
-            '>=': df[column_name] >= value,
-            '<=': df[column_name] <= value,
-            '>': df[column_name] > value,
-            '<': df[column_name] < value,
-            '==': df[column_name] == value,
-            '!=': df[column_name] != value
-        }
-
         # Check if operator is valid
-        if operator not in operators:
+        if operator not in self.OPERATORS:
             raise ValueError("Invalid operator")
 
-        # Return filtered dataframe
-        # Ex: If operator = ">=", then: operators[">="] which is df["BillAmount"] >= 1000 So the line becomes:
+        # Return filtered dataframe (only the requested comparison is evaluated)
+        # Ex: If operator = ">=", then: OPERATORS[">="] is op.ge, so the line becomes:
         # return df[df["BillAmount"] >= 1000]
-        return df[operators[operator]]
+        return df[self.OPERATORS[operator](df[column_name], value)]
 
     def df_select_columns(self, df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
         """
@@ -90,7 +174,7 @@ class SQl_df():
 
         return (
             df
-            .groupby(columns_groupby, as_index=False)  # Keep flat structure
+            .groupby(columns_groupby, as_index=False, observed=True)  # Keep flat structure, only present categories
             .size()
             .rename(columns={'size': Counter_Name})
         )
@@ -104,11 +188,40 @@ class SQl_df():
         return (
             df
             # Group rows by the columns passed on the list
-            .groupby(columns_groupby, as_index=False)
+            .groupby(columns_groupby, as_index=False, observed=True)
             # Apply an aggregation (agg_func) on the column indicated (column_to_agg) and create a new column (Agg_Name)
             .agg(**{Agg_Name: (column_to_agg, agg_func)})
         )
 
+    def df_merge_partial_counts(self, partials: Iterable[pd.DataFrame], columns_groupby: list[str],
+                                count_column: str) -> pd.DataFrame:
+        """
+        Merges partial aggregates (e.g. one per chunk of a file) by summing their counts.
+        Equivalent to running the GROUP BY once over all the rows.
+        """
+
+        merged = None
+
+        # Fold every partial into the running result so only one aggregate is kept in memory
+        for partial in partials:
+            # Empty partials (no matching rows) add nothing and would only spoil the key dtypes
+            if partial.empty and merged is not None:
+                continue
+
+            if merged is not None and not merged.empty:
+                partial = pd.concat([merged, partial], ignore_index=True)
+
+            merged = (
+                partial
+                .groupby(columns_groupby, as_index=False, observed=True)[count_column]
+                .sum()
+            )
+
+        if merged is None:
+            raise ValueError("No partial results to merge")
+
+        return merged
+
     def df_case(
             self,
             df: pd.DataFrame,
@@ -117,34 +230,90 @@ class SQl_df():
             ranges: List[Tuple[int, int]],
             labels: List[str],
             default_label: str,
-            new_column_name: str
+            new_column_name: str,
+            inclusive: str | List[str] = "both",
+            categorical: bool = False
     ) -> pd.DataFrame:
         """
         Creates a new category column based on numeric ranges.  Similar to SQL CASE WHEN.
+
+        inclusive: which ends of a range are included, like Series.between
+        ("both", "neither", "left", "right"); one value for all ranges or one per range.
+        categorical: return the new column as a pandas Categorical instead of text.
+        Ranges must not overlap. Values outside every range (and missing values) get default_label.
         """
 
         # Make sure ranges and labels match
         if len(ranges) != len(labels):
             raise ValueError("Ranges and labels must match")
 
-        # Work on selected columns only
-        result = df[columns_to_keep].copy()
+        # Position of the range containing each value (-1 = no range), in a single pass
+        codes = self.bin_codes(df[value_column], ranges, inclusive)
 
-        # check each value_column in every range and create a boolean list true is in the range or false if isn't
-        conditions = [
-            result[value_column].between(min_val, max_val)
-            for min_val, max_val in ranges
-        ]
+        # Translate range positions into label positions (the default label goes last)
+        categories = list(dict.fromkeys(list(labels) + [default_label]))
+        label_codes = np.array([categories.index(label) for label in labels] + [categories.index(default_label)])
+        label_codes = label_codes[codes]  # code -1 picks the default label
 
-        # Assigns labels based on if the condition is true the range put the respective label
-        result[new_column_name] = np.select(
-            conditions,
-            labels,
-            default=default_label  # in case condition is false for every range assigns default value
-        )
+        if categorical:
+            new_column = pd.Categorical.from_codes(label_codes, categories=categories)
+        else:
+            new_column = np.asarray(categories, dtype=object)[label_codes]
 
-        return result
+        # Selected columns (shared with df, not copied) plus the new one
+        return df[columns_to_keep].assign(**{new_column_name: new_column})
+
+    def bin_codes(self, values: pd.Series, ranges: List[Tuple[float, float]],
+                  inclusive: str | List[str] = "both") -> np.ndarray:
+        """
+        Range-binning engine used by df_case.
+
+        Returns, for each value, the position of the range that contains it, or -1.
+        The ranges are sorted once and every value is located with a binary search on the
+        range starts (searchsorted), so the cost is O(rows x log(ranges)) in a single pass,
+        instead of one boolean mask per range.
+        """
+
+        if isinstance(inclusive, str):
+            inclusive = [inclusive] * len(ranges)
+        if len(inclusive) != len(ranges):
+            raise ValueError("inclusive must be a single value or one value per range")
+        if any(side not in ("both", "neither", "left", "right") for side in inclusive):
+            raise ValueError("inclusive must be 'both', 'neither', 'left' or 'right'")
+
+        # Sort ranges by their start; order maps back to the caller's range positions
+        order = np.array(sorted(range(len(ranges)), key=lambda i: tuple(ranges[i])), dtype=int)
+        starts = np.array([ranges[i][0] for i in order], dtype=float)
+        ends = np.array([ranges[i][1] for i in order], dtype=float)
+        left_closed = np.array([inclusive[i] in ("both", "left") for i in order], dtype=bool)
+        right_closed = np.array([inclusive[i] in ("both", "right") for i in order], dtype=bool)
+
+        # Validate: every range is well formed and no value can fall into two ranges
+        if np.any(starts > ends):
+            raise ValueError("Each range must be given as (min, max) with min <= max")
+        for i in range(len(order) - 1):
+            shared_end = ends[i] == starts[i + 1] and right_closed[i] and left_closed[i + 1]
+            if ends[i] > starts[i + 1] or shared_end:
+                raise ValueError(f"Ranges {tuple(ranges[order[i]])} and {tuple(ranges[order[i + 1]])} overlap")
+
+        if len(order) == 0:
+            return np.full(len(values), -1, dtype=int)
+
+        numbers = pd.to_numeric(values).to_numpy(dtype=float, na_value=np.nan)
 
+        # Candidate: the last range starting at or before the value
+        candidate = np.searchsorted(starts, numbers, side="right") - 1
+
+        # A value equal to an open start can only belong to the previous range (closed at that point)
+        on_open_start = (candidate >= 0) & (numbers == starts[candidate.clip(0)]) & ~left_closed[candidate.clip(0)]
+        candidate = np.where(on_open_start, candidate - 1, candidate)
+
+        position = candidate.clip(0)
+        above_start = (numbers > starts[position]) | ((numbers == starts[position]) & left_closed[position])
+        below_end = (numbers < ends[position]) | ((numbers == ends[position]) & right_closed[position])
+        inside = (candidate >= 0) & above_start & below_end  # NaN fails both comparisons
+
+        return np.where(inside, order[position], -1)
 
     '''
         def df_pivot_2values_to_2columns(self,
@@ -183,12 +352,16 @@ class SQl_df():
             group_col_1,
             group_col_2,
             value_column,
-            values
+            values,
+            count_column=None
     ):
         """
         Creates a pivot table.
         It transforms specific values from one column into separate columns.
         Each new column shows how many times that value appears.
+
+        If count_column is given, each row already carries a pre-aggregated count
+        (e.g. from df_merge_partial_counts) and the counts are summed instead of the rows.
         """
 
         pivot = (
@@ -199,12 +372,15 @@ class SQl_df():
             # - index: group by these two columns
             # - columns: turn value_column values into new columns
             # - aggfunc="size": count how many times each value appears
+            #   ("sum" of count_column when the rows are already counts)
             # - fill_value=0: replace missing counts with 0
             .pivot_table(
                 index=[group_col_1, group_col_2],
                 columns=value_column,
-                aggfunc="size",
-                fill_value=0
+                values=count_column,
+                aggfunc="size" if count_column is None else "sum",
+                fill_value=0,
+                observed=True
             )
 
             # Convert index back into normal columns
@@ -231,7 +407,7 @@ class SQl_df():
 
         subtotal = (
             base_df
-            .groupby(group_col_1, as_index=False)
+            .groupby(group_col_1, as_index=False, observed=True)
             .sum(numeric_only=True)
         )
 
@@ -259,6 +435,83 @@ class SQl_df():
 
         return result
 
+    def df_pivot_rollup(
+            self,
+            df,
+            group_col_1: str,
+            group_col_2: str,
+            value_column: str,
+            values,
+            count_column=None,
+            grand_total_label: str = "Grand Total",
+            total_label: str = "Total"
+    ):
+        """
+        Pivot + GROUP BY ROLLUP(group_col_1, group_col_2) in a single operator.
+
+        Gives the same rows as df_pivot_values_to_columns + df_groupby_rollup + concat +
+        df_orderby_grouping: detail rows, a subtotal row after each group_col_1 group and the
+        grand total last, already in that order and without helper columns.
+        Every count comes from one bincount over the integer codes of the three columns.
+        If count_column is given, rows carry pre-aggregated counts that are summed instead.
+        """
+
+        # New columns are ordered like pivot_table orders them
+        values = sorted(values)
+
+        # Integer codes: sorted group labels, and the position of each value (-1 = not pivoted)
+        codes_1, uniques_1 = pd.factorize(df[group_col_1], sort=True)
+        codes_2, uniques_2 = pd.factorize(df[group_col_2], sort=True)
+        value_codes = pd.Index(values).get_indexer(df[value_column])
+        n1, n2, nv = len(uniques_1), len(uniques_2), len(values)
+
+        # Rows with a missing group label or a value outside `values` are not counted
+        keep = (codes_1 >= 0) & (codes_2 >= 0) & (value_codes >= 0)
+        cells = (codes_1[keep] * n2 + codes_2[keep]) * nv + value_codes[keep]
+
+        # Single pass: one counter per (group_col_1, group_col_2, value) cell
+        if count_column is None:
+            counts = np.bincount(cells, minlength=n1 * n2 * nv)
+        else:
+            weights = df[count_column].to_numpy()[keep]
+            counts = np.bincount(cells, weights=weights, minlength=n1 * n2 * nv)
+            if np.issubdtype(weights.dtype, np.integer):
+                counts = counts.astype(np.int64)
+        counts = counts.reshape(n1, n2, nv)
+
+        # Like pivot_table, only group combinations that have rows become detail rows
+        present = np.bincount(cells // nv, minlength=n1 * n2).reshape(n1, n2) > 0
+        detail_1, detail_2 = np.nonzero(present)
+        groups = np.unique(detail_1)
+
+        # Stack detail, subtotal and grand total rows, then order them hierarchically:
+        # by group_col_1, details (by group_col_2) before the subtotal, grand total last
+        key_1 = np.concatenate([detail_1, groups, [n1]])
+        is_total = np.concatenate([np.zeros(len(detail_1), int), np.ones(len(groups) + 1, int)])
+        key_2 = np.concatenate([detail_2, np.zeros(len(groups) + 1, int)])
+        matrix = np.concatenate([
+            counts[detail_1, detail_2].reshape(-1, nv),
+            counts.sum(axis=1)[groups].reshape(-1, nv),
+            counts.sum(axis=(0, 1)).reshape(1, nv)
+        ])
+        order = np.lexsort((key_2, is_total, key_1))
+
+        labels_1 = np.concatenate([np.asarray(uniques_1, dtype=object), [grand_total_label]])
+        labels_2 = np.full(len(key_2), total_label, dtype=object)
+        labels_2[:len(detail_2)] = np.asarray(uniques_2, dtype=object)[detail_2]
+
+        result = pd.DataFrame({
+            group_col_1: labels_1[key_1[order]],
+            group_col_2: labels_2[order],
+        })
+        for position, value in enumerate(values):
+            result[value] = matrix[order, position]
+
+        # Create a total column summing all generated value columns
+        result["Grand_Total"] = matrix[order].sum(axis=1)
+
+        return result
+
     def df_orderby_grouping(self, df, group_col_1, group_col_2,
                             total_label="Total",
                             grand_total_label="Grand Total"):
@@ -269,22 +522,29 @@ class SQl_df():
         - Grand total is last
         """
 
-        # Create a temporary column to identify Grand Total rows, True = is Grand Total, False = normal row
-        df["_group1_sort"] = df[group_col_1] == grand_total_label
-
-        # Identify subtotal rows, True = is subtotal, False = normal row
-        df["_group2_sort"] = df[group_col_2] == total_label
+        # Identify Grand Total rows and subtotal rows (True = total row, False = normal row)
+        is_grand_total = (df[group_col_1] == grand_total_label).to_numpy()
+        is_subtotal = (df[group_col_2] == total_label).to_numpy()
 
-        # Sort using:
+        # Sort using (the last key of lexsort is the primary one):
         # 1) Grand Total flag
         # 2) First grouping column
         # 3) Subtotal flag
         # 4) Second grouping column
-        df = df.sort_values(
-            by=["_group1_sort", group_col_1, "_group2_sort", group_col_2]
-        )
+        order = np.lexsort((
+            _sort_codes(df[group_col_2]),
+            is_subtotal,
+            _sort_codes(df[group_col_1]),
+            is_grand_total
+        ))
+
+        # Row positions only: no helper columns are added to df or to the result
+        return df.take(order)
 
-        # Remove helper columns
-        df = df.drop(columns=["_group1_sort", "_group2_sort"])
 
-        return df
+def _sort_codes(values: pd.Series) -> np.ndarray:
+    """
+    Integer sort keys with the order of sort_values (missing values last).
+    """
+    codes, uniques = pd.factorize(values, sort=True)
+    return np.where(codes < 0, len(uniques), codes)
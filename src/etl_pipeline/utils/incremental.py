@@ -0,0 +1,185 @@
+import hashlib
+import io
+import json
+import os
+import uuid
+import pandas as pd
+from pathlib import Path
+from typing import Callable
+
+from src.etl_pipeline.utils.SQL_with_Dataframes import SQl_df
+
+
+class IncrementalState:
+    """
+    Persisted aggregate state for append-only CSV fact files.
+
+    The state is the table of partial counts a Transform produces before its pivot/rollup
+    (e.g. UnitCount per MARKET_PLACE, Customer_Site_ID, Segment) plus a watermark:
+    the byte offset up to which the fact file has already been folded into the counts.
+
+    Extract calls read_new_rows() to read only the rows appended after the watermark,
+    Transform calls fold() to merge their counts into the saved table and persist it.
+    Any change that cannot be handled incrementally (file rewritten or truncated,
+    header or dimension files changed, different business rules) triggers a full recompute
+    automatically.
+
+    rules: what the saved counts were computed with (e.g. the business parameters and the
+    transform code version). Its hash is saved with the watermark; the counts are only reused
+    while it is unchanged.
+    """
+
+    def __init__(self, name: str, state_dir: str | Path = Path("data") / "state", rules: dict | None = None):
+        self.name = name
+        self.state_dir = Path(state_dir)
+        # default=repr: tuples, numpy scalars, etc. are hashed by their text form
+        self.rules = hashlib.sha1(json.dumps(rules, sort_keys=True, default=repr).encode()).hexdigest()
+        self.meta_file = self.state_dir / f"{name}.json"
+        self.sql_df = SQl_df()
+
+        # Watermark and dependency fingerprints read by read_new_rows, saved by fold
+        self.pending = None
+        # True when read_new_rows had to read the whole file
+        self.full_refresh = True
+
+    # =====================================================
+    # Extract side
+    # =====================================================
+    def read_new_rows(self, file_path: Path, dependencies: list[Path] = (),
+                      parse: Callable[[io.BytesIO], pd.DataFrame] | None = None, **kwargs) -> pd.DataFrame:
+        """
+        Reads the rows appended to file_path since the last fold.
+        All rows are read on the first run or when the saved watermark is no longer valid.
+        dependencies are other input files (dimension tables) the counts depend on.
+        parse: reads the header + new lines (a CSV file object) instead of pd.read_csv(**kwargs),
+        e.g. the typed reader of Extract.
+        """
+        file_path = Path(file_path)
+        meta = self._load_meta()
+
+        with open(file_path, "rb") as handle:
+            header = handle.readline()
+            size = os.fstat(handle.fileno()).st_size
+
+            start = self._resume_offset(meta, handle, file_path, header, size, dependencies)
+            self.full_refresh = start == len(header)
+
+            handle.seek(start)
+            body = handle.read()
+
+        end = start + len(body)
+
+        # Same parsing as a full read: header line + the new lines only
+        source = io.BytesIO(header + body)
+        df = parse(source) if parse is not None else pd.read_csv(source, **kwargs)
+
+        self.pending = {
+            "source": str(file_path.resolve()),
+            "offset": end,
+            "header": header.decode("utf-8", "replace"),
+            "tail": self._tail_hash(file_path, end),
+            "terminated": body.endswith(b"\n") if body else (meta or {}).get("terminated", True),
+            "dependencies": self._fingerprints(dependencies),
+            "rules": self.rules,
+        }
+        return df
+
+    def _resume_offset(self, meta, handle, file_path: Path, header: bytes, size: int,
+                       dependencies: list[Path]) -> int:
+        """
+        Byte offset to resume from, or the end of the header when everything must be re-read.
+        """
+        full = len(header)
+
+        if meta is None or not self._counts_path(meta).exists():
+            return full
+
+        offset = meta["offset"]
+        same_file = (
+            meta["source"] == str(file_path.resolve())
+            and meta["header"] == header.decode("utf-8", "replace")
+            and size >= offset
+            and meta["tail"] == self._tail_hash(file_path, offset)
+            and meta["dependencies"] == self._fingerprints(dependencies)
+            and meta.get("rules") == self.rules
+        )
+        if not same_file:
+            return full
+
+        # If the last line had no newline, new data must start a new line (not extend that row)
+        if not meta["terminated"] and size > offset:
+            handle.seek(offset)
+            if handle.read(1) not in (b"\n", b"\r"):
+                return full
+
+        return offset
+
+    def _tail_hash(self, file_path: Path, offset: int, window: int = 4096) -> str:
+        # Hash of the bytes just before the watermark: detects a rewritten (not appended) file
+        with open(file_path, "rb") as handle:
+            handle.seek(max(0, offset - window))
+            return hashlib.sha1(handle.read(min(offset, window))).hexdigest()
+
+    def _fingerprints(self, paths: list[Path]) -> list:
+        fingerprints = []
+        for path in paths:
+            stat = Path(path).stat()
+            fingerprints.append([str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns])
+        return fingerprints
+
+    # =====================================================
+    # Transform side
+    # =====================================================
+    def fold(self, partial: pd.DataFrame, columns_groupby: list[str], count_column: str) -> pd.DataFrame:
+        """
+        Merges the counts of the new rows into the saved counts, persists the result
+        with the new watermark and returns the full counts table.
+        """
+        if self.pending is None:
+            raise ValueError("read_new_rows must be called before fold")
+
+        meta = self._load_meta()
+        if self.full_refresh or meta is None:
+            counts = self.sql_df.df_merge_partial_counts([partial], columns_groupby, count_column)
+        else:
+            saved = pd.read_parquet(self._counts_path(meta))
+            counts = self.sql_df.df_merge_partial_counts([saved, partial], columns_groupby, count_column)
+
+        self._save(counts, meta)
+        self.pending = None
+        return counts
+
+    def _save(self, counts: pd.DataFrame, old_meta: dict | None):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+        # Counts go to a new file; the metadata switch below is the atomic commit point
+        counts_file = f"{self.name}.{uuid.uuid4().hex[:12]}.parquet"
+        counts.to_parquet(self.state_dir / counts_file, index=False)
+
+        meta = {**self.pending, "counts_file": counts_file}
+        tmp = self.meta_file.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, self.meta_file)
+
+        if old_meta is not None:
+            self._counts_path(old_meta).unlink(missing_ok=True)
+
+    # =====================================================
+    # State files
+    # =====================================================
+    def _load_meta(self) -> dict | None:
+        if not self.meta_file.exists():
+            return None
+        return json.loads(self.meta_file.read_text())
+
+    def _counts_path(self, meta: dict) -> Path:
+        return self.state_dir / meta["counts_file"]
+
+    def reset(self):
+        """
+        Deletes the saved state, so the next run recomputes everything.
+        """
+        meta = self._load_meta()
+        if meta is not None:
+            self._counts_path(meta).unlink(missing_ok=True)
+        self.meta_file.unlink(missing_ok=True)
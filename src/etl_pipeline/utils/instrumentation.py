@@ -0,0 +1,198 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Instrumentation:
+    """
+    Run-level timing and memory recorder for Extract, Transform and Load.
+
+    Every step (a `with instrumentation.step(name)` block or a call through an engine
+    returned by wrap()) records wall time, CPU time, input/output row counts and the
+    change in resident memory. Repeated steps (one per chunk, for example) are summed
+    under the same name, so the report stays small for any number of chunks.
+
+    deep: also run cProfile and tracemalloc for the whole run; the report then
+    includes the slowest functions and the largest allocation sites. Expect a 2-5x slowdown.
+
+    A disabled instance (enabled=False) records nothing: step() returns a no-op
+    context and wrap() returns the engine itself, so the layers can always call it.
+    """
+
+    def __init__(self, enabled: bool = True, deep: bool = False, top: int = 25):
+        self.enabled = enabled
+        self.deep = deep and enabled
+        self.top = top
+
+        # {name: totals}, in the order the steps first ran
+        self.steps = {}
+        # Steps may also run in Extract's prefetch threads
+        self._lock = threading.Lock()
+        self.started = datetime.now()
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+
+        self.profiler = None
+        if self.deep:
+            self.profiler = cProfile.Profile()
+            tracemalloc.start()
+            self.profiler.enable()
+
+    @contextmanager
+    def _record(self, name: str, rows_in: int | None):
+        record = {"rows_in": rows_in, "rows_out": None}
+        rss, wall, cpu = rss_bytes(), time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            with self._lock:
+                totals = self.steps.setdefault(name, {
+                    "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                    "rows_in": 0, "rows_out": 0, "memory_delta_mb": 0.0
+                })
+                totals["calls"] += 1
+                totals["wall_seconds"] += time.perf_counter() - wall
+                totals["cpu_seconds"] += time.process_time() - cpu
+                totals["rows_in"] += record["rows_in"] or 0
+                totals["rows_out"] += record["rows_out"] or 0
+                totals["memory_delta_mb"] += (rss_bytes() - rss) / 2 ** 20
+
+    def step(self, name: str, rows_in: int | None = None):
+        """
+        Context manager timing one step. It yields a dict: set its "rows_out"
+        (and "rows_in" if unknown up front) to record row counts.
+        """
+        if not self.enabled:
+            return nullcontext({})
+        return self._record(name, rows_in)
+
+    def wrap(self, engine, prefix: str = ""):
+        """
+        Returns engine (e.g. a SQl_df) with every public method call recorded as a step.
+        """
+        if not self.enabled:
+            return engine
+        return _InstrumentedEngine(engine, self, prefix)
+
+    # =====================================================
+    # Report
+    # =====================================================
+    def report(self) -> dict:
+        """
+        Run summary: totals, one entry per step and, in deep mode, the profiles.
+        """
+        report = {
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_seconds": time.perf_counter() - self._start_wall,
+            "cpu_seconds": time.process_time() - self._start_cpu,
+            "peak_rss_mb": peak_rss_bytes() / 2 ** 20,
+            "steps": self.steps,
+        }
+
+        if self.profiler is not None:
+            report["profile"] = self._profile()
+            report["allocations"] = self._allocations()
+
+        return report
+
+    def write(self, path: str | Path) -> Path:
+        """
+        Writes the report as JSON (and the raw cProfile data next to it in deep mode).
+        """
+        path = Path(path)
+        path.write_text(json.dumps(self.report(), indent=2, default=str))
+
+        if self.profiler is not None:
+            self.profiler.dump_stats(path.with_suffix(".prof"))
+
+        return path
+
+    def _profile(self) -> list[dict]:
+        # Stop sampling so the report itself is not profiled
+        self.profiler.disable()
+        stats = pstats.Stats(self.profiler, stream=io.StringIO()).sort_stats("cumulative")
+
+        functions = []
+        for function in stats.fcn_list[:self.top]:
+            calls, _, own, cumulative, _ = stats.stats[function]
+            filename, line, name = function
+            functions.append({
+                "function": f"{name} ({os.path.basename(filename)}:{line})",
+                "calls": calls,
+                "own_seconds": own,
+                "cumulative_seconds": cumulative,
+            })
+        return functions
+
+    def _allocations(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        sites = tracemalloc.take_snapshot().statistics("lineno")[:self.top]
+        tracemalloc.stop()
+
+        return {
+            "current_mb": current / 2 ** 20,
+            "peak_mb": peak / 2 ** 20,
+            "top": [{"site": str(site.traceback), "size_mb": site.size / 2 ** 20, "blocks": site.count}
+                    for site in sites],
+        }
+
+
+class _InstrumentedEngine:
+    """
+    Proxy that records each public method call of the wrapped engine.
+    """
+
+    def __init__(self, engine, instrumentation: Instrumentation, prefix: str):
+        self._engine = engine
+        self._instrumentation = instrumentation
+        self._prefix = prefix
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._engine, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            frame = args[0] if args else kwargs.get("df", kwargs.get("df1", kwargs.get("base_df")))
+            with self._instrumentation.step(self._prefix + name, rows_in=_rows(frame)) as record:
+                result = attribute(*args, **kwargs)
+                record["rows_out"] = _rows(result)
+            return result
+
+        return call
+
+
+def _rows(obj) -> int | None:
+    # Only frames have a meaningful row count (iterators and lazy plans do not)
+    return len(obj) if hasattr(obj, "columns") and hasattr(obj, "__len__") else None
+
+
+def rss_bytes() -> int:
+    # Current resident set size; /proc is Linux only, elsewhere fall back to the peak
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,86 @@
+import os
+import shutil
+import uuid
+import pandas as pd
+from pathlib import Path
+
+
+class IntermediateStore:
+    """
+    Directory of intermediate frames stored as uncompressed Arrow IPC files.
+
+    Uncompressed IPC files can be memory-mapped: open() maps the file instead of reading it,
+    so Arrow buffers are shared with the page cache and loaded on demand. Worker processes
+    receive a file path instead of a pickled frame, and a stage result that was spilled
+    survives a failure of the next stage (checkpointing).
+    """
+
+    def __init__(self, directory: str | Path = Path("data") / "intermediate"):
+        self.directory = Path(directory)
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.arrow"
+
+    def spill(self, name: str, df: pd.DataFrame) -> Path:
+        """
+        Writes df as <directory>/<name>.arrow (atomically) and returns the path.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(name)
+
+        # Write to a temporary name first so a crash never leaves a truncated file under the real name
+        tmp = path.with_suffix(f".{uuid.uuid4().hex[:12]}.tmp")
+        write_ipc(df, tmp)
+        os.replace(tmp, path)
+        return path
+
+    def open(self, name: str) -> pd.DataFrame:
+        """
+        Memory-maps a spilled frame.
+        """
+        return read_ipc(self.path(name))
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).exists()
+
+    def remove(self, name: str):
+        self.path(name).unlink(missing_ok=True)
+
+    def clear(self):
+        """
+        Deletes every intermediate file of this store.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def write_ipc(df: pd.DataFrame, path: str | Path):
+    """
+    Writes df to an uncompressed Arrow IPC file (the format that can be memory-mapped).
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_ipc(path: str | Path) -> pd.DataFrame:
+    """
+    Opens an Arrow IPC file through a memory map.
+    Numeric columns without nulls are converted to pandas without copying the mapped buffers.
+    """
+    import pyarrow as pa
+
+    # The map stays open as long as the table (or the frame) references its buffers
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+    return table.to_pandas(split_blocks=True)
+
+
+def run_on_ipc(func, path: str | Path, *args):
+    """
+    Worker task: calls func on the frame memory-mapped from path.
+    Sending the path instead of the frame avoids pickling the data to the worker.
+    """
+    return func(read_ipc(path), *args)
@@ -0,0 +1,487 @@
+import pandas as pd
+from typing import List, Tuple
+
+from src.etl_pipeline.utils.SQL_with_Dataframes import SQl_df
+
+
+class LazyFrame:
+    """
+    One node of a lazy query plan.
+
+    Nothing is computed when a node is created. collect() first optimizes the whole plan
+    (filters are pushed below joins, unused columns are dropped as early as possible,
+    file scans only read the needed columns and hand the filters above them to the reader)
+    and then runs it with SQl_df.
+    """
+
+    def __init__(self, op: str, inputs: tuple = (), **params):
+        self.op = op              # operation name (scan_frame, join, filter, ...)
+        self.inputs = inputs      # child nodes
+        self.params = params      # arguments of the operation
+
+    def with_inputs(self, *inputs) -> "LazyFrame":
+        return LazyFrame(self.op, inputs, **self.params)
+
+    def with_params(self, **params) -> "LazyFrame":
+        return LazyFrame(self.op, self.inputs, **{**self.params, **params})
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        Output columns of this node, derived from the plan without reading data.
+        """
+        op, p = self.op, self.params
+
+        if op == "scan_frame":
+            return p["columns"] if p["columns"] is not None else list(p["df"].columns)
+
+        if op == "scan_file":
+            return p["columns"] if p["columns"] is not None else p["header"]
+
+        child = self.inputs[0].columns if self.inputs else []
+
+        if op == "rename":
+            return [_normalize(col) for col in child]
+
+        if op in ("convert", "filter", "rollup", "orderby"):
+            return child
+
+        if op == "join":
+            left, right = _join_output(self)
+            return [new for new, _ in left] + [new for new, _ in right]
+
+        if op == "select":
+            return list(p["columns"])
+
+        if op == "groupby_count":
+            return list(p["columns_groupby"]) + [p["Counter_Name"]]
+
+        if op == "groupby":
+            return list(p["columns_groupby"]) + [p["Agg_Name"]]
+
+        if op == "case":
+            return list(p["columns_to_keep"]) + [p["new_column_name"]]
+
+        if op in ("pivot", "pivot_rollup"):
+            return [p["group_col_1"], p["group_col_2"]] + sorted(p["values"]) + ["Grand_Total"]
+
+        raise ValueError(f"Unknown plan operation: {op}")
+
+    def optimize(self) -> "LazyFrame":
+        """
+        Returns an equivalent plan with filter and projection pushdown applied.
+        """
+        return _prune(_push_filters(self), None)
+
+    def explain(self) -> str:
+        """
+        Human readable optimized plan (one operation per line, children indented).
+        """
+        return _describe(self.optimize(), 0)
+
+    def collect(self, sql_df: SQl_df | None = None) -> pd.DataFrame:
+        """
+        Optimizes and executes the plan.
+
+        Results match the eager SQl_df pipeline. Row labels (the index) may differ
+        when a filter was moved below a join.
+        sql_df: the engine that runs each operation (e.g. an instrumented one).
+        """
+        return _execute(self.optimize(), sql_df or SQl_df())
+
+
+class LazySQl_df():
+    """
+    Lazy counterpart of SQl_df.
+
+    Methods have the same names and arguments as SQl_df, but they record the operation
+    in a LazyFrame plan instead of running it. Plain DataFrames are accepted anywhere a
+    LazyFrame is, so a transformation can switch engines without other changes.
+    Call .collect() on the last LazyFrame to get the result.
+    """
+
+    def __init__(self):
+        """
+        No state is stored. This class only builds plan nodes.
+        """
+        pass
+
+    def scan(self, df: pd.DataFrame) -> LazyFrame:
+        """
+        Starts a plan from an in-memory DataFrame.
+        """
+        return LazyFrame("scan_frame", df=df, columns=None)
+
+    def scan_file(self, reader, filename: str) -> LazyFrame:
+        """
+        Starts a plan from a file read through an Extract instance (read_files/read_header).
+        """
+        # Only the header is read now, so the plan knows the file's columns
+        return LazyFrame(
+            "scan_file",
+            reader=reader,
+            filename=filename,
+            header=reader.read_header(filename),
+            columns=None,
+            filters=[]
+        )
+
+    def _node(self, df) -> LazyFrame:
+        return df if isinstance(df, LazyFrame) else self.scan(df)
+
+    def rename_columns(self, df) -> LazyFrame:
+        return LazyFrame("rename", (self._node(df),))
+
+    def convert_to_numeric(self, df, column_name: str) -> LazyFrame:
+        return LazyFrame("convert", (self._node(df),), column_name=column_name)
+
+    def join_dataframes(self, df1, df2, column_to_join: str, join_type,
+                        strategy: str = "auto", broadcast_rows: int = 100_000) -> LazyFrame:
+        return LazyFrame(
+            "join",
+            (self._node(df1), self._node(df2)),
+            column_to_join=column_to_join,
+            join_type=join_type,
+            strategy=strategy,
+            broadcast_rows=broadcast_rows
+        )
+
+    def apply_filters(self, df, column_name: str, operator: str, value: float) -> LazyFrame:
+        # Same validation as SQl_df, but raised while the plan is built
+        if operator not in _OPERATORS:
+            raise ValueError("Invalid operator")
+        return LazyFrame("filter", (self._node(df),), column_name=column_name, operator=operator, value=value)
+
+    def df_select_columns(self, df, columns: list[str]) -> LazyFrame:
+        return LazyFrame("select", (self._node(df),), columns=list(columns))
+
+    def df_groupby_count(self, df, columns_groupby: list[str], Counter_Name: str) -> LazyFrame:
+        return LazyFrame(
+            "groupby_count",
+            (self._node(df),),
+            columns_groupby=list(columns_groupby),
+            Counter_Name=Counter_Name
+        )
+
+    def df_groupby(self, df, columns_groupby: list[str], Agg_Name: str, column_to_agg: str,
+                   agg_func: str) -> LazyFrame:
+        return LazyFrame(
+            "groupby",
+            (self._node(df),),
+            columns_groupby=list(columns_groupby),
+            Agg_Name=Agg_Name,
+            column_to_agg=column_to_agg,
+            agg_func=agg_func
+        )
+
+    def df_case(
+            self,
+            df,
+            columns_to_keep: List[str],
+            value_column: str,
+            ranges: List[Tuple[int, int]],
+            labels: List[str],
+            default_label: str,
+            new_column_name: str,
+            inclusive: str | List[str] = "both",
+            categorical: bool = False
+    ) -> LazyFrame:
+        if len(ranges) != len(labels):
+            raise ValueError("Ranges and labels must match")
+        return LazyFrame(
+            "case",
+            (self._node(df),),
+            columns_to_keep=list(columns_to_keep),
+            value_column=value_column,
+            ranges=list(ranges),
+            labels=list(labels),
+            default_label=default_label,
+            new_column_name=new_column_name,
+            inclusive=inclusive,
+            categorical=categorical
+        )
+
+    def df_pivot_values_to_columns(self, df, group_col_1, group_col_2, value_column, values,
+                                   count_column=None) -> LazyFrame:
+        return LazyFrame(
+            "pivot",
+            (self._node(df),),
+            group_col_1=group_col_1,
+            group_col_2=group_col_2,
+            value_column=value_column,
+            values=list(values),
+            count_column=count_column
+        )
+
+    def df_groupby_rollup(self, base_df, group_col_1: str, group_col_2: str,
+                          grand_total_label: str = "Grand Total", total_label: str = "Total") -> LazyFrame:
+        return LazyFrame(
+            "rollup",
+            (self._node(base_df),),
+            group_col_1=group_col_1,
+            group_col_2=group_col_2,
+            grand_total_label=grand_total_label,
+            total_label=total_label
+        )
+
+    def df_pivot_rollup(self, df, group_col_1: str, group_col_2: str, value_column: str, values,
+                        count_column=None, grand_total_label: str = "Grand Total",
+                        total_label: str = "Total") -> LazyFrame:
+        return LazyFrame(
+            "pivot_rollup",
+            (self._node(df),),
+            group_col_1=group_col_1,
+            group_col_2=group_col_2,
+            value_column=value_column,
+            values=list(values),
+            count_column=count_column,
+            grand_total_label=grand_total_label,
+            total_label=total_label
+        )
+
+    def df_orderby_grouping(self, df, group_col_1, group_col_2, total_label="Total",
+                            grand_total_label="Grand Total") -> LazyFrame:
+        return LazyFrame(
+            "orderby",
+            (self._node(df),),
+            group_col_1=group_col_1,
+            group_col_2=group_col_2,
+            total_label=total_label,
+            grand_total_label=grand_total_label
+        )
+
+
+# =====================================================
+# Plan helpers
+# =====================================================
+
+_OPERATORS = ('>=', '<=', '>', '<', '==', '!=')
+
+
+def _normalize(column: str) -> str:
+    # Same rule as SQl_df.rename_columns
+    return column.replace(' ', '_').replace('/', '_')
+
+
+def _join_output(node: LazyFrame) -> tuple[list, list]:
+    """
+    Output columns of a join as (new_name, source_name) pairs for the left and right side.
+    Mirrors DataFrame.merge: the key appears once and other shared names get _x/_y suffixes.
+    """
+    key = node.params["column_to_join"]
+    left, right = node.inputs[0].columns, node.inputs[1].columns
+    shared = (set(left) & set(right)) - {key}
+
+    left_out = [(col + "_x" if col in shared else col, col) for col in left]
+    right_out = [(col + "_y" if col in shared else col, col) for col in right if col != key]
+    return left_out, right_out
+
+
+def _push_filters(node: LazyFrame) -> LazyFrame:
+    """
+    Rewrites the plan bottom-up so every filter sits as close to the scans as possible.
+    """
+    node = node.with_inputs(*[_push_filters(child) for child in node.inputs])
+    if node.op == "filter":
+        return _push_filter(node, node.inputs[0])
+    return node
+
+
+def _push_filter(filter_node: LazyFrame, child: LazyFrame) -> LazyFrame:
+    """
+    Moves one filter below child when the result is guaranteed to be the same.
+    """
+    column = filter_node.params["column_name"]
+
+    # Filtering on another condition does not interact with this filter. Conversions are not
+    # crossed: to_numeric infers int or float from the rows it sees, so fewer rows could change the dtype
+    if child.op == "filter":
+        return child.with_inputs(_push_filter(filter_node, child.inputs[0]))
+
+    if child.op == "select" and column in child.params["columns"]:
+        return child.with_inputs(_push_filter(filter_node, child.inputs[0]))
+
+    if child.op == "rename":
+        source = [col for col in child.inputs[0].columns if _normalize(col) == column]
+        if len(source) == 1:
+            moved = filter_node.with_params(column_name=source[0])
+            return child.with_inputs(_push_filter(moved, child.inputs[0]))
+
+    if child.op == "join":
+        left_out, right_out = _join_output(child)
+        left_names = dict(left_out)
+        right_names = dict(right_out)
+        left, right = child.inputs
+
+        # Only inner joins: before a left join the filter could drop every unmatched row, and the
+        # right-side columns would keep their integer dtype instead of the NaN-filled float one
+        if child.params["join_type"] != "inner":
+            return filter_node.with_inputs(_hint_scan(child, column, filter_node.params))
+
+        if column in left_names:
+            moved = filter_node.with_params(column_name=left_names[column])
+            return child.with_inputs(_push_filter(moved, left), right)
+
+        if column in right_names:
+            moved = filter_node.with_params(column_name=right_names[column])
+            return child.with_inputs(left, _push_filter(moved, right))
+
+    # The filter stays here, but a file scan below can still skip rows it excludes
+    return filter_node.with_inputs(_hint_scan(child, column, filter_node.params))
+
+
+def _hint_scan(node: LazyFrame, column: str, filter_params: dict) -> LazyFrame:
+    """
+    Adds the (source column, operator, value) of a filter to the file scan it reads from, through
+    filters, projections, renames and the conversion of the filter column itself (the conversion of
+    another column could infer another dtype from fewer rows). The reader only uses the hint where it
+    is exact (see Extract read_files); the filter node above still decides, so the result never changes.
+    """
+    if node.op == "scan_file":
+        hint = (column, filter_params["operator"], filter_params["value"])
+        return node.with_params(filters=node.params["filters"] + [hint])
+
+    if node.op in ("filter", "select") or (node.op == "convert" and node.params["column_name"] == column):
+        return node.with_inputs(_hint_scan(node.inputs[0], column, filter_params))
+
+    if node.op == "rename":
+        source = [col for col in node.inputs[0].columns if _normalize(col) == column]
+        if len(source) == 1:
+            return node.with_inputs(_hint_scan(node.inputs[0], source[0], filter_params))
+
+    return node
+
+
+def _keep(columns: list[str], required: set | None) -> list[str]:
+    return [col for col in columns if required is None or col in required]
+
+
+def _prune(node: LazyFrame, required: set | None) -> LazyFrame:
+    """
+    Projection pushdown: required is the set of output columns the parent needs
+    (None means all of them). Returns a node that produces at least those columns.
+    """
+    op, p = node.op, node.params
+
+    if op in ("scan_frame", "scan_file"):
+        if required is None:
+            return node
+        return node.with_params(columns=_keep(node.columns, required))
+
+    child = node.inputs[0] if node.inputs else None
+
+    if op == "rename":
+        if required is None:
+            return node.with_inputs(_prune(child, None))
+        return node.with_inputs(_prune(child, {col for col in child.columns if _normalize(col) in required}))
+
+    if op == "convert":
+        # A conversion of a column nobody reads is dead code
+        if required is not None and p["column_name"] not in required:
+            return _prune(child, required)
+        return node.with_inputs(_prune(child, required))
+
+    if op == "filter":
+        child_required = None if required is None else required | {p["column_name"]}
+        return node.with_inputs(_prune(child, child_required))
+
+    if op == "join":
+        left_out, right_out = _join_output(node)
+        key = p["column_to_join"]
+        left_required = {source for new, source in left_out if required is None or new in required} | {key}
+        right_required = {source for new, source in right_out if required is None or new in required} | {key}
+        # Shared names must stay on both sides, otherwise merge would stop adding suffixes
+        shared = {source for new, source in left_out if new != source}
+        return node.with_inputs(
+            _prune(node.inputs[0], left_required | shared),
+            _prune(node.inputs[1], right_required | shared)
+        )
+
+    if op == "select":
+        columns = _keep(p["columns"], required)
+        return node.with_params(columns=columns).with_inputs(_prune(child, set(columns)))
+
+    if op == "groupby_count":
+        return node.with_inputs(_prune(child, set(p["columns_groupby"])))
+
+    if op == "groupby":
+        return node.with_inputs(_prune(child, set(p["columns_groupby"]) | {p["column_to_agg"]}))
+
+    if op == "case":
+        # value_column has to stay because df_case reads it from the kept columns
+        keep = [col for col in p["columns_to_keep"]
+                if required is None or col in required or col == p["value_column"]]
+        return node.with_params(columns_to_keep=keep).with_inputs(_prune(child, set(keep)))
+
+    if op in ("pivot", "pivot_rollup"):
+        needed = {p["group_col_1"], p["group_col_2"], p["value_column"]}
+        if p["count_column"] is not None:
+            needed.add(p["count_column"])
+        return node.with_inputs(_prune(child, needed))
+
+    # rollup and orderby use every column of their input
+    return node.with_inputs(*[_prune(child, None) for child in node.inputs])
+
+
+def _execute(node: LazyFrame, sql_df: SQl_df) -> pd.DataFrame:
+    """
+    Runs an (optimized) plan with the eager SQl_df operations.
+    """
+    op, p = node.op, node.params
+    inputs = [_execute(child, sql_df) for child in node.inputs]
+
+    if op == "scan_frame":
+        return p["df"] if p["columns"] is None else p["df"][p["columns"]]
+
+    if op == "scan_file":
+        return p["reader"].read_files(p["filename"], columns=p["columns"], filters=p["filters"])
+
+    if op == "rename":
+        return sql_df.rename_columns(inputs[0])
+
+    if op == "convert":
+        return sql_df.convert_to_numeric(inputs[0], p["column_name"])
+
+    if op == "join":
+        return sql_df.join_dataframes(inputs[0], inputs[1], **p)
+
+    if op == "filter":
+        return sql_df.apply_filters(inputs[0], p["column_name"], p["operator"], p["value"])
+
+    if op == "select":
+        return sql_df.df_select_columns(inputs[0], p["columns"])
+
+    if op == "groupby_count":
+        return sql_df.df_groupby_count(inputs[0], p["columns_groupby"], p["Counter_Name"])
+
+    if op == "groupby":
+        return sql_df.df_groupby(inputs[0], p["columns_groupby"], p["Agg_Name"], p["column_to_agg"], p["agg_func"])
+
+    if op == "case":
+        return sql_df.df_case(inputs[0], **p)
+
+    if op == "pivot":
+        return sql_df.df_pivot_values_to_columns(inputs[0], **p)
+
+    if op == "pivot_rollup":
+        return sql_df.df_pivot_rollup(inputs[0], **p)
+
+    if op == "rollup":
+        return sql_df.df_groupby_rollup(inputs[0], **p)
+
+    if op == "orderby":
+        return sql_df.df_orderby_grouping(inputs[0], **p)
+
+    raise ValueError(f"Unknown plan operation: {op}")
+
+
+def _describe(node: LazyFrame, depth: int) -> str:
+    details = {
+        key: value for key, value in node.params.items()
+        if key not in ("df", "reader", "header")
+    }
+    if node.op == "scan_frame":
+        details["rows"] = len(node.params["df"])
+
+    line = "  " * depth + f"{node.op} {details}"
+    return "\n".join([line] + [_describe(child, depth + 1) for child in node.inputs])
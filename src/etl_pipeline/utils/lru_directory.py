@@ -0,0 +1,83 @@
+import os
+import pandas as pd
+from pathlib import Path
+
+
+class LRUDirectory:
+    """
+    Directory of Parquet entries with a size limit, shared by the Extract cache and the result memo.
+
+    Reading an entry refreshes its modification time, which is the "last used" stamp:
+    once the entries exceed max_bytes, the least recently used ones are deleted first.
+    Several processes may share the directory, so entries deleted by another process
+    between a listing and a read are treated as missing.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes  # size limit of all entries together
+
+    # =====================================================
+    # Read / write
+    # =====================================================
+    def _read(self, entry: Path) -> pd.DataFrame | None:
+        # Returns the stored frame, or None if the entry does not exist (or was just evicted)
+        if not entry.exists():
+            return None
+        try:
+            # Refresh the modification time: it is the "last used" stamp for LRU eviction
+            os.utime(entry)
+            return pd.read_parquet(entry)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, entry: Path, df: pd.DataFrame, index: bool = False):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so a crash never leaves a truncated entry
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        df.to_parquet(tmp, index=index)
+        os.replace(tmp, entry)
+
+        self.evict()
+
+    # =====================================================
+    # Maintenance
+    # =====================================================
+    def entries(self) -> list[Path]:
+        """
+        Entries, least recently used first.
+        """
+        return [entry for entry, _ in self._stats()]
+
+    def _stats(self) -> list[tuple[Path, os.stat_result]]:
+        # (entry, stat) pairs, least recently used first; entries deleted meanwhile are skipped
+        if not self.directory.exists():
+            return []
+
+        stats = []
+        for entry in self.directory.glob("*.parquet"):
+            try:
+                stats.append((entry, entry.stat()))
+            except FileNotFoundError:
+                continue
+        return sorted(stats, key=lambda item: item[1].st_mtime_ns)
+
+    def size(self) -> int:
+        """
+        Total size of the entries in bytes.
+        """
+        return sum(stat.st_size for _, stat in self._stats())
+
+    def evict(self):
+        """
+        Removes least recently used entries until the directory fits in max_bytes.
+        """
+        stats = self._stats()
+        total = sum(stat.st_size for _, stat in stats)
+
+        for entry, stat in stats:
+            if total <= self.max_bytes:
+                break
+            total -= stat.st_size
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,147 @@
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pandas as pd
+from pathlib import Path
+from typing import Callable
+
+from src.etl_pipeline.utils.lru_directory import LRUDirectory
+
+# Modules whose code shapes every pipeline result (besides the pipeline's own Transform module)
+ENGINE_MODULES = (
+    "src.etl_pipeline.pipeline",
+    "src.etl_pipeline.transform.base",
+    "src.etl_pipeline.extract.extract",
+    "src.etl_pipeline.extract.schemas",
+    "src.etl_pipeline.extract.prefetch",
+    "src.etl_pipeline.extract.categorical",
+    "src.etl_pipeline.extract.excel",
+    "src.etl_pipeline.utils.SQL_with_Dataframes",
+    "src.etl_pipeline.utils.partitioned",
+    "src.etl_pipeline.utils.incremental",
+    "src.etl_pipeline.utils.lazy_SQL",
+    "src.etl_pipeline.utils.sqlite_SQL",
+    "src.etl_pipeline.utils.quality",
+)
+
+
+class ResultMemo(LRUDirectory):
+    """
+    On-disk memo of pipeline results (the frame handed to Load).
+
+    The key combines the content of the input files, the business parameters, the source code
+    of the transformation (the Transform module and the engines it runs on) and the options that
+    change the result. When none of them changed, load() returns the stored result without
+    extracting or transforming anything. Entries are evicted least-recently-used first once
+    the memo exceeds max_bytes.
+    """
+
+    def __init__(self, memo_dir: str | Path = Path("data") / "memo", max_bytes: int = 256 * 1024 ** 2):
+        super().__init__(memo_dir, max_bytes)
+        self.memo_dir = self.directory
+        self._fingerprints_file = self.memo_dir / "fingerprints.json"
+
+    # =====================================================
+    # Keys
+    # =====================================================
+    def fingerprint(self, file_path: str | Path) -> str:
+        """
+        Hash of the file content. The hash is reused while the file's size and mtime are
+        unchanged, so unchanged inputs are not read again; a touched or copied file with the
+        same bytes still gets the same fingerprint.
+        A directory (a partitioned Parquet dataset) is hashed from the paths and hashes of its files.
+        """
+        file_path = Path(file_path)
+        if file_path.is_dir():
+            files = sorted(path for path in file_path.rglob("*") if path.is_file())
+            parts = [[str(path.relative_to(file_path)), self.fingerprint(path)] for path in files]
+            return hashlib.blake2b(json.dumps(parts).encode()).hexdigest()
+
+        stat = file_path.stat()
+        state = [stat.st_size, stat.st_mtime_ns]
+
+        known = self._known_fingerprints()
+        entry = known.get(str(file_path.resolve()))
+        if entry is not None and entry[:2] == state:
+            return entry[2]
+
+        digest = hashlib.blake2b()
+        with open(file_path, "rb") as handle:
+            for block in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(block)
+        content = digest.hexdigest()
+
+        known[str(file_path.resolve())] = state + [content]
+        self._save_fingerprints(known)
+        return content
+
+    def _known_fingerprints(self) -> dict:
+        try:
+            return json.loads(self._fingerprints_file.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_fingerprints(self, known: dict):
+        self.memo_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._fingerprints_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(known))
+        os.replace(tmp, self._fingerprints_file)
+
+    def key(self, files: list[str | Path], parameters: dict, code: type, **options) -> str:
+        """
+        Memo key of one pipeline run.
+        files: input files; parameters: business parameters (e.g. Transform.PARAMETERS merged
+        with overrides); code: the Transform class; options: run options that change the result.
+        """
+        parts = {
+            "inputs": [self.fingerprint(path) for path in files],
+            "parameters": parameters,
+            "code": code_version(code),
+            "options": options,
+        }
+        # default=repr: tuples, numpy scalars, etc. are hashed by their text form
+        return hashlib.sha1(json.dumps(parts, sort_keys=True, default=repr).encode()).hexdigest()
+
+    # =====================================================
+    # Read / write
+    # =====================================================
+    def load(self, key: str, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Returns the memoized result for key, or computes it with compute() and stores it.
+        """
+        entry = self.memo_dir / f"{key}.parquet"
+
+        # None: missing, or evicted by another process in the meantime
+        df = self._read(entry)
+        if df is not None:
+            return df
+
+        df = compute()
+        self._write(entry, df)
+        return df
+
+    # =====================================================
+    # Maintenance
+    # =====================================================
+    def clear(self) -> int:
+        """
+        Deletes every entry. Returns the number of deleted entries.
+        """
+        entries = self.entries()
+        for entry in entries:
+            entry.unlink(missing_ok=True)
+        return len(entries)
+
+
+def code_version(transform: type) -> str:
+    """
+    Hash of the source code of the transform's module and of the ENGINE_MODULES.
+    """
+    modules = [inspect.getmodule(transform)] + [importlib.import_module(name) for name in ENGINE_MODULES]
+
+    digest = hashlib.sha1()
+    for module in modules:
+        digest.update(Path(inspect.getsourcefile(module)).read_bytes())
+    return digest.hexdigest()
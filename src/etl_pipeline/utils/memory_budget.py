@@ -0,0 +1,88 @@
+import threading
+from pathlib import Path
+
+from src.etl_pipeline.utils.instrumentation import rss_bytes
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """
+    Raised when a run used more memory than its MemoryBudget allows.
+    """
+
+
+class MemoryBudget:
+    """
+    Memory-budget assertion for a block of code (typically one pipeline run).
+
+    The budget is `multiple` times the size of the inputs. While the block runs, a background
+    thread samples the resident memory of the process; the peak is the highest sample minus
+    the memory in use when the block started. If it exceeds the budget, leaving the block
+    raises MemoryBudgetExceeded, so a change that copies frames unnecessarily fails the run.
+
+        with MemoryBudget.for_files(paths, multiple=3):
+            run()
+    """
+
+    def __init__(self, input_bytes: int, multiple: float = 3.0, interval: float = 0.005):
+        if multiple <= 0:
+            raise ValueError("multiple must be positive")
+
+        self.input_bytes = input_bytes
+        self.multiple = multiple
+        self.interval = interval
+
+        self.baseline = None
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def for_files(cls, paths: list[str | Path], multiple: float = 3.0, **kwargs) -> "MemoryBudget":
+        """
+        Budget relative to the total size of the given input files
+        (a directory, e.g. a partitioned Parquet dataset, counts the files under it).
+        """
+        files = []
+        for path in map(Path, paths):
+            files.extend(sorted(child for child in path.rglob("*") if child.is_file()) if path.is_dir() else [path])
+        return cls(sum(path.stat().st_size for path in files), multiple, **kwargs)
+
+    @property
+    def budget_bytes(self) -> float:
+        return self.multiple * self.input_bytes
+
+    @property
+    def peak_bytes(self) -> int:
+        # Memory used by the block on top of what the process held when it started
+        return max(0, self.peak - (self.baseline or 0))
+
+    def __enter__(self) -> "MemoryBudget":
+        self.baseline = self.peak = rss_bytes()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="MemoryBudget", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+        # An error inside the block is more informative than the budget check
+        if exc_type is None:
+            self.check()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def check(self):
+        """
+        Raises MemoryBudgetExceeded if the peak so far is over the budget.
+        """
+        if self.peak_bytes > self.budget_bytes:
+            raise MemoryBudgetExceeded(
+                f"Peak memory {self.peak_bytes / 2 ** 20:.1f} MB exceeds the budget of "
+                f"{self.multiple:g} x {self.input_bytes / 2 ** 20:.1f} MB of input "
+                f"({self.budget_bytes / 2 ** 20:.1f} MB)"
+            )
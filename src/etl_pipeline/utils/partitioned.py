@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import Executor
+from typing import Callable
+
+from src.etl_pipeline.utils.intermediate import IntermediateStore, run_on_ipc
+
+
+def hash_partition(df: pd.DataFrame, column: str, partitions: int) -> list[pd.DataFrame]:
+    """
+    Splits df into `partitions` frames by a hash of column.
+    All rows with the same key land in the same partition, so GROUP BYs that start with
+    column can run on each partition independently. Row order is kept within each partition.
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be a positive integer")
+    if partitions == 1:
+        return [df]
+
+    # Stable hash of the key values (not of the index), the same in every process
+    codes = (pd.util.hash_pandas_object(df[column], index=False).to_numpy() % partitions).astype(np.intp)
+
+    # One stable sort instead of one boolean mask per partition
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(1, partitions))
+
+    return [df.take(rows) for rows in np.split(order, bounds)]
+
+
+def map_partitions(executor: Executor, func: Callable, df: pd.DataFrame, column: str,
+                   partitions: int, *args, store: IntermediateStore | None = None) -> list:
+    """
+    Runs func(partition, *args) for every hash partition of df on executor
+    and returns the results in partition order.
+
+    store: hand the partitions to the workers as memory-mapped Arrow IPC files
+    instead of pickling them (the files are removed once the results are back).
+    """
+    parts = hash_partition(df, column, partitions)
+
+    if store is None:
+        futures = [executor.submit(func, part, *args) for part in parts]
+        return [future.result() for future in futures]
+
+    paths = [store.spill(f"partition_{position}", part) for position, part in enumerate(parts)]
+    try:
+        futures = [executor.submit(run_on_ipc, func, path, *args) for path in paths]
+        return [future.result() for future in futures]
+    finally:
+        for path in paths:
+            path.unlink(missing_ok=True)
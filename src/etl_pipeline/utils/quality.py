@@ -0,0 +1,165 @@
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+
+class DataQuality:
+    """
+    Data-quality checks of the fact rows, with a sink for the rejected rows.
+
+    Transform(quality=...) calls check() on every fact frame (whole table, chunk or file), right
+    after the numeric conversion and before the join. Rows the report would otherwise lose
+    silently are rejected with a reason code, in this order of precedence:
+    - "unparseable_numeric": the numeric column is missing or not a number
+    - "orphan_key": the join key is not in the dimension table (the inner join would drop it)
+    - "null_group_key": a group key is missing, in the fact row or in its dimension row
+    - "out_of_range": the numeric value is outside the configured bounds
+
+    All checks are vectorized masks over the frame; when every row passes, the frame is returned
+    as it is. Rejected rows are appended to a Parquet file (the original values as text, their
+    source file and row label, and the reason), at most max_rows of them; the counts always cover
+    every row. The file is written under a temporary name and only published by close(), once the
+    run succeeded; abort() discards it.
+    """
+
+    REASONS = ("unparseable_numeric", "orphan_key", "null_group_key", "out_of_range")
+
+    def __init__(self, rejects_path: str | Path, max_rows: int | None = 1_000_000):
+        self.rejects_path = Path(rejects_path)
+        self.max_rows = max_rows  # rejected rows kept in the side file (None: all of them)
+
+        self.rows_checked = 0
+        self.counts = dict.fromkeys(self.REASONS, 0)
+        self.rows_written = 0
+        self.closed = False
+
+        # Parquet writer of the side file, opened on the first rejected rows
+        self._writer = None
+        self._tmp_path = self.rejects_path.with_suffix(f".{os.getpid()}.tmp")
+
+    # =====================================================
+    # Checks
+    # =====================================================
+    def check(self, df: pd.DataFrame, raw: pd.DataFrame, numeric_column: str, bounds: tuple | list,
+              join_key: str, dimension: pd.DataFrame, group_keys: list[str]) -> pd.DataFrame:
+        """
+        Returns the rows of df that pass every check; the others go to the rejected-row sink.
+
+        df: fact rows after convert_to_numeric; raw: the same rows before it (the original text).
+        raw.attrs["source"] (set by Extract for each file of a glob pattern) is recorded with each
+        rejected row, since row labels restart at 0 in every file.
+        bounds: (low, high) valid range of numeric_column, inclusive; None for no limit.
+        dimension: the table joined on join_key.
+        group_keys: GROUP BY columns of the report, from the fact table or the dimension table.
+        """
+        values = df[numeric_column]
+        low, high = bounds
+
+        masks = [values.isna().to_numpy()]
+
+        # Orphans: a hash lookup of the keys in the (small) dimension table
+        masks.append(~df[join_key].isin(dimension[join_key]).to_numpy())
+
+        # Null keys of the fact rows, plus fact rows whose dimension row has a null key
+        fact_keys = [column for column in group_keys if column in df.columns]
+        dimension_keys = [column for column in group_keys if column not in df.columns and column in dimension.columns]
+        null_keys = df[fact_keys].isna().any(axis=1).to_numpy()
+        if dimension_keys:
+            incomplete = dimension.loc[dimension[dimension_keys].isna().any(axis=1), join_key]
+            if len(incomplete):
+                null_keys = null_keys | df[join_key].isin(incomplete).to_numpy()
+        masks.append(null_keys)
+
+        out_of_range = np.zeros(len(df), dtype=bool)
+        if low is not None:
+            out_of_range |= (values < low).to_numpy()
+        if high is not None:
+            out_of_range |= (values > high).to_numpy()
+        masks.append(out_of_range)
+
+        self.rows_checked += len(df)
+        rejected = np.logical_or.reduce(masks)
+        if not rejected.any():
+            return df
+
+        # Reason of each rejected row: the first check it fails
+        positions = np.flatnonzero(rejected)
+        codes = np.select([mask[positions] for mask in masks], list(range(len(self.REASONS))))
+        for code, count in zip(*np.unique(codes, return_counts=True)):
+            self.counts[self.REASONS[code]] += int(count)
+
+        self._write(raw.iloc[positions], codes)
+        return df[~rejected]
+
+    # =====================================================
+    # Sink
+    # =====================================================
+    def _write(self, rows: pd.DataFrame, codes: np.ndarray):
+        if self.max_rows is not None:
+            room = self.max_rows - self.rows_written
+            if room <= 0:
+                return
+            rows, codes = rows.iloc[:room], codes[:room]
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Original values as text: one schema for every chunk, whatever dtypes each one was read with
+        columns = {str(column): pa.array(rows[column].astype(str).where(rows[column].notna(), None), pa.string())
+                   for column in rows.columns}
+        table = pa.table({
+            "source": pa.array([rows.attrs.get("source")] * len(rows), pa.string()).dictionary_encode(),
+            "row": pa.array(_row_labels(rows.index), pa.int64()),
+            **columns,
+            "reason": pa.array(np.asarray(self.REASONS, dtype=object)[codes], pa.string()).dictionary_encode(),
+        })
+
+        if self._writer is None:
+            self.rejects_path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self._tmp_path, table.schema, compression="zstd")
+        self._writer.write_table(table)
+        self.rows_written += len(table)
+
+    def close(self) -> dict:
+        """
+        Finishes the side file and returns summary(). Without rejected rows, the side file of an
+        earlier run is removed so it is never mistaken for this run's.
+        """
+        if not self.closed:
+            if self._writer is not None:
+                self._writer.close()
+                os.replace(self._tmp_path, self.rejects_path)
+            else:
+                self.rejects_path.unlink(missing_ok=True)
+            self.closed = True
+        return self.summary()
+
+    def abort(self):
+        """
+        Discards the rejected rows of a failed run. The side file of the last successful run is kept,
+        like the 'latest' output it belongs to.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._tmp_path.unlink(missing_ok=True)
+
+    def summary(self) -> dict:
+        """
+        Rows checked, rejected rows in total and per reason, and the side file (if any).
+        """
+        rejected = sum(self.counts.values())
+        return {
+            "rows_checked": self.rows_checked,
+            "rejected": rejected,
+            "reasons": {reason: count for reason, count in self.counts.items() if count},
+            "rejects_file": str(self.rejects_path) if self.rows_written else None,
+        }
+
+
+def _row_labels(index: pd.Index) -> np.ndarray:
+    # Row labels of the fact frame (its row numbers when read by Extract); -1 if not integers
+    if pd.api.types.is_integer_dtype(index):
+        return index.to_numpy(dtype=np.int64)
+    return np.full(len(index), -1, dtype=np.int64)
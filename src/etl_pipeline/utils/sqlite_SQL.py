@@ -0,0 +1,454 @@
+import os
+import sqlite3
+import tempfile
+import pandas as pd
+from typing import Iterable, Iterator, List, Tuple
+
+from src.etl_pipeline.utils.SQL_with_Dataframes import SQl_df
+
+
+class SQLiteFrame:
+    """
+    One relation of the SQLite backend: a SELECT statement over tables loaded in the database.
+
+    Building a frame only composes SQL; nothing runs until collect() or iter_batches(),
+    which execute the whole statement in SQLite and stream the rows back.
+    """
+
+    def __init__(self, engine: "SQLiteSQl_df", sql: str, columns: list, types: dict,
+                 table: str | None = None, categories: dict | None = None):
+        self.engine = engine
+        self.sql = sql                        # SELECT statement of the relation
+        self.columns = list(columns)          # output column labels, in order
+        self.types = types                    # {column: "INTEGER" | "REAL" | "NUMERIC" | "TEXT"}
+        self.table = table                    # base table name (only for loaded tables)
+        self.categories = categories or {}    # {column: categories} returned as pandas Categorical
+
+    def iter_batches(self, batch_size: int | None = None) -> Iterator[pd.DataFrame]:
+        """
+        Runs the statement and yields the result in DataFrames of at most batch_size rows.
+        """
+        cursor = self.engine.connection.execute(self.sql)
+        batch_size = batch_size or self.engine.batch_size
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield self._frame(rows)
+        finally:
+            cursor.close()
+
+    def collect(self) -> pd.DataFrame:
+        """
+        Runs the statement and returns the whole result.
+        """
+        batches = list(self.iter_batches())
+        if not batches:
+            return self._frame([])
+        return batches[0] if len(batches) == 1 else pd.concat(batches, ignore_index=True)
+
+    def _frame(self, rows: list) -> pd.DataFrame:
+        df = pd.DataFrame.from_records(rows, columns=self.columns)
+        for column, categories in self.categories.items():
+            df[column] = pd.Categorical(df[column], categories=categories)
+        return df
+
+
+class SQLiteSQl_df():
+    """
+    SQLite counterpart of SQl_df, for inputs larger than memory.
+
+    Methods have the same names and arguments as SQl_df. DataFrames (or iterators of
+    DataFrame chunks) are bulk-loaded into a local SQLite database; every operation returns
+    an SQLiteFrame whose SELECT statement builds on its inputs, so SQLite plans and runs
+    the whole chain (join, filter, CASE, GROUP BY, ROLLUP) on disk. Join keys get an index
+    on the loaded tables. Call .collect() (or .iter_batches()) on the last frame.
+
+    database: SQLite file to use; by default a temporary file deleted by close().
+    """
+
+    # SQL comparison of each apply_filters operator
+    OPERATORS = {'>=': '>=', '<=': '<=', '>': '>', '<': '<', '==': '=', '!=': '!='}
+
+    # SQL aggregate of each df_groupby agg_func and the type of its result
+    AGGREGATES = {
+        "count": ("COUNT({})", "INTEGER"),
+        "size": ("COUNT(*)", "INTEGER"),
+        "sum": ("COALESCE(SUM({}), 0)", "NUMERIC"),
+        "mean": ("AVG({})", "REAL"),
+        "min": ("MIN({})", "NUMERIC"),
+        "max": ("MAX({})", "NUMERIC"),
+    }
+
+    def __init__(self, database: str | None = None, batch_size: int = 100_000):
+        self.batch_size = batch_size
+        self._temporary = database is None
+        if self._temporary:
+            handle, database = tempfile.mkstemp(prefix="etl_", suffix=".db")
+            os.close(handle)
+        self.database = database
+
+        self.connection = sqlite3.connect(database)
+        # Scratch database: no journal or fsync, large page cache
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute("PRAGMA cache_size = -262144")
+        self.connection.create_function("to_number", 1, _to_number, deterministic=True)
+
+        self._tables = 0
+
+    def close(self):
+        """
+        Closes the connection (and deletes the temporary database).
+        """
+        self.connection.close()
+        if self._temporary:
+            for suffix in ("", "-journal", "-wal", "-shm"):
+                if os.path.exists(self.database + suffix):
+                    os.remove(self.database + suffix)
+
+    # =====================================================
+    # Loading
+    # =====================================================
+    def scan(self, data: pd.DataFrame | Iterable[pd.DataFrame]) -> SQLiteFrame:
+        """
+        Bulk-loads a DataFrame, or an iterator of DataFrame chunks (one at a time), into a new table.
+        """
+        chunks = iter([data]) if isinstance(data, pd.DataFrame) else iter(data)
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError("Nothing to load")
+
+        self._tables += 1
+        table = f"t{self._tables}"
+        columns = list(first.columns)
+        types = {column: _sql_type(first[column]) for column in columns}
+
+        definition = ", ".join(f"{_quote(column)} {types[column]}" for column in columns)
+        self.connection.execute(f"CREATE TABLE {table} ({definition})")
+
+        insert = f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})"
+        for chunk in [first] if isinstance(data, pd.DataFrame) else _chain(first, chunks):
+            if list(chunk.columns) != columns:
+                raise ValueError("All chunks must have the same columns")
+
+            # Python objects (None for missing values), column by column, then row tuples
+            values = [chunk[column].to_numpy(dtype=object, na_value=None) for column in columns]
+            for start in range(0, len(chunk), self.batch_size):
+                self.connection.executemany(insert, zip(*(v[start:start + self.batch_size] for v in values)))
+        self.connection.commit()
+
+        categories = {column: list(first[column].cat.categories) for column in columns
+                      if isinstance(first[column].dtype, pd.CategoricalDtype)}
+
+        return SQLiteFrame(self, f"SELECT * FROM {table}", columns, types, table=table, categories=categories)
+
+    def _node(self, df) -> SQLiteFrame:
+        return df if isinstance(df, SQLiteFrame) else self.scan(df)
+
+    def _index(self, frame: SQLiteFrame, columns: list):
+        # Indexes can only be built on loaded tables (not on derived relations)
+        if frame.table is not None:
+            name = f"{frame.table}_{'_'.join(str(frame.columns.index(column)) for column in columns)}"
+            keys = ", ".join(_quote(column) for column in columns)
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {frame.table} ({keys})")
+
+    def _derive(self, frame: SQLiteFrame, sql: str, columns: list, types: dict,
+                categories: dict | None = None) -> SQLiteFrame:
+        # Categorical columns keep their categories while they are carried through
+        kept = {column: cats for column, cats in frame.categories.items() if column in columns}
+        return SQLiteFrame(self, sql, columns, types, categories={**kept, **(categories or {})})
+
+    # =====================================================
+    # SQL_with_Dataframes methods
+    # =====================================================
+    def rename_columns(self, df) -> SQLiteFrame:
+        frame = self._node(df)
+        renamed = [_normalize(column) for column in frame.columns]
+        select = ", ".join(f"{_quote(old)} AS {_quote(new)}" for old, new in zip(frame.columns, renamed))
+        types = {new: frame.types[old] for old, new in zip(frame.columns, renamed)}
+        categories = {_normalize(column): cats for column, cats in frame.categories.items()}
+        return SQLiteFrame(self, f"SELECT {select} FROM ({frame.sql})", renamed, types, categories=categories)
+
+    def convert_to_numeric(self, df, column_name: str) -> SQLiteFrame:
+        frame = self._node(df)
+        if frame.types[column_name] in ("INTEGER", "REAL", "NUMERIC"):
+            return frame
+
+        # Text goes through to_number (commas removed, invalid values become NULL like NaN)
+        column = _quote(column_name)
+        expression = (f"CASE WHEN typeof({column}) IN ('integer', 'real') THEN {column} "
+                      f"ELSE to_number({column}) END")
+        select = ", ".join(f"{expression} AS {column}" if name == column_name else _quote(name)
+                           for name in frame.columns)
+        types = {**frame.types, column_name: "NUMERIC"}
+        categories = {name: cats for name, cats in frame.categories.items() if name != column_name}
+        return SQLiteFrame(self, f"SELECT {select} FROM ({frame.sql})", frame.columns, types, categories=categories)
+
+    def join_dataframes(self, df1, df2, column_to_join: str, join_type,
+                        strategy: str = "auto", broadcast_rows: int = 100_000) -> SQLiteFrame:
+        """
+        strategy and broadcast_rows are accepted for compatibility: SQLite picks the join algorithm.
+        """
+        if join_type not in ("inner", "left", "right", "outer"):
+            raise ValueError(f"Unsupported join type: {join_type}")
+
+        left, right = self._node(df1), self._node(df2)
+        self._index(left, [column_to_join])
+        self._index(right, [column_to_join])
+
+        # Same output columns as DataFrame.merge: one key column, _x/_y on other shared names
+        shared = (set(left.columns) & set(right.columns)) - {column_to_join}
+        key = _quote(column_to_join)
+        select, columns, types = [], [], {}
+        for side, frame, suffix in (("l", left, "_x"), ("r", right, "_y")):
+            for column in frame.columns:
+                if column == column_to_join:
+                    if side == "r":
+                        continue
+                    name = column
+                    expression = f"l.{key}" if join_type in ("inner", "left") else f"COALESCE(l.{key}, r.{key})"
+                else:
+                    name = column + suffix if column in shared else column
+                    expression = f"{side}.{_quote(column)}"
+                select.append(f"{expression} AS {_quote(name)}")
+                columns.append(name)
+                types[name] = frame.types[column]
+
+        sql_join = {"inner": "JOIN", "left": "LEFT JOIN", "right": "RIGHT JOIN", "outer": "FULL JOIN"}[join_type]
+        sql = (f"SELECT {', '.join(select)} FROM ({left.sql}) AS l "
+               f"{sql_join} ({right.sql}) AS r ON l.{key} = r.{key}")
+
+        categories = {**{name: cats for name, cats in right.categories.items() if name in columns},
+                      **{name: cats for name, cats in left.categories.items() if name in columns}}
+        return SQLiteFrame(self, sql, columns, types, categories=categories)
+
+    def apply_filters(self, df, column_name: str, operator: str, value: float) -> SQLiteFrame:
+        if operator not in self.OPERATORS:
+            raise ValueError("Invalid operator")
+
+        frame = self._node(df)
+        column = _quote(column_name)
+        condition = f"{column} {self.OPERATORS[operator]} {_literal(value)}"
+        # Like pandas, a missing value is "not equal" to anything
+        if operator == '!=':
+            condition = f"({condition} OR {column} IS NULL)"
+
+        return self._derive(frame, f"SELECT * FROM ({frame.sql}) WHERE {condition}", frame.columns, frame.types)
+
+    def df_select_columns(self, df, columns: list[str]) -> SQLiteFrame:
+        frame = self._node(df)
+        select = ", ".join(_quote(column) for column in columns)
+        return self._derive(frame, f"SELECT {select} FROM ({frame.sql})", list(columns),
+                            {column: frame.types[column] for column in columns})
+
+    def df_groupby_count(self, df, columns_groupby: list[str], Counter_Name: str) -> SQLiteFrame:
+        return self._group(df, columns_groupby, Counter_Name, "COUNT(*)", "INTEGER")
+
+    def df_groupby(self, df, columns_groupby: list[str], Agg_Name: str, column_to_agg: str,
+                   agg_func: str) -> SQLiteFrame:
+        if agg_func not in self.AGGREGATES:
+            raise ValueError(f"Unsupported aggregation: {agg_func}")
+        expression, result_type = self.AGGREGATES[agg_func]
+        return self._group(df, columns_groupby, Agg_Name, expression.format(_quote(column_to_agg)), result_type)
+
+    def _group(self, df, columns_groupby: list[str], name: str, aggregate: str, result_type: str) -> SQLiteFrame:
+        # GROUP BY like pandas: rows with a missing key are dropped, groups come out sorted
+        frame = self._node(df)
+        keys = ", ".join(_quote(column) for column in columns_groupby)
+        not_null = " AND ".join(f"{_quote(column)} IS NOT NULL" for column in columns_groupby)
+        sql = (f"SELECT {keys}, {aggregate} AS {_quote(name)} FROM ({frame.sql}) "
+               f"WHERE {not_null} GROUP BY {keys} ORDER BY {keys}")
+        types = {**{column: frame.types[column] for column in columns_groupby}, name: result_type}
+        return self._derive(frame, sql, list(columns_groupby) + [name], types)
+
+    def df_merge_partial_counts(self, partials: Iterable, columns_groupby: list[str],
+                                count_column: str) -> SQLiteFrame:
+        frames = [self._node(partial) for partial in partials]
+        if not frames:
+            raise ValueError("No partial results to merge")
+
+        columns = list(columns_groupby) + [count_column]
+        select = ", ".join(_quote(column) for column in columns)
+        union = " UNION ALL ".join(f"SELECT {select} FROM ({frame.sql})" for frame in frames)
+        union_frame = self._derive(frames[0], union, columns, frames[0].types)
+        return self._group(union_frame, columns_groupby, count_column,
+                           f"SUM({_quote(count_column)})", frames[0].types[count_column])
+
+    def df_case(
+            self,
+            df,
+            columns_to_keep: List[str],
+            value_column: str,
+            ranges: List[Tuple[int, int]],
+            labels: List[str],
+            default_label: str,
+            new_column_name: str,
+            inclusive: str | List[str] = "both",
+            categorical: bool = False
+    ) -> SQLiteFrame:
+        if len(ranges) != len(labels):
+            raise ValueError("Ranges and labels must match")
+
+        # Same validation (malformed or overlapping ranges) as the pandas engine
+        SQl_df().bin_codes(pd.Series([], dtype=float), ranges, inclusive)
+        sides = [inclusive] * len(ranges) if isinstance(inclusive, str) else list(inclusive)
+
+        frame = self._node(df)
+        value = _quote(value_column)
+        whens = []
+        for (low, high), label, side in zip(ranges, labels, sides):
+            lower = ">=" if side in ("both", "left") else ">"
+            upper = "<=" if side in ("both", "right") else "<"
+            whens.append(f"WHEN {value} {lower} {_literal(low)} AND {value} {upper} {_literal(high)} "
+                         f"THEN {_literal(label)}")
+        case = f"CASE {' '.join(whens)} ELSE {_literal(default_label)} END"
+
+        keep = ", ".join(_quote(column) for column in columns_to_keep)
+        sql = f"SELECT {keep}, {case} AS {_quote(new_column_name)} FROM ({frame.sql})"
+        types = {**{column: frame.types[column] for column in columns_to_keep}, new_column_name: "TEXT"}
+        categories = {new_column_name: list(dict.fromkeys(list(labels) + [default_label]))} if categorical else None
+
+        return self._derive(frame, sql, list(columns_to_keep) + [new_column_name], types, categories)
+
+    def df_pivot_values_to_columns(self, df, group_col_1, group_col_2, value_column, values,
+                                   count_column=None) -> SQLiteFrame:
+        frame = self._pivot(self._node(df), group_col_1, group_col_2, value_column, values, count_column)
+        keys = f"{_quote(group_col_1)}, {_quote(group_col_2)}"
+        return self._derive(frame, f"SELECT * FROM ({frame.sql}) ORDER BY {keys}", frame.columns, frame.types)
+
+    def _pivot(self, frame: SQLiteFrame, group_col_1, group_col_2, value_column, values,
+               count_column=None) -> SQLiteFrame:
+        # Like pivot_table: only rows whose value is pivoted and whose group labels are present
+        value = _quote(value_column)
+        weight = "1" if count_column is None else _quote(count_column)
+        pivoted = sorted(values)
+
+        sums = [f"SUM(CASE WHEN {value} = {_literal(label)} THEN {weight} ELSE 0 END)" for label in pivoted]
+        total = " + ".join(f"SUM(CASE WHEN {value} = {_literal(label)} THEN {weight} ELSE 0 END)" for label in values)
+        keys = f"{_quote(group_col_1)}, {_quote(group_col_2)}"
+        in_values = ", ".join(_literal(label) for label in values)
+
+        select = ", ".join([keys] + [f"{sql} AS {_quote(label)}" for sql, label in zip(sums, pivoted)]
+                           + [f"{total or 0} AS Grand_Total"])
+        sql = (f"SELECT {select} FROM ({frame.sql}) "
+               f"WHERE {value} IN ({in_values}) AND {_quote(group_col_1)} IS NOT NULL "
+               f"AND {_quote(group_col_2)} IS NOT NULL GROUP BY {keys}")
+
+        columns = [group_col_1, group_col_2] + pivoted + ["Grand_Total"]
+        result_type = "INTEGER" if count_column is None else frame.types[count_column]
+        types = {group_col_1: frame.types[group_col_1], group_col_2: frame.types[group_col_2],
+                 **{label: result_type for label in pivoted + ["Grand_Total"]}}
+        return self._derive(frame, sql, columns, types)
+
+    def df_groupby_rollup(self, base_df, group_col_1: str, group_col_2: str,
+                          grand_total_label: str = "Grand Total", total_label: str = "Total") -> SQLiteFrame:
+        frame = self._node(base_df)
+        numeric = [column for column in frame.columns
+                   if column != group_col_1 and frame.types[column] in ("INTEGER", "REAL", "NUMERIC")]
+
+        # Subtotal per group_col_1, then one grand total row (same columns as the pandas engine)
+        sums = ", ".join(f"SUM({_quote(column)}) AS {_quote(column)}" for column in numeric)
+        sums = f", {sums}" if sums else ""
+        key = _quote(group_col_1)
+        sql = (f"SELECT * FROM (SELECT 0 AS _grand, {key}{sums}, {_literal(total_label)} AS {_quote(group_col_2)} "
+               f"FROM ({frame.sql}) WHERE {key} IS NOT NULL GROUP BY {key} "
+               f"UNION ALL SELECT 1, {_literal(grand_total_label)}{sums}, "
+               f"{_literal(total_label)} FROM ({frame.sql})) ORDER BY _grand, {key}")
+
+        columns = [group_col_1] + numeric + [group_col_2]
+        select = ", ".join(_quote(column) for column in columns)
+        types = {**{column: frame.types[column] for column in numeric},
+                 group_col_1: frame.types[group_col_1], group_col_2: "TEXT"}
+        return SQLiteFrame(self, f"SELECT {select} FROM ({sql})", columns, types)
+
+    def df_pivot_rollup(self, df, group_col_1: str, group_col_2: str, value_column: str, values,
+                        count_column=None, grand_total_label: str = "Grand Total",
+                        total_label: str = "Total") -> SQLiteFrame:
+        """
+        Pivot + ROLLUP(group_col_1, group_col_2): SQLite has no ROLLUP, so the detail,
+        subtotal and grand total rows are a UNION ALL over the pivot, in hierarchy order.
+        """
+        detail = self._pivot(self._node(df), group_col_1, group_col_2, value_column, values, count_column)
+        measures = sorted(values) + ["Grand_Total"]
+        keys = [_quote(group_col_1), _quote(group_col_2)]
+        sums = ", ".join(f"COALESCE(SUM({_quote(label)}), 0)" for label in measures)
+        plain = ", ".join(_quote(label) for label in measures)
+
+        sql = (f"WITH detail AS ({detail.sql}) "
+               f"SELECT {keys[0]}, {keys[1]}, {plain} FROM ("
+               f"SELECT 0 AS _grand, {keys[0]}, 0 AS _total, {keys[1]}, {plain} FROM detail "
+               f"UNION ALL SELECT 0, {keys[0]}, 1, {_literal(total_label)}, {sums} FROM detail GROUP BY {keys[0]} "
+               f"UNION ALL SELECT 1, {_literal(grand_total_label)}, 1, {_literal(total_label)}, {sums} FROM detail"
+               f") ORDER BY _grand, {keys[0]}, _total, {keys[1]}")
+
+        types = {**detail.types, group_col_1: "TEXT", group_col_2: "TEXT"}
+        return SQLiteFrame(self, sql, detail.columns, types)
+
+    def df_orderby_grouping(self, df, group_col_1, group_col_2, total_label="Total",
+                            grand_total_label="Grand Total") -> SQLiteFrame:
+        frame = self._node(df)
+        first, second = _quote(group_col_1), _quote(group_col_2)
+        # pandas sort order: totals after normal rows, missing labels last
+        order = (f"COALESCE({first} = {_literal(grand_total_label)}, 0), {first} IS NULL, {first}, "
+                 f"COALESCE({second} = {_literal(total_label)}, 0), {second} IS NULL, {second}")
+        return self._derive(frame, f"SELECT * FROM ({frame.sql}) ORDER BY {order}", frame.columns, frame.types)
+
+
+# =====================================================
+# SQL helpers
+# =====================================================
+
+def _chain(first: pd.DataFrame, rest: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    yield first
+    yield from rest
+
+
+def _normalize(column) -> str:
+    # Same rule as SQl_df.rename_columns
+    return str(column).replace(' ', '_').replace('/', '_')
+
+
+def _quote(identifier) -> str:
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _literal(value) -> str:
+    """
+    SQL literal for a Python value (numbers as is, text quoted, missing values as NULL).
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return "NULL"
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if hasattr(value, "item"):  # numpy scalar
+        return _literal(value.item())
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _sql_type(series: pd.Series) -> str:
+    dtype = series.cat.categories.dtype if isinstance(series.dtype, pd.CategoricalDtype) else series.dtype
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _to_number(text):
+    """
+    SQL function to_number(text): pd.to_numeric(..., errors='coerce') of one value with commas removed.
+    """
+    if text is None:
+        return None
+    text = str(text).replace(',', '')
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return None
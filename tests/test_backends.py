@@ -0,0 +1,120 @@
+"""
+Cross-check of the execution backends: the pandas and sqlite engines must build the same report,
+including the ROLLUP subtotal/grand total rows, missing values and empty groups.
+"""
+
+import importlib
+
+import pandas as pd
+import pytest
+
+from benchmarks.generators import GENERATORS
+from src.etl_pipeline import runner
+from src.etl_pipeline.extract.extract import Extract
+
+# name -> Pipeline (input files, schema and Transform) of every registered pipeline
+PIPELINES = {name: importlib.import_module(module).PIPELINE for name, (module, _) in runner.PIPELINES.items()}
+
+# Extract options compared with each backend
+MODES = {
+    "eager": {},
+    "chunked": {"chunksize": 700},
+    "typed": {"typed": True},
+    "categorize": {"categorize": True},
+}
+
+
+def _report(pipeline: str, backend: str, chunksize: int | None = None, typed: bool = False,
+            categorize: bool = False, parameters: dict | None = None) -> pd.DataFrame:
+    definition = PIPELINES[pipeline]
+    extract = Extract(definition.fact_file, definition.dimension_file, chunksize=chunksize,
+                      categorize=categorize, cache=False, schema=definition.schema if typed else None)
+    return definition.transform(extract.extract(), backend=backend, parameters=parameters).data
+
+
+def _assert_same_report(pipeline: str, **options):
+    expected = _report(pipeline, "pandas", **options)
+    actual = _report(pipeline, "sqlite", **options)
+
+    # Values and labels must match; integer widths and categoricals may differ
+    pd.testing.assert_frame_equal(
+        actual.astype({column: object for column in actual.select_dtypes("category")}),
+        expected.astype({column: object for column in expected.select_dtypes("category")}),
+        check_dtype=False
+    )
+    return expected
+
+
+def _write_csv(path, rows: list[list], columns: list[str]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows, columns=columns, dtype=object).to_csv(path, index=False)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # Extract reads data/raw relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize("mode", sorted(MODES))
+@pytest.mark.parametrize("pipeline", sorted(PIPELINES))
+def test_backends_match_on_synthetic_data(workdir, pipeline, mode):
+    GENERATORS[pipeline](workdir / "data" / "raw", 3_000, seed=7)
+
+    report = _assert_same_report(pipeline, **MODES[mode])
+
+    # ROLLUP rows: a Total per group and one Grand Total row, last
+    group_column = report.columns[0]
+    assert (report.iloc[:, 1] == "Total").sum() == report[group_column].nunique()
+    assert report[group_column].iloc[-1] == "Grand Total"
+
+
+def test_hospital_backends_match_with_nulls_and_empty_groups(workdir):
+    raw = workdir / "data" / "raw"
+    _write_csv(raw / "age_ranges.csv", [[1, "Child"], [2, "Adult"], [3, None], [4, "Elderly"]],
+               ["AgeRangeID", "AgeRangeLabel"])
+    _write_csv(raw / "hospital_billing_data.csv", [
+        ["Alberta", "H1", 1, "1500", 1],
+        ["Alberta", "H1", 2, "7000", 2],
+        ["Alberta", "H2", 3, None, 1],          # missing amount
+        ["Alberta", "H2", 4, "n/a", 2],         # not a number
+        [None, "H3", 5, "2000", 1],             # missing group key
+        ["Quebec", "H3", 6, "12000", 3],        # null label in the dimension
+        ["Quebec", "H3", 7, "3000", 9],         # orphan key (dropped by the inner join)
+        ["Quebec", "H4", 8, "500", 1],          # below the threshold
+        ["Quebec", "H4", 9, "5000", 2],         # range boundary
+    ], ["Province", "Hospital", "PatientID", "BillAmount", "AgeRangeID"])
+
+    # Elderly has no rows at all and no province has every bill category
+    report = _assert_same_report("hospital")
+    assert "Elderly" in report.columns and report["Elderly"].eq(0).all()
+    assert report.iloc[-1]["Province"] == "Grand Total"
+
+
+def test_marketplace_backends_match_with_nulls_and_empty_groups(workdir):
+    raw = workdir / "data" / "raw"
+    _write_csv(raw / "segments.csv", [["A1", "Seg 1-3"], ["D3", "Seg 4-6"], ["C1", None]],
+               ["Product Code", "Segment"])
+    _write_csv(raw / "raw_data.csv", [
+        ["NORTH", 1, "C 1", "A1", "S1", "1,250"],    # thousands separator
+        ["NORTH", 1, "C 1", "A1", "S2", "30"],
+        ["NORTH", 1, "C 1", "D3", "S3", "45"],
+        ["NORTH", 2, "C 2", "A1", "S4", None],      # missing payment
+        [None, 3, "C 3", "A1", "S5", "60"],         # missing group key
+        ["SOUTH", 4, "C 4", "C1", "S6", "80"],      # null segment in the dimension
+        ["SOUTH", 4, "C 4", "ZZ", "S7", "80"],      # orphan product code
+        ["SOUTH", 5, "C 5", "A1", "S8", "10"],      # below the threshold
+    ], ["MARKET PLACE", "Customer Site ID", "Customer Name", "Product Code", "Product Serial Number",
+        "Equipment Rental Payment/Month"])
+
+    report = _assert_same_report("marketplace")
+    assert report.iloc[-1]["MARKET_PLACE"] == "Grand Total"
+
+
+@pytest.mark.parametrize("pipeline", sorted(PIPELINES))
+def test_backends_match_when_every_row_is_filtered_out(workdir, pipeline):
+    GENERATORS[pipeline](workdir / "data" / "raw", 500, seed=3)
+    threshold = {"hospital": {"min_bill_amount": 10 ** 9}, "marketplace": {"min_payment": 10 ** 9}}
+
+    _assert_same_report(pipeline, parameters=threshold[pipeline])
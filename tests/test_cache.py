@@ -0,0 +1,117 @@
+"""
+ColumnarCache: warm hits, invalidation when the source file's mtime or size changes, read options
+in the key and the invalidate command.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.etl_pipeline.extract.cache import ColumnarCache, main
+from src.etl_pipeline.extract.extract import Extract
+
+
+def _fail():
+    raise AssertionError("cache hit expected, but the file was parsed")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ColumnarCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "fact.csv"
+    path.write_text("id,amount\n1,10\n2,20\n")
+    return path
+
+
+def _parse(path):
+    return lambda: pd.read_csv(path)
+
+
+def test_unchanged_file_is_a_hit(cache, source):
+    parsed = cache.load(source, _parse(source))
+
+    pd.testing.assert_frame_equal(cache.load(source, _fail), parsed)
+    assert len(cache.entries()) == 1
+
+
+def test_changed_mtime_is_a_miss(cache, source):
+    cache.load(source, _parse(source))
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    calls = []
+    cache.load(source, lambda: calls.append(1) or pd.read_csv(source))
+
+    assert calls == [1]
+    # The entry of the previous file state can never be hit again and is removed
+    assert len(cache.entries()) == 1
+
+
+def test_changed_size_is_a_miss(cache, source):
+    cache.load(source, _parse(source))
+    # Keep the mtime: only the size tells the file changed
+    stat = source.stat()
+    with open(source, "a") as handle:
+        handle.write("3,30\n")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    df = cache.load(source, _parse(source))
+
+    assert df["id"].tolist() == [1, 2, 3]
+    assert len(cache.entries()) == 1
+
+
+def test_content_hash_tells_same_size_edits_apart(tmp_path, source):
+    hashed, stat_only = ColumnarCache(tmp_path / "cache", content_hash=True), ColumnarCache(tmp_path / "cache")
+    before = hashed.fingerprint(source), stat_only.fingerprint(source)
+    stat = source.stat()
+    source.write_text("id,amount\n1,10\n2,99\n")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert source.stat().st_size == stat.st_size
+    # Same size and mtime: only the content hash sees the edit
+    assert hashed.fingerprint(source) != before[0]
+    assert stat_only.fingerprint(source) == before[1]
+
+
+def test_read_options_are_part_of_the_key_but_not_the_engine(cache, source):
+    cache.load(source, _parse(source), columns=None, engine="c")
+    cache.load(source, _fail, columns=None, engine="pyarrow")
+    cache.load(source, lambda: pd.read_csv(source, usecols=["id"]), columns=["id"])
+
+    assert len(cache.entries()) == 2
+    assert list(cache.load(source, _fail, columns=["id"]).columns) == ["id"]
+
+
+def test_invalidate_one_file_or_all(cache, source, tmp_path):
+    other = tmp_path / "dimension.csv"
+    other.write_text("id,label\n1,a\n")
+    cache.load(source, _parse(source))
+    cache.load(other, _parse(other))
+
+    assert cache.invalidate(source) == 1
+    assert cache.load(other, _fail)["label"].tolist() == ["a"]
+    assert cache.invalidate() == 1
+    assert cache.entries() == []
+
+
+def test_extract_reads_the_new_rows_after_the_file_changed(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    raw = tmp_path / "data" / "raw"
+    raw.mkdir(parents=True)
+    (raw / "fact.csv").write_text("id,amount\n1,10\n")
+    cache = ColumnarCache(tmp_path / "data" / "cache")
+
+    assert len(Extract("fact.csv", cache=cache).extract()["fact.csv"]) == 1
+    with open(raw / "fact.csv", "a") as handle:
+        handle.write("2,20\n")
+    assert len(Extract("fact.csv", cache=cache).extract()["fact.csv"]) == 2
+
+    main(["--cache-dir", str(cache.cache_dir), "--invalidate", "fact.csv"])
+    assert "Removed 1 cache entries" in capsys.readouterr().out
+    assert cache.entries() == []
@@ -0,0 +1,128 @@
+"""
+CASE binning of SQl_df.df_case / bin_codes: overlap checks, range ends, the default label,
+categorical output and the labels of the existing call sites.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.etl_pipeline.transform.transform_Marketplace import Transform as MarketplaceTransform
+from src.etl_pipeline.transform.transform_hospital import Transform as HospitalTransform
+from src.etl_pipeline.utils.SQL_with_Dataframes import SQl_df
+
+HOSPITAL = HospitalTransform.PARAMETERS
+MARKETPLACE = MarketplaceTransform.PARAMETERS
+
+
+def _case(values, ranges, labels, default_label="other", **options) -> pd.Series:
+    df = pd.DataFrame({"value": values})
+    return SQl_df().df_case(df, ["value"], "value", ranges, labels, default_label, "label", **options)["label"]
+
+
+def _hospital_case(values) -> list:
+    return _case(values, HOSPITAL["bill_ranges"], HOSPITAL["bill_labels"], HOSPITAL["bill_default_label"],
+                 inclusive=HOSPITAL["bill_inclusive"]).tolist()
+
+
+def _between_case(values, ranges, labels, default_label) -> list:
+    # df_case before the binning engine: one Series.between mask per range, first match wins
+    series = pd.Series(values, dtype=float)
+    conditions = [series.between(low, high) for low, high in ranges]
+    return np.select(conditions, labels, default=default_label).tolist()
+
+
+@pytest.mark.parametrize("ranges, inclusive", [
+    ([(0, 10), (5, 20)], "both"),                   # overlapping interiors
+    ([(0, 10), (10, 20)], "both"),                  # shared end, closed on both sides
+    ([(0, 10), (10, 20)], ["right", "left"]),
+    ([(10, 20), (0, 10)], "both"),                  # unsorted input is checked after sorting
+])
+def test_overlapping_ranges_are_rejected(ranges, inclusive):
+    with pytest.raises(ValueError, match="overlap"):
+        SQl_df().bin_codes(pd.Series([1.0]), ranges, inclusive)
+
+
+@pytest.mark.parametrize("inclusive, expected", [
+    (["both", "neither"], 0),
+    (["neither", "both"], 1),
+    (["left", "right"], -1),    # open on both sides of the shared end: no range
+])
+def test_shared_end_belongs_to_the_range_closed_there(inclusive, expected):
+    codes = SQl_df().bin_codes(pd.Series([10.0]), [(0, 10), (10, 20)], inclusive)
+    assert codes.tolist() == [expected]
+
+
+def test_invalid_ranges_and_inclusive_values_are_rejected():
+    sql_df = SQl_df()
+    with pytest.raises(ValueError, match="min <= max"):
+        sql_df.bin_codes(pd.Series([1.0]), [(5, 1)])
+    with pytest.raises(ValueError, match="one value per range"):
+        sql_df.bin_codes(pd.Series([1.0]), [(0, 1), (2, 3)], ["both"])
+    with pytest.raises(ValueError, match="'both', 'neither'"):
+        sql_df.bin_codes(pd.Series([1.0]), [(0, 1)], "closed")
+    with pytest.raises(ValueError, match="Ranges and labels must match"):
+        _case([1], [(0, 1)], ["a", "b"])
+
+
+def test_hospital_range_edges():
+    # [1000, 5000] and (5000, 10000): 5000 is in the first range, 5000.5 in the second,
+    # 10000 and anything under the threshold get the default label
+    assert _hospital_case([999.99, 1000, 5000, 5000.5, 9999.99, 10000]) == [
+        "3.10k +", "1.0-5k", "1.0-5k", "2.5k-10k", "2.5k-10k", "3.10k +"
+    ]
+
+
+@pytest.mark.parametrize("inclusive, expected", [
+    ("both", ["a", "a", "a", "other"]),
+    ("neither", ["other", "a", "other", "other"]),
+    ("left", ["a", "a", "other", "other"]),
+    ("right", ["other", "a", "a", "other"]),
+])
+def test_inclusive_applies_to_both_ends(inclusive, expected):
+    assert _case([1, 1.5, 2, 3], [(1, 2)], ["a"], inclusive=inclusive).tolist() == expected
+
+
+def test_values_outside_every_range_and_missing_values_get_the_default_label():
+    labels = _case([-5, np.nan, 3, 7, 100], [(0, 4), (5, 9)], ["low", "high"], default_label="none")
+    assert labels.tolist() == ["none", "none", "low", "high", "none"]
+
+
+def test_default_label_may_repeat_a_range_label():
+    labels = _case([1, 50], [(0, 10)], ["small"], default_label="small", categorical=True)
+    assert labels.tolist() == ["small", "small"]
+    assert list(labels.cat.categories) == ["small"]
+
+
+def test_categorical_output():
+    text = _case([1, 4, 8], [(0, 2), (3, 5)], ["x", "y"], default_label="z")
+    categorical = _case([1, 4, 8], [(0, 2), (3, 5)], ["x", "y"], default_label="z", categorical=True)
+
+    assert isinstance(categorical.dtype, pd.CategoricalDtype)
+    # Every label is a category, in range order with the default last, even if unused
+    assert list(categorical.cat.categories) == ["x", "y", "z"]
+    assert categorical.astype(object).tolist() == text.tolist() == ["x", "y", "z"]
+    assert list(_case([1], [(0, 2), (3, 5)], ["x", "y"], "z", categorical=True).cat.categories) == ["x", "y", "z"]
+
+
+def test_input_frame_is_not_modified():
+    df = pd.DataFrame({"value": [1, 2], "other": ["a", "b"]})
+    result = SQl_df().df_case(df, ["value"], "value", [(0, 1)], ["low"], "high", "label")
+    assert list(df.columns) == ["value", "other"]
+    assert list(result.columns) == ["value", "label"]
+
+
+def test_marketplace_labels_match_the_previous_implementation():
+    # Unit counts are integers: the same ranges give the same labels as the Series.between version
+    counts = list(range(0, 12)) + [np.nan]
+    assert _case(counts, MARKETPLACE["unit_ranges"], MARKETPLACE["unit_labels"],
+                 MARKETPLACE["unit_default_label"]).tolist() == _between_case(
+        counts, MARKETPLACE["unit_ranges"], MARKETPLACE["unit_labels"], MARKETPLACE["unit_default_label"])
+
+
+def test_hospital_labels_match_the_previous_ranges_on_whole_amounts():
+    # The previous ranges were [1000, 5000] and [5001, 9999]: identical for whole amounts,
+    # the new ones only add the amounts between 5000 and 5001 and between 9999 and 10000
+    amounts = [0, 999, 1000, 1001, 4999, 5000, 5001, 5002, 9998, 9999, 10000, 10001, 250000]
+    assert _hospital_case(amounts) == _between_case(
+        amounts, [(1000, 5000), (5001, 9999)], HOSPITAL["bill_labels"], HOSPITAL["bill_default_label"])
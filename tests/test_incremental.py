@@ -0,0 +1,186 @@
+"""
+IncrementalState: the watermark only reads appended rows; a rewritten file (tail hash), a changed
+header, dependency or rules hash, or an unterminated last line being extended trigger a full refresh.
+"""
+
+import importlib
+
+import pandas as pd
+import pytest
+
+from benchmarks.generators import GENERATORS
+from src.etl_pipeline import runner
+from src.etl_pipeline.extract.extract import Extract
+from src.etl_pipeline.utils.incremental import IncrementalState
+
+HOSPITAL = importlib.import_module(runner.PIPELINES["hospital"][0]).PIPELINE
+
+
+def _run(state: IncrementalState, path, dependencies=()) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # New rows, and the folded counts per key
+    new_rows = state.read_new_rows(path, dependencies)
+    partial = new_rows.groupby("key", as_index=False).size().rename(columns={"size": "n"})
+    counts = state.fold(partial, ["key"], "n")
+    return new_rows, counts.sort_values("key", ignore_index=True)
+
+
+def _counts(path) -> dict:
+    return pd.read_csv(path)["key"].value_counts().sort_index().to_dict()
+
+
+@pytest.fixture
+def fact(tmp_path):
+    path = tmp_path / "fact.csv"
+    path.write_text("key,value\na,1\nb,2\na,3\n")
+    return path
+
+
+@pytest.fixture
+def state(tmp_path):
+    return IncrementalState("test", tmp_path / "state", rules={"threshold": 1})
+
+
+def _append(path, text: str):
+    with open(path, "a") as handle:
+        handle.write(text)
+
+
+def test_first_run_reads_everything_and_sets_the_watermark(state, fact):
+    new_rows, counts = _run(state, fact)
+
+    assert state.full_refresh
+    assert len(new_rows) == 3
+    assert dict(zip(counts["key"], counts["n"])) == {"a": 2, "b": 1}
+    assert state._load_meta()["offset"] == fact.stat().st_size
+
+
+def test_appended_rows_are_read_from_the_watermark(state, fact, tmp_path):
+    _run(state, fact)
+    _append(fact, "b,4\nc,5\n")
+
+    state = IncrementalState("test", tmp_path / "state", rules={"threshold": 1})
+    new_rows, counts = _run(state, fact)
+
+    assert not state.full_refresh
+    assert new_rows.to_dict("list") == {"key": ["b", "c"], "value": [4, 5]}
+    assert dict(zip(counts["key"], counts["n"])) == _counts(fact)
+    assert state._load_meta()["offset"] == fact.stat().st_size
+    # Only the current counts file is kept
+    assert len(list((tmp_path / "state").glob("test.*.parquet"))) == 1
+
+
+def test_nothing_appended_reads_no_rows(state, fact):
+    _run(state, fact)
+    new_rows, counts = _run(state, fact)
+
+    assert not state.full_refresh
+    assert new_rows.empty
+    assert dict(zip(counts["key"], counts["n"])) == {"a": 2, "b": 1}
+
+
+@pytest.mark.parametrize("rewrite", [
+    "key,value\na,1\nb,9\na,3\nc,5\n",   # earlier row edited, then rows appended: the tail hash differs
+    "key,value\na,1\n",                  # truncated below the watermark
+])
+def test_rewritten_file_is_a_full_refresh(state, fact, rewrite):
+    _run(state, fact)
+    fact.write_text(rewrite)
+
+    new_rows, counts = _run(state, fact)
+
+    assert state.full_refresh
+    assert len(new_rows) == len(rewrite.splitlines()) - 1
+    assert dict(zip(counts["key"], counts["n"])) == _counts(fact)
+
+
+def test_changed_header_is_a_full_refresh(state, fact):
+    _run(state, fact)
+    fact.write_text("key,amount\na,1\nb,2\na,3\nc,5\n")
+
+    new_rows = state.read_new_rows(fact)
+
+    assert state.full_refresh
+    assert list(new_rows.columns) == ["key", "amount"]
+    assert len(new_rows) == 4
+
+
+def test_changed_rules_are_a_full_refresh(state, fact, tmp_path):
+    _run(state, fact)
+    _append(fact, "c,5\n")
+
+    same = IncrementalState("test", tmp_path / "state", rules={"threshold": 1})
+    same.read_new_rows(fact)
+    assert not same.full_refresh
+
+    changed = IncrementalState("test", tmp_path / "state", rules={"threshold": 2})
+    new_rows, counts = _run(changed, fact)
+    assert changed.full_refresh
+    assert len(new_rows) == 4
+    assert dict(zip(counts["key"], counts["n"])) == _counts(fact)
+
+
+def test_changed_dependency_is_a_full_refresh(state, fact, tmp_path):
+    dimension = tmp_path / "dimension.csv"
+    dimension.write_text("key,label\na,A\n")
+    _run(state, fact, [dimension])
+    _append(fact, "c,5\n")
+    _append(dimension, "b,B\n")
+
+    new_rows, _ = _run(state, fact, [dimension])
+
+    assert state.full_refresh
+    assert len(new_rows) == 4
+
+
+def test_unterminated_last_line(state, fact):
+    fact.write_text("key,value\na,1\nb,2")
+    _run(state, fact)
+
+    # New rows on a new line are appended rows
+    _append(fact, "\nc,3\n")
+    new_rows, _ = _run(state, fact)
+    assert not state.full_refresh
+    assert new_rows["key"].tolist() == ["c"]
+
+    # Extending the unterminated row changes it: everything is read again
+    fact.write_text("key,value\na,1\nb,2")
+    _run(state, fact)
+    _append(fact, "0\nc,3\n")
+    new_rows, _ = _run(state, fact)
+    assert state.full_refresh
+    assert new_rows["value"].tolist() == [1, 20, 3]
+
+
+def test_fold_needs_read_new_rows(state):
+    with pytest.raises(ValueError, match="read_new_rows"):
+        state.fold(pd.DataFrame({"key": [], "n": []}), ["key"], "n")
+
+
+def test_reset(state, fact):
+    _run(state, fact)
+    state.reset()
+
+    state.read_new_rows(fact)
+    assert state.full_refresh
+
+
+def test_incremental_report_matches_a_full_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    raw = tmp_path / "data" / "raw"
+    GENERATORS["hospital"](raw, 3000, seed=5)
+    fact_path = raw / HOSPITAL.fact_file
+    lines = fact_path.read_text().splitlines(keepends=True)
+
+    def report(state=None):
+        extract = Extract(HOSPITAL.fact_file, HOSPITAL.dimension_file, incremental=state)
+        return HOSPITAL.transform(extract.extract(), incremental=state).data
+
+    # Two incremental runs: the first 2000 rows, then the appended remainder
+    fact_path.write_text("".join(lines[:2001]))
+    report(IncrementalState("hospital"))
+    fact_path.write_text("".join(lines))
+    state = IncrementalState("hospital")
+    incremental = report(state)
+
+    assert not state.full_refresh
+    pd.testing.assert_frame_equal(incremental, report())
@@ -0,0 +1,115 @@
+"""
+ResultMemo: hits on unchanged inputs, misses when an input, a parameter, an option or the
+transformation code changes, and least-recently-used eviction.
+"""
+
+import importlib
+import os
+
+import pandas as pd
+import pytest
+
+from src.etl_pipeline.transform.transform_hospital import Transform
+from src.etl_pipeline.utils.memo import ResultMemo, code_version
+
+TRANSFORM_SOURCE = '''
+class Transform:
+    PARAMETERS = {"threshold": %d}
+'''
+
+
+def _frame(value: int) -> pd.DataFrame:
+    return pd.DataFrame({"Province": ["A", "B"], "Count": [value, value + 1]})
+
+
+def _fail():
+    raise AssertionError("memo hit expected, but the result was computed")
+
+
+@pytest.fixture
+def memo(tmp_path):
+    return ResultMemo(tmp_path / "memo")
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    fact, dimension = tmp_path / "fact.csv", tmp_path / "dimension.csv"
+    fact.write_text("id,amount\n1,10\n2,20\n")
+    dimension.write_text("id,label\n1,a\n2,b\n")
+    return [fact, dimension]
+
+
+def test_unchanged_run_is_a_hit(memo, inputs):
+    key = memo.key(inputs, Transform.PARAMETERS, Transform, chunksize=None)
+    computed = memo.load(key, lambda: _frame(1))
+
+    assert memo.key(inputs, Transform.PARAMETERS, Transform, chunksize=None) == key
+    pd.testing.assert_frame_equal(memo.load(key, _fail), computed)
+
+
+def test_touched_input_with_the_same_bytes_is_a_hit(memo, inputs):
+    key = memo.key(inputs, Transform.PARAMETERS, Transform)
+    stat = inputs[0].stat()
+    os.utime(inputs[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert memo.key(inputs, Transform.PARAMETERS, Transform) == key
+
+
+def test_changed_input_is_a_miss(memo, inputs):
+    key = memo.key(inputs, Transform.PARAMETERS, Transform)
+    with open(inputs[0], "a") as handle:
+        handle.write("3,30\n")
+
+    assert memo.key(inputs, Transform.PARAMETERS, Transform) != key
+
+
+def test_changed_parameter_or_option_is_a_miss(memo, inputs):
+    key = memo.key(inputs, Transform.PARAMETERS, Transform, chunksize=None)
+    memo.load(key, lambda: _frame(1))
+
+    parameters = {**Transform.PARAMETERS, "min_bill_amount": 2000}
+    changed_parameter = memo.key(inputs, parameters, Transform, chunksize=None)
+    changed_option = memo.key(inputs, Transform.PARAMETERS, Transform, chunksize=500)
+
+    assert len({key, changed_parameter, changed_option}) == 3
+    pd.testing.assert_frame_equal(memo.load(changed_parameter, lambda: _frame(2)), _frame(2))
+
+
+def test_changed_code_is_a_miss(memo, inputs, tmp_path, monkeypatch):
+    # A Transform in its own module: editing that module must change the key
+    module_file = tmp_path / "memo_test_transform.py"
+    module_file.write_text(TRANSFORM_SOURCE % 1)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    transform = importlib.import_module("memo_test_transform").Transform
+
+    key = memo.key(inputs, transform.PARAMETERS, transform)
+    version = code_version(transform)
+    module_file.write_text(TRANSFORM_SOURCE % 2)
+
+    assert code_version(transform) != version
+    assert memo.key(inputs, transform.PARAMETERS, transform) != key
+
+
+def test_least_recently_used_entry_is_evicted(memo):
+    memo.load("a", lambda: _frame(1))
+    memo.load("b", lambda: _frame(2))
+    # Make b older than a, then use a: b is the least recently used entry
+    for entry, stamp in (("a", 1_000), ("b", 2_000)):
+        os.utime(memo.memo_dir / f"{entry}.parquet", (stamp, stamp))
+    memo.load("a", _fail)
+
+    # Room for two entries, not three
+    memo.max_bytes = memo.size() + (memo.memo_dir / "a.parquet").stat().st_size // 2
+    memo.load("c", lambda: _frame(3))
+
+    assert sorted(entry.stem for entry in memo.entries()) == ["a", "c"]
+    assert memo.size() <= memo.max_bytes
+    pd.testing.assert_frame_equal(memo.load("b", lambda: _frame(4)), _frame(4))
+
+
+def test_clear(memo):
+    memo.load("a", lambda: _frame(1))
+    memo.load("b", lambda: _frame(2))
+
+    assert memo.clear() == 2
+    assert memo.entries() == []
@@ -0,0 +1,86 @@
+"""
+VersionStore: content-addressed blobs, deduplication of identical results, the manifest and restore.
+"""
+
+import pandas as pd
+import pytest
+
+from src.etl_pipeline.load.version_store import VersionStore, main
+
+
+def _result(scale: int = 1) -> pd.DataFrame:
+    return pd.DataFrame({"Province": ["A", "B", "Grand Total"], "Count": [1 * scale, 2 * scale, 3 * scale]})
+
+
+@pytest.fixture
+def store(tmp_path):
+    return VersionStore(tmp_path / "versions")
+
+
+def test_identical_results_share_one_blob(store):
+    first = store.commit(_result(), format="xlsx")
+    second = store.commit(_result(), format="xlsx")
+
+    assert first["written"] and not second["written"]
+    assert first["hash"] == second["hash"]
+    assert first["run_id"] != second["run_id"]
+    assert len(list(store.objects_dir.glob("*/*.parquet"))) == 1
+    # Both runs are listed, in run order, with their metadata
+    assert [entry["run_id"] for entry in store.versions()] == [first["run_id"], second["run_id"]]
+    assert store.versions()[0]["format"] == "xlsx"
+    assert "written" not in store.versions()[0]
+
+
+def test_changed_result_writes_a_new_blob(store):
+    first = store.commit(_result())
+    second = store.commit(_result(scale=2))
+
+    assert second["written"]
+    assert first["hash"] != second["hash"]
+    assert len(list(store.objects_dir.glob("*/*.parquet"))) == 2
+    assert store.latest()["run_id"] == second["run_id"]
+
+
+def test_hash_covers_values_columns_and_dtypes_but_not_the_index():
+    df = _result()
+    assert VersionStore.content_hash(df) == VersionStore.content_hash(df.set_axis([10, 11, 12]))
+    assert VersionStore.content_hash(df) != VersionStore.content_hash(df.rename(columns={"Count": "Total"}))
+    assert VersionStore.content_hash(df) != VersionStore.content_hash(df.astype({"Count": float}))
+
+
+def test_restore_returns_each_run_result(store):
+    first = store.commit(_result())
+    second = store.commit(_result(scale=2))
+    store.commit(_result())  # same content as the first run
+
+    pd.testing.assert_frame_equal(store.restore(first["run_id"]), _result())
+    pd.testing.assert_frame_equal(store.restore(second["run_id"]), _result(scale=2))
+    pd.testing.assert_frame_equal(store.restore(), _result())
+    with pytest.raises(KeyError, match="Unknown version"):
+        store.restore("19990101_000000_000000")
+
+
+def test_empty_store(store):
+    assert store.versions() == []
+    assert store.latest() is None
+    assert store.size() == 0
+    with pytest.raises(KeyError):
+        store.get("latest")
+
+
+def test_restore_command_writes_the_requested_format(store, tmp_path, capsys):
+    entry = store.commit(_result(scale=3))
+    target = tmp_path / "restored.csv"
+
+    main(["--versions-dir", str(store.directory), "--restore", entry["run_id"], "--to", str(target)])
+
+    pd.testing.assert_frame_equal(pd.read_csv(target), _result(scale=3))
+    assert f"Restored {entry['run_id']}" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("target", ["restored.xls", "restored"])
+def test_restore_command_rejects_unsupported_targets(store, tmp_path, target):
+    store.commit(_result())
+    with pytest.raises(SystemExit):
+        main(["--versions-dir", str(store.directory), "--restore", "latest", "--to", str(tmp_path / target)])
+    assert not (tmp_path / target).exists()